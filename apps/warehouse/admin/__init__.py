@@ -17,7 +17,12 @@ from apps.warehouse.models.orders import (
     InvoicePaymentMethod,
 )
 from apps.warehouse.models.packaging import PackageType
-from apps.warehouse.models.printer import Printer, UserAppSettings
+from apps.warehouse.models.printer import (
+    LabelTemplate,
+    Printer,
+    PrintJob,
+    UserAppSettings,
+)
 from apps.warehouse.models.product import (
     StockProduct,
     UnitOfMeasure,
@@ -26,6 +31,7 @@ from apps.warehouse.models.product import (
     PriceGroup,
     StockProductPrice,
 )
+from apps.warehouse.models.sequence import DocumentSequence
 from apps.warehouse.models.warehouse import (
     WarehouseItem,
     Warehouse,
@@ -123,6 +129,25 @@ class PrinterAdmin(admin.ModelAdmin):
     search_fields = ["code", "description"]
 
 
+@admin.register(LabelTemplate)
+class LabelTemplateAdmin(admin.ModelAdmin):
+    list_display = ["code", "description", "version", "changed"]
+    search_fields = ["code", "description"]
+    readonly_fields = ["version"]
+
+
+@admin.register(PrintJob)
+class PrintJobAdmin(admin.ModelAdmin):
+    list_display = ["id", "printer", "state", "label_count", "attempts", "created"]
+    list_filter = ["state", "printer"]
+
+
+@admin.register(DocumentSequence)
+class DocumentSequenceAdmin(admin.ModelAdmin):
+    list_display = ["name", "period", "last_number", "changed"]
+    list_filter = ["name"]
+
+
 @admin.register(InboundWarehouseOrder)
 class InboundWarehouseOrderAdmin(admin.ModelAdmin):
     search_fields = ["code"]
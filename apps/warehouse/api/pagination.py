@@ -1,10 +1,19 @@
 from __future__ import annotations
 
-from django.db.models import QuerySet
+import binascii
+import json
+from abc import abstractmethod
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from django.db.models import F, Model, Q, QuerySet
 from django.http.request import HttpRequest
 from ninja import Schema
 from ninja.pagination import PaginationBase
+from pydantic import BaseModel
 
+from apps.warehouse.core.exceptions import InvalidCursorError
 from apps.warehouse.core.schemas.credit_notes import GetCreditNotesToSupplierResponse
 from apps.warehouse.core.schemas.customer import (
     GetCustomersResponse,
@@ -20,7 +29,7 @@ from apps.warehouse.core.schemas.group import (
 from apps.warehouse.core.schemas.type import (
     GetProductTypesResponse,
 )
-from apps.warehouse.core.schemas.manufacturing import ManufacturingOrderSchema
+from apps.warehouse.core.schemas.manufacturing import GetManufacturingOrdersResponse
 from apps.warehouse.core.schemas.orders import GetInboundOrdersResponse
 from apps.warehouse.core.schemas.orders import GetOutboundOrdersResponse
 from apps.warehouse.core.schemas.invoice import (
@@ -28,10 +37,8 @@ from apps.warehouse.core.schemas.invoice import (
     GetInvoicesResponse,
 )
 from apps.warehouse.core.schemas.packaging import (
-    BatchSchema,
     GetBatchesResponse,
     GetUnitOfMeasuresResponse,
-    UnitOfMeasureSchema,
 )
 from apps.warehouse.core.schemas.product import (
     GetProductsResponse,
@@ -42,6 +49,7 @@ from apps.warehouse.core.schemas.warehouse import (
     GetWarehouseLocationsResponse,
 )
 from apps.warehouse.core.transformation import (
+    batch_orm_to_schema,
     customer_orm_to_schema,
     customer_group_orm_to_schema,
     product_orm_to_schema,
@@ -55,266 +63,94 @@ from apps.warehouse.core.transformation import (
     location_orm_to_schema,
     invoice_payment_method_orm_to_schema,
     invoice_orm_to_schema,
-    barcode_orm_to_schema,
+    unit_of_measure_orm_to_schema,
 )
+from apps.warehouse.core.services.count_cache import count_cache_service
 from apps.warehouse.core.services.inventory_snapshots import inventory_snapshot_service
 from apps.warehouse.core.transformation import manufacturing_order_orm_to_schema
-from apps.warehouse.models.customer import Customer, CustomerGroup
-from apps.warehouse.models.manufacturing import ManufacturingOrder
-from apps.warehouse.models.orders import (
-    InboundOrder,
-    OutboundOrder,
-    CreditNoteToSupplier,
-    Invoice,
-    InvoicePaymentMethod,
-)
-from apps.warehouse.models.product import StockProduct, ProductGroup, ProductType
-from apps.warehouse.models.packaging import UnitOfMeasure
-from apps.warehouse.models.warehouse import (
-    Batch,
-    InventorySnapshot,
-    InboundWarehouseOrder,
-    OutboundWarehouseOrder,
-    WarehouseLocation,
-    WarehouseMovement,
-)
+from apps.warehouse.models.warehouse import WarehouseMovement
 
 
-class InventorySnapshotsPagination(PaginationBase):
-    items_attribute: str = "data"
+_CURSOR_VALUE = "_cursor_value"
 
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
 
-    class Output(GetInventorySnapshotsResponse): ...
+class _CursorPosition(NamedTuple):
+    value: Any
+    pk: Any
+    backwards: bool
 
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[InventorySnapshot],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
 
-        return {
-            "data": [
-                inventory_snapshot_service._to_summary_schema(snapshot)
-                for snapshot in items
-            ],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
+def _keyset_ordering(queryset: QuerySet) -> tuple[str, bool]:
+    """The queryset's leading ordering field and whether it's descending, pk if none."""
+    ordering = queryset.query.order_by or (
+        queryset.model._meta.ordering if queryset.query.default_ordering else ()
+    )
+    if ordering and isinstance(ordering[0], str) and ordering[0] != "?":
+        return ordering[0].lstrip("-"), ordering[0].startswith("-")
+    return "pk", False
 
 
-class StockProductPagination(PaginationBase):
-    items_attribute: str = "data"
+def _encode_cursor(item: Model, backwards: bool) -> str:
+    payload = json.dumps(
+        [getattr(item, _CURSOR_VALUE), item.pk, backwards], default=str
+    )
+    return urlsafe_b64encode(payload.encode()).decode()
 
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
 
-    class Output(GetProductsResponse): ...
+def _decode_cursor(cursor: str) -> _CursorPosition:
+    try:
+        value, pk, backwards = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise InvalidCursorError(f"Malformed cursor '{cursor}'") from exc
+    return _CursorPosition(value, pk, bool(backwards))
 
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[StockProduct],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [product_orm_to_schema(product) for product in items],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class CustomersPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetCustomersResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[Customer],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [customer_orm_to_schema(customer) for customer in items],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class CustomerGroupsPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetCustomerGroupsResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[CustomerGroup],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [customer_group_orm_to_schema(group) for group in items],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class IncomingOrdersPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetInboundOrdersResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[InboundOrder],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
 
-        return {
-            "data": [inbound_order_orm_to_schema(order) for order in items],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
+class WarehousePagination(PaginationBase):
+    """
+    Page based pagination with an opt-in keyset (cursor) mode.
 
+    Passing ``cursor`` switches to keyset pagination on (ordering key, pk), an empty
+    value requests the first page. ``next`` and ``previous`` are then opaque cursors
+    and the total count is only computed when ``with_count`` is set, so deep pages
+    cost the same as the first one.
+    """
 
-class OutgoingOrdersPagination(PaginationBase):
     items_attribute: str = "data"
+    cache_count: bool = False
 
     class Input(Schema):
         page: int = 1
         page_size: int = 20
+        cursor: str | None = None
+        with_count: bool = False
 
-    class Output(GetOutboundOrdersResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[OutboundOrder],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [outbound_order_orm_to_schema(order) for order in items],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
+    @abstractmethod
+    def to_schema(self, item: Any) -> Any:
+        """Render one paged item, ``model_pagination`` supplies the transformer."""
 
-
-class InvoicesPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetInvoicesResponse): ...
+    def count(self, queryset: QuerySet) -> int:
+        if self.cache_count:
+            return count_cache_service.count(queryset)
+        return queryset.count()
 
     def paginate_queryset(
         self,
-        queryset: QuerySet[Invoice],
+        queryset: QuerySet,
         pagination: Input,
         request: HttpRequest,
         **params,
     ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [invoice_orm_to_schema(invoice) for invoice in items],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class IncomingWarehouseOrdersPagination(PaginationBase):
-    items_attribute: str = "data"
+        if pagination.cursor is not None:
+            return self._paginate_by_cursor(queryset, pagination)
+        return self._paginate_by_page(queryset, pagination)
 
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetWarehouseOrdersResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[InboundWarehouseOrder],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
+    def _paginate_by_page(self, queryset: QuerySet, pagination: Input):
         offset = (pagination.page - 1) * pagination.page_size
         items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
+        count = self.count(queryset)
 
         return {
-            "data": [warehouse_inbound_order_orm_to_schema(order) for order in items],
+            "data": [self.to_schema(item) for item in items],
             "count": count,
             "next": pagination.page + 1
             if offset + pagination.page_size < count
@@ -322,340 +158,121 @@ class IncomingWarehouseOrdersPagination(PaginationBase):
             "previous": pagination.page - 1 if pagination.page > 1 else None,
         }
 
-
-class OutgoingWarehouseOrdersPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetOutboundWarehouseOrdersResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[OutboundWarehouseOrder],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
+    def _paginate_by_cursor(self, queryset: QuerySet, pagination: Input):
+        key, descending = _keyset_ordering(queryset)
+        position = _decode_cursor(pagination.cursor) if pagination.cursor else None
+        backwards = position is not None and position.backwards
+        # Walking backwards reads the preceding rows in reversed order.
+        reverse = descending != backwards
+
+        page = queryset.annotate(**{_CURSOR_VALUE: F(key)})
+        if position is not None:
+            lookup = "lt" if reverse else "gt"
+            page = page.filter(
+                Q(**{f"{key}__{lookup}": position.value})
+                | Q(**{key: position.value, f"pk__{lookup}": position.pk})
+            )
+        direction = "-" if reverse else ""
+        page = page.order_by(f"{direction}{key}", f"{direction}pk")
+
+        items = list(page[: pagination.page_size + 1])
+        has_more = len(items) > pagination.page_size
+        items = items[: pagination.page_size]
+        if backwards:
+            items.reverse()
+
+        has_next = bool(items) and (backwards or has_more)
+        has_previous = bool(items) and (has_more if backwards else position is not None)
 
         return {
-            "data": [warehouse_outbound_order_orm_to_schema(order) for order in items],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
+            "data": [self.to_schema(item) for item in items],
+            "count": self.count(queryset) if pagination.with_count else None,
+            "next": _encode_cursor(items[-1], backwards=False) if has_next else None,
+            "previous": _encode_cursor(items[0], backwards=True)
+            if has_previous
             else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
         }
 
 
-class CreditNoteToSupplierPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetCreditNotesToSupplierResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[CreditNoteToSupplier],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
+def model_pagination(
+    output: type[BaseModel],
+    transformer: Callable[[Any], Any],
+    *,
+    cache_count: bool = False,
+) -> type[WarehousePagination]:
+    """
+    Build a paginator responding with ``output`` whose items are rendered by ``transformer``.
 
-        return {
-            "data": [
-                credit_note_supplier_orm_to_schema(credit_note) for credit_note in items
-            ],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
+    With ``cache_count`` the total is served from the count cache, which is keyed by the
+    normalized count query and dropped on any write to the tables it reads. The paged
+    model has to be listed in ``count_cache.COUNTED_MODELS`` for that.
+    """
+    return type(
+        output.__name__.removeprefix("Get").removesuffix("Response") + "Pagination",
+        (WarehousePagination,),
+        {
+            "Output": output,
+            "to_schema": staticmethod(transformer),
+            "cache_count": cache_count,
+        },
+    )
 
 
-class WarehouseLocationsPagination(PaginationBase):
-    items_attribute: str = "data"
+def _movement_to_schema(movement: WarehouseMovement):
+    from apps.warehouse.core.services.movements import movement_service
 
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
+    return movement_service.movement_to_schema(movement)
 
-    class Output(GetWarehouseLocationsResponse): ...
 
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[WarehouseLocation],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [location_orm_to_schema(location) for location in items],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class ProductGroupPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetProductGroupsResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[ProductGroup],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [product_group_orm_to_schema(group) for group in items],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class ProductTypePagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetProductTypesResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[ProductType],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [
-                product_type_orm_to_schema(product_type) for product_type in items
-            ],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class UnitOfMeasurePagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetUnitOfMeasuresResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[UnitOfMeasure],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [
-                UnitOfMeasureSchema(
-                    created=item.created,
-                    changed=item.changed,
-                    name=item.name,
-                    amount_of_base_uom=float(item.amount_of_base_uom)
-                    if item.amount_of_base_uom is not None
-                    else None,
-                    base_uom=item.base_uom.name if item.base_uom else None,
-                )
-                for item in items
-            ],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class InvoicePaymentMethodPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetInvoicePaymentMethodsResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[InvoicePaymentMethod],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [
-                invoice_payment_method_orm_to_schema(payment_method)
-                for payment_method in items
-            ],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class BatchesPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetBatchesResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[Batch],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [
-                BatchSchema(
-                    id=batch.pk,
-                    created=batch.created,
-                    changed=batch.changed,
-                    primary_barcode=barcode_orm_to_schema(batch.get_primary_barcode())
-                    if batch.get_primary_barcode()
-                    else None,
-                    description=batch.description,
-                )
-                for batch in items
-            ],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class ManufacturingOrdersPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(Schema):
-        data: list[ManufacturingOrderSchema]
-        count: int
-        next: int | None
-        previous: int | None
-        success: bool = True
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[ManufacturingOrder],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [manufacturing_order_orm_to_schema(order) for order in items],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
-
-
-class WarehouseMovementsPagination(PaginationBase):
-    items_attribute: str = "data"
-
-    class Input(Schema):
-        page: int = 1
-        page_size: int = 20
-
-    class Output(GetWarehouseMovementsResponse): ...
-
-    def paginate_queryset(
-        self,
-        queryset: QuerySet[WarehouseMovement],
-        pagination: Input,
-        request: HttpRequest,
-        **params,
-    ):
-        from apps.warehouse.core.services.movements import movement_service
-
-        offset = (pagination.page - 1) * pagination.page_size
-        items = queryset[offset : offset + pagination.page_size]
-        count = queryset.count()
-
-        return {
-            "data": [
-                movement_service.movement_to_schema(movement) for movement in items
-            ],
-            "count": count,
-            "next": pagination.page + 1
-            if offset + pagination.page_size < count
-            else None,
-            "previous": pagination.page - 1 if pagination.page > 1 else None,
-        }
+InventorySnapshotsPagination = model_pagination(
+    GetInventorySnapshotsResponse, inventory_snapshot_service._to_summary_schema
+)
+StockProductPagination = model_pagination(
+    GetProductsResponse, product_orm_to_schema, cache_count=True
+)
+CustomersPagination = model_pagination(
+    GetCustomersResponse, customer_orm_to_schema, cache_count=True
+)
+CustomerGroupsPagination = model_pagination(
+    GetCustomerGroupsResponse, customer_group_orm_to_schema, cache_count=True
+)
+IncomingOrdersPagination = model_pagination(
+    GetInboundOrdersResponse, inbound_order_orm_to_schema
+)
+OutgoingOrdersPagination = model_pagination(
+    GetOutboundOrdersResponse, outbound_order_orm_to_schema
+)
+InvoicesPagination = model_pagination(GetInvoicesResponse, invoice_orm_to_schema)
+IncomingWarehouseOrdersPagination = model_pagination(
+    GetWarehouseOrdersResponse, warehouse_inbound_order_orm_to_schema
+)
+OutgoingWarehouseOrdersPagination = model_pagination(
+    GetOutboundWarehouseOrdersResponse, warehouse_outbound_order_orm_to_schema
+)
+CreditNoteToSupplierPagination = model_pagination(
+    GetCreditNotesToSupplierResponse, credit_note_supplier_orm_to_schema
+)
+WarehouseLocationsPagination = model_pagination(
+    GetWarehouseLocationsResponse, location_orm_to_schema, cache_count=True
+)
+ProductGroupPagination = model_pagination(
+    GetProductGroupsResponse, product_group_orm_to_schema, cache_count=True
+)
+ProductTypePagination = model_pagination(
+    GetProductTypesResponse, product_type_orm_to_schema, cache_count=True
+)
+UnitOfMeasurePagination = model_pagination(
+    GetUnitOfMeasuresResponse, unit_of_measure_orm_to_schema, cache_count=True
+)
+InvoicePaymentMethodPagination = model_pagination(
+    GetInvoicePaymentMethodsResponse,
+    invoice_payment_method_orm_to_schema,
+    cache_count=True,
+)
+BatchesPagination = model_pagination(GetBatchesResponse, batch_orm_to_schema)
+ManufacturingOrdersPagination = model_pagination(
+    GetManufacturingOrdersResponse, manufacturing_order_orm_to_schema
+)
+WarehouseMovementsPagination = model_pagination(
+    GetWarehouseMovementsResponse, _movement_to_schema
+)
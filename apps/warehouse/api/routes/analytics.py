@@ -11,10 +11,13 @@ from apps.warehouse.api.pagination import (
 from apps.warehouse.core.schemas.analytics import (
     GetInventorySnapshotResponse,
     GetLatestInventoryValueResponse,
+    GetMovementTrendsResponse,
+    GetOrderTrendsResponse,
     GetRecentActivityResponse,
     GetRecentOrdersActivityResponse,
     GetRecentOrdersResponse,
     GetRecentWarehouseMovementsResponse,
+    GetValueTrendsResponse,
     InventorySnapshotCreateSchema,
     InventorySnapshotSummarySchema,
     WarehouseMovementSchema,
@@ -53,6 +56,30 @@ def get_recent_orders_activity(request: HttpRequest, days: int = 14):
     )
 
 
+@routes.get("/trends/orders", response={200: GetOrderTrendsResponse})
+def get_order_trends(request: HttpRequest, days: int = 30):
+    return GetOrderTrendsResponse(data=analytics_service.get_order_trends(days=days))
+
+
+@routes.get("/trends/movements", response={200: GetMovementTrendsResponse})
+def get_movement_trends(
+    request: HttpRequest,
+    days: int = 30,
+    stock_product_id: int | None = Query(None),
+    location_id: int | None = Query(None),
+):
+    return GetMovementTrendsResponse(
+        data=analytics_service.get_movement_trends(
+            days=days, stock_product_id=stock_product_id, location_id=location_id
+        )
+    )
+
+
+@routes.get("/trends/values", response={200: GetValueTrendsResponse})
+def get_value_trends(request: HttpRequest, days: int = 30):
+    return GetValueTrendsResponse(data=analytics_service.get_value_trends(days=days))
+
+
 @routes.get(
     "/inventory-snapshots", response={200: list[InventorySnapshotSummarySchema]}
 )
@@ -69,6 +96,7 @@ def create_inventory_snapshot(
     snapshot = inventory_snapshot_service.create_snapshot(
         cadence=body.cadence,
         force=body.force,
+        delta=body.delta,
     )
     return GetInventorySnapshotResponse(data=snapshot)
 
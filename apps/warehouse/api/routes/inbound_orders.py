@@ -3,12 +3,15 @@ from typing import cast
 from django.core.files.uploadedfile import UploadedFile as DjangoUploadedFile
 from django.db.models import QuerySet
 from django.http import HttpRequest, HttpResponse
-from ninja import File, Form, Router
+from ninja import File, Form, Query, Router
 from ninja.files import UploadedFile
 from ninja.pagination import paginate
 
 from apps.warehouse.api.pagination import IncomingOrdersPagination
-from apps.warehouse.core.schemas.audit import GetAuditTimelineResponse
+from apps.warehouse.core.schemas.audit import (
+    AuditTimelineQuerySchema,
+    GetAuditTimelineResponse,
+)
 from apps.warehouse.core.schemas.base import EmptyResponse
 from apps.warehouse.core.schemas.context import RequestContext
 from apps.warehouse.core.schemas.invoice import InvoiceStoreSchema
@@ -76,9 +79,12 @@ def get_inbound_order(request: HttpRequest, order_code: str):
 
 
 @routes.get("/{order_code}/audits", response={200: GetAuditTimelineResponse})
-def get_inbound_order_audits(request: HttpRequest, order_code: str):
+def get_inbound_order_audits(
+    request: HttpRequest, order_code: str, filters: Query[AuditTimelineQuerySchema]
+):
     order = InboundOrder.objects.get(code=order_code)
-    return GetAuditTimelineResponse(data=audit_service.get_timeline_for_object(order))
+    page = audit_service.get_timeline_page(order, **filters.model_dump())
+    return GetAuditTimelineResponse(data=page.entries, next=page.next)
 
 
 @routes.put("/{order_code}", response={200: GetInboundOrderResponse})
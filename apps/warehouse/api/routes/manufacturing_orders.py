@@ -1,9 +1,12 @@
 from django.http import HttpRequest
-from ninja import Router
+from ninja import Query, Router
 from ninja.pagination import paginate
 
 from apps.warehouse.api.pagination import ManufacturingOrdersPagination
-from apps.warehouse.core.schemas.audit import GetAuditTimelineResponse
+from apps.warehouse.core.schemas.audit import (
+    AuditTimelineQuerySchema,
+    GetAuditTimelineResponse,
+)
 from apps.warehouse.core.schemas.base import EmptyResponse
 from apps.warehouse.core.schemas.context import RequestContext
 from apps.warehouse.core.schemas.manufacturing import (
@@ -134,6 +137,9 @@ def remove_item_from_manufacturing_order(
 
 
 @routes.get("/{order_code}/audits", response={200: GetAuditTimelineResponse})
-def get_manufacturing_order_audits(request: HttpRequest, order_code: str):
+def get_manufacturing_order_audits(
+    request: HttpRequest, order_code: str, filters: Query[AuditTimelineQuerySchema]
+):
     order = ManufacturingOrder.objects.get(code=order_code)
-    return GetAuditTimelineResponse(data=audit_service.get_timeline_for_object(order))
+    page = audit_service.get_timeline_page(order, **filters.model_dump())
+    return GetAuditTimelineResponse(data=page.entries, next=page.next)
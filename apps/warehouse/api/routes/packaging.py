@@ -27,7 +27,10 @@ from apps.warehouse.core.schemas.packaging import (
 )
 from apps.warehouse.core.services.batches import batches_service
 from apps.warehouse.core.services.package_types import package_types_service
-from apps.warehouse.core.transformation import package_type_orm_to_schema
+from apps.warehouse.core.transformation import (
+    package_type_orm_to_schema,
+    unit_of_measure_orm_to_schema,
+)
 from apps.warehouse.core.services.warehouse import warehouse_service
 from apps.warehouse.models.packaging import UnitOfMeasure
 
@@ -68,17 +71,7 @@ def create_unit(request: HttpRequest, body: UnitOfMeasureCreateOrUpdateSchema):
             "base_uom": base_uom,
         },
     )
-    return GetUnitOfMeasureResponse(
-        data=UnitOfMeasureSchema(
-            created=unit.created,
-            changed=unit.changed,
-            name=unit.name,
-            amount_of_base_uom=float(unit.amount_of_base_uom)
-            if unit.amount_of_base_uom is not None
-            else None,
-            base_uom=unit.base_uom.name if unit.base_uom else None,
-        )
-    )
+    return GetUnitOfMeasureResponse(data=unit_of_measure_orm_to_schema(unit))
 
 
 @routes.put("/units/{unit_name}", response={200: GetUnitOfMeasureResponse})
@@ -96,17 +89,7 @@ def update_unit(
     unit.amount_of_base_uom = body.amount_of_base_uom
     unit.base_uom = base_uom
     unit.save()
-    return GetUnitOfMeasureResponse(
-        data=UnitOfMeasureSchema(
-            created=unit.created,
-            changed=unit.changed,
-            name=unit.name,
-            amount_of_base_uom=float(unit.amount_of_base_uom)
-            if unit.amount_of_base_uom is not None
-            else None,
-            base_uom=unit.base_uom.name if unit.base_uom else None,
-        )
-    )
+    return GetUnitOfMeasureResponse(data=unit_of_measure_orm_to_schema(unit))
 
 
 @routes.post("/preview-package", response={200: PutInPackageResponse})
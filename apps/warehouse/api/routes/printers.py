@@ -8,15 +8,27 @@ from ninja import Router
 
 from apps.warehouse.core.schemas.printer import (
     DeletePrinterResponse,
+    GetLabelTemplateResponse,
+    GetLabelTemplatesResponse,
     GetPrinterResponse,
     GetPrintersResponse,
+    GetPrintJobResponse,
+    LabelTemplateCreateOrUpdateSchema,
     PrintBarcodeRequestSchema,
     PrintBarcodeResponse,
+    PrintLabelsRequestSchema,
+    PrintLabelsResponse,
+    PrintWarehouseOrderLabelsRequestSchema,
     PrinterCreateOrUpdateSchema,
 )
 from apps.warehouse.core.services.barcode_printer import barcode_printer_service
+from apps.warehouse.core.services.label_templates import label_templates_service
+from apps.warehouse.core.services.print_spooler import print_spooler_service
 from apps.warehouse.core.services.printers import printers_service
-from apps.warehouse.core.transformation import printer_orm_to_schema
+from apps.warehouse.core.transformation import (
+    print_job_orm_to_schema,
+    printer_orm_to_schema,
+)
 
 routes = Router(tags=["printers"])
 
@@ -41,6 +53,7 @@ def print_barcode(
     request: HttpRequest,
     body: PrintBarcodeRequestSchema,
     printer_code: str | None = None,
+    template_code: str | None = None,
 ):
     return PrintBarcodeResponse(
         data=barcode_printer_service.print_barcode(
@@ -49,10 +62,92 @@ def print_barcode(
             text=body.text,
             printer_code=printer_code,
             copies=body.copies,
+            template_code=template_code,
+        )
+    )
+
+
+@routes.post("/print/labels", response={200: PrintLabelsResponse})
+def print_labels(
+    request: HttpRequest,
+    body: PrintLabelsRequestSchema,
+    printer_code: str | None = None,
+    template_code: str | None = None,
+):
+    return PrintLabelsResponse(
+        data=barcode_printer_service.print_labels(
+            user=cast(User, request.user),
+            labels=body.labels,
+            printer_code=printer_code,
+            template_code=template_code,
+        )
+    )
+
+
+@routes.post(
+    "/print/warehouse-orders/{warehouse_order_code}",
+    response={200: PrintLabelsResponse},
+)
+def print_warehouse_order_labels(
+    request: HttpRequest,
+    warehouse_order_code: str,
+    body: PrintWarehouseOrderLabelsRequestSchema,
+    printer_code: str | None = None,
+    template_code: str | None = None,
+):
+    return PrintLabelsResponse(
+        data=barcode_printer_service.print_warehouse_order_labels(
+            user=cast(User, request.user),
+            warehouse_order_code=warehouse_order_code,
+            printer_code=printer_code,
+            copies=body.copies,
+            template_code=template_code,
         )
     )
 
 
+@routes.get("/templates", response={200: GetLabelTemplatesResponse})
+def get_label_templates(request: HttpRequest):
+    return GetLabelTemplatesResponse(
+        data=[
+            label_templates_service.to_schema(template)
+            for template in label_templates_service.get_templates()
+        ]
+    )
+
+
+@routes.post("/templates", response={200: GetLabelTemplateResponse})
+def create_label_template(
+    request: HttpRequest, body: LabelTemplateCreateOrUpdateSchema
+):
+    return GetLabelTemplateResponse(data=label_templates_service.create_template(body))
+
+
+@routes.put("/templates/{template_code}", response={200: GetLabelTemplateResponse})
+def update_label_template(
+    request: HttpRequest,
+    template_code: str,
+    body: LabelTemplateCreateOrUpdateSchema,
+):
+    return GetLabelTemplateResponse(
+        data=label_templates_service.update_template(template_code, body)
+    )
+
+
+@routes.delete("/templates/{template_code}", response={200: GetLabelTemplateResponse})
+def delete_label_template(request: HttpRequest, template_code: str):
+    return GetLabelTemplateResponse(
+        data=label_templates_service.delete_template(template_code)
+    )
+
+
+@routes.get("/jobs/{job_id}", response={200: GetPrintJobResponse})
+def get_print_job(request: HttpRequest, job_id: int):
+    return GetPrintJobResponse(
+        data=print_job_orm_to_schema(print_spooler_service.get_job(job_id))
+    )
+
+
 @routes.put("/{printer_code}", response={200: GetPrinterResponse})
 def update_printer(
     request: HttpRequest,
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 from typing import cast
 
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
 from django.http import HttpRequest
-from ninja import Router
+from ninja import Query, Router
 from ninja.pagination import paginate
 
 from apps.warehouse.api.pagination import ProductTypePagination, StockProductPagination
-from apps.warehouse.core.schemas.audit import GetAuditTimelineResponse
+from apps.warehouse.core.schemas.audit import (
+    AuditTimelineQuerySchema,
+    GetAuditTimelineResponse,
+)
 from apps.warehouse.core.schemas.type import (
     GetProductTypeResponse,
     ProductTypeCreateOrUpdateSchema,
@@ -37,10 +40,13 @@ from apps.warehouse.core.schemas.warehouse import (
     GetProductWarehouseInfoResponse,
     WarehouseExpandedSchema,
     GetProductWarehouseAvailabilityResponse,
+    GetProductsWarehouseAvailabilityResponse,
+    ProductWarehouseAvailabilityBulkSchema,
     WarehouseLocationDetailSchema,
 )
 from apps.warehouse.core.services.warehouse import warehouse_service
 from apps.warehouse.core.services.products import stock_product_service
+from apps.warehouse.core.services.product_search import product_search_service
 from apps.warehouse.core.services.barcode_generator import barcode_generator_service
 from apps.warehouse.core.transformation import (
     discount_group_orm_to_schema,
@@ -99,12 +105,7 @@ def get_products(
         ),
     )
     if search_term:
-        search_term = search_term.lower()
-        qs = qs.filter(
-            Q(code__iexact=search_term)
-            | Q(code__icontains=search_term)
-            | Q(name__icontains=search_term)
-        )
+        qs = product_search_service.search(qs, search_term)
 
     if product_type:
         qs = qs.filter(type__name=product_type)
@@ -120,6 +121,18 @@ def create_product(request: HttpRequest, body: ProductCreateOrUpdateSchema):
     return GetProductResponse(data=stock_product_service.create_product(body))
 
 
+@routes.post(
+    "/warehouse-availability",
+    response={200: GetProductsWarehouseAvailabilityResponse},
+)
+def get_products_warehouse_availability(
+    request: HttpRequest, body: ProductWarehouseAvailabilityBulkSchema
+):
+    return GetProductsWarehouseAvailabilityResponse(
+        data=warehouse_service.get_bulk_availability(body.product_codes)
+    )
+
+
 @routes.get("/{product_code}", response={200: GetProductResponse})
 def get_product(request: HttpRequest, product_code: str):
     # user = authenticate(
@@ -181,9 +194,12 @@ def duplicate_product(
 
 
 @routes.get("/{product_code}/audits", response={200: GetAuditTimelineResponse})
-def get_product_audits(request: HttpRequest, product_code: str):
+def get_product_audits(
+    request: HttpRequest, product_code: str, filters: Query[AuditTimelineQuerySchema]
+):
     product = StockProduct.objects.get(code=product_code)
-    return GetAuditTimelineResponse(data=audit_service.get_timeline_for_object(product))
+    page = audit_service.get_timeline_page(product, **filters.model_dump())
+    return GetAuditTimelineResponse(data=page.entries, next=page.next)
 
 
 @routes.post("/barcodes/generate", response={200: GetBarcodeGenerateResponse})
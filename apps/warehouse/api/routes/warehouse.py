@@ -2,7 +2,7 @@ from typing import cast
 
 from django.db.models import QuerySet, Q
 from django.http import HttpRequest
-from ninja import Router
+from ninja import Query, Router
 from ninja.pagination import paginate
 
 from apps.warehouse.api.pagination import (
@@ -10,7 +10,10 @@ from apps.warehouse.api.pagination import (
     OutgoingWarehouseOrdersPagination,
     WarehouseLocationsPagination,
 )
-from apps.warehouse.core.schemas.audit import GetAuditTimelineResponse
+from apps.warehouse.core.schemas.audit import (
+    AuditTimelineQuerySchema,
+    GetAuditTimelineResponse,
+)
 from apps.warehouse.core.schemas.base import EmptyResponse
 from apps.warehouse.core.schemas.context import RequestContext
 from apps.warehouse.core.schemas.warehouse import (
@@ -33,6 +36,8 @@ from apps.warehouse.core.schemas.warehouse import (
     GetWarehousesWithCountsResponse,
     WarehouseWithCountsSchema,
     OffloadItemsToChildOrderRequest,
+    BarcodeBatchLookupRequest,
+    BarcodeBatchLookupResponseWrapper,
     BarcodeLookupRequest,
     BarcodeLookupResponseWrapper,
     MoveItemRequest,
@@ -136,6 +141,18 @@ def barcode_lookup(request: HttpRequest, body: BarcodeLookupRequest):
     return BarcodeLookupResponseWrapper(data=result)
 
 
+@routes.post(
+    "barcode-lookup/batch",
+    response={200: BarcodeBatchLookupResponseWrapper},
+)
+def barcode_lookup_batch(request: HttpRequest, body: BarcodeBatchLookupRequest):
+    results = warehouse_service.barcode_lookup_many(
+        barcodes=body.barcodes,
+        product_code=body.product_code,
+    )
+    return BarcodeBatchLookupResponseWrapper(data=results)
+
+
 @routes.post(
     "orders-incoming",
     response={200: GetWarehouseOrderResponse},
@@ -254,9 +271,12 @@ def get_outbound_warehouse_order(request: HttpRequest, code: str):
     "orders-outgoing/{code}/audits",
     response={200: GetAuditTimelineResponse},
 )
-def get_outbound_warehouse_order_audits(request: HttpRequest, code: str):
+def get_outbound_warehouse_order_audits(
+    request: HttpRequest, code: str, filters: Query[AuditTimelineQuerySchema]
+):
     order = OutboundWarehouseOrder.objects.get(code=code)
-    return GetAuditTimelineResponse(data=audit_service.get_timeline_for_object(order))
+    page = audit_service.get_timeline_page(order, **filters.model_dump())
+    return GetAuditTimelineResponse(data=page.entries, next=page.next)
 
 
 @routes.get(
@@ -297,9 +317,12 @@ def assign_outbound_warehouse_order_item(
     "orders-incoming/{code}/audits",
     response={200: GetAuditTimelineResponse},
 )
-def get_inbound_warehouse_order_audits(request: HttpRequest, code: str):
+def get_inbound_warehouse_order_audits(
+    request: HttpRequest, code: str, filters: Query[AuditTimelineQuerySchema]
+):
     order = InboundWarehouseOrder.objects.get(code=code)
-    return GetAuditTimelineResponse(data=audit_service.get_timeline_for_object(order))
+    page = audit_service.get_timeline_page(order, **filters.model_dump())
+    return GetAuditTimelineResponse(data=page.entries, next=page.next)
 
 
 @routes.put(
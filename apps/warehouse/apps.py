@@ -7,9 +7,30 @@ class WarehouseConfig(AppConfig):
     name = "apps.warehouse"
 
     def ready(self):
+        from apps.warehouse.core.auth import token_user_cache
+        from apps.warehouse.core.services.audit import choice_label_registry
+        from apps.warehouse.core.services.barcode_resolution import (
+            barcode_resolution_cache,
+        )
+        from apps.warehouse.core.services.count_cache import count_cache_service
+        from apps.warehouse.core.services.lookup_cache import lookup_cache_service
+        from apps.warehouse.core.services.pdf import pdf_cache_service
+        from apps.warehouse.core.services.product_search import product_search_service
+        from apps.warehouse.core.services.rollups import rollup_service
+        from apps.warehouse.core.services.stock_ledger import stock_ledger_service
+
         connection_created.connect(
             self._configure_sqlite_connection, dispatch_uid="warehouse.sqlite.pragmas"
         )
+        stock_ledger_service.connect_signals()
+        barcode_resolution_cache.connect_signals()
+        count_cache_service.connect_signals()
+        product_search_service.connect_signals()
+        lookup_cache_service.connect_signals()
+        rollup_service.connect_signals()
+        token_user_cache.connect_signals()
+        pdf_cache_service.connect_signals()
+        choice_label_registry.build()
 
     @staticmethod
     def _configure_sqlite_connection(sender, connection, **kwargs):
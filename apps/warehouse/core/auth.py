@@ -1,8 +1,13 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
 from datetime import timedelta, datetime, timezone
 
 import jwt
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
 from ninja.security import HttpBearer
 from loguru import logger
 
@@ -13,6 +18,68 @@ JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 15
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+USER_CACHE_SIZE = 1024
+# Bounds staleness of users changed by other worker processes.
+USER_CACHE_TTL_SECONDS = 60
+
+
+class TokenUserCache:
+    """
+    In-process LRU cache of users authenticated by a token, keyed by (user_id, iat).
+
+    User saves and deletes in this process drop all entries of that user right
+    away, changes made elsewhere are picked up after ``ttl`` seconds. Every hit
+    returns a copy, so requests never share a user instance.
+    """
+
+    def __init__(
+        self, max_size: int = USER_CACHE_SIZE, ttl: float = USER_CACHE_TTL_SECONDS
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[int, float], tuple[float, User]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, issued_at: float) -> User:
+        """Return the user, raises ``User.DoesNotExist`` like ``User.objects.get``."""
+        key = (user_id, issued_at)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                self._entries.move_to_end(key)
+                return copy.copy(entry[1])
+
+        user = User.objects.get(id=user_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.copy(user))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _on_user_change(self, sender, instance, **kwargs) -> None:
+        self.invalidate(instance.pk)
+
+    def connect_signals(self) -> None:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                self._on_user_change, sender=User, dispatch_uid="warehouse.token_users"
+            )
+
+
+token_user_cache = TokenUserCache()
+
 
 class TokenAuth(HttpBearer):
     def authenticate(self, request, token) -> User | None:
@@ -24,8 +91,10 @@ class TokenAuth(HttpBearer):
             if payload.get("token_type") != "access":
                 return None
 
-            # Get the user
-            user = User.objects.get(id=payload["user_id"])
+            # Get the user, cached for repeated requests with the same token
+            user = token_user_cache.get(payload["user_id"], payload.get("iat", 0))
+            if not user.is_active:
+                return None
             return user
 
         except jwt.ExpiredSignatureError:
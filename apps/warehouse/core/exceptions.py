@@ -17,6 +17,8 @@ class ErrorCode(enum.Enum):
     WAREHOUSE_ITEM_NOT_FOUND = ("WAR_0002", "WarehouseItem: not found")
     WAREHOUSE_ITEM_NOT_EDITABLE = ("WAR_0003", "WarehouseOrder: read only")
 
+    INVALID_CURSOR = ("PAGE_0001", "Invalid pagination cursor")
+
     @property
     def code(self):
         return self.value[0]
@@ -65,6 +67,11 @@ class WarehouseOrderNotEditableError(ApiBaseException):
     http_status = 400
 
 
+class InvalidCursorError(ApiBaseException):
+    code = ErrorCode.INVALID_CURSOR
+    http_status = 400
+
+
 def raise_by_code(code: ErrorCode, message: str) -> NoReturn:
     exc = ApiBaseException(message)
     exc.code = code
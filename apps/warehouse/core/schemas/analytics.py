@@ -25,6 +25,7 @@ class InventorySnapshotSummarySchema(BaseModel):
     trigger_source: str
     cadence: str | None = None
     bucket_key: str | None = None
+    base_snapshot_id: int | None = None
     line_count: int
     purchase_totals: list[InventorySnapshotCurrencyTotal]
     receipt_totals: list[InventorySnapshotCurrencyTotal]
@@ -59,6 +60,7 @@ class InventorySnapshotDetailSchema(InventorySnapshotSummarySchema):
 class InventorySnapshotCreateSchema(BaseModel):
     cadence: str | None = None
     force: bool = False
+    delta: bool = False
 
 
 class LatestInventoryValueSchema(BaseModel):
@@ -109,6 +111,47 @@ class GetRecentOrdersActivityResponse(BaseResponse):
     data: RecentOrdersSchema
 
 
+class OrderTrendPointSchema(BaseModel):
+    date: date
+    created: int
+    closed: int
+
+
+class OrderTrendsSchema(BaseModel):
+    days: int
+    inbound_orders: list[OrderTrendPointSchema]
+    outbound_orders: list[OrderTrendPointSchema]
+    inbound_warehouse_orders: list[OrderTrendPointSchema]
+    outbound_warehouse_orders: list[OrderTrendPointSchema]
+
+
+class GetOrderTrendsResponse(BaseResponse):
+    data: OrderTrendsSchema
+
+
+class MovementTrendPointSchema(BaseModel):
+    date: date
+    quantity_in: Decimal
+    quantity_out: Decimal
+    movement_count: int
+
+
+class GetMovementTrendsResponse(BaseResponse):
+    data: list[MovementTrendPointSchema]
+
+
+class ValueTrendPointSchema(BaseModel):
+    date: date
+    kind: str
+    currency: str
+    order_count: int
+    total_value: Decimal
+
+
+class GetValueTrendsResponse(BaseResponse):
+    data: list[ValueTrendPointSchema]
+
+
 class StockProductMinimalSchema(BaseModel):
     code: str
     name: str
@@ -4,10 +4,12 @@ from datetime import datetime
 from typing import Literal
 
 from ninja import Schema
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from .base import BaseResponse
 
+TIMELINE_PAGE_SIZE = 100
+
 
 class AuditTimelineEntrySchema(Schema):
     id: int
@@ -22,5 +24,26 @@ class AuditTimelineEntrySchema(Schema):
     object_repr: str | None = None
 
 
+class AuditTimelineQuerySchema(Schema):
+    cursor: str | None = None
+    # Without a cursor or page size the whole timeline is returned, as clients
+    # that don't follow ``next`` expect.
+    page_size: int | None = Field(default=None, ge=1, le=1000)
+    from_date: datetime | None = None
+    to_date: datetime | None = None
+
+    @model_validator(mode="after")
+    def default_page_size(self) -> AuditTimelineQuerySchema:
+        if self.cursor and self.page_size is None:
+            self.page_size = TIMELINE_PAGE_SIZE
+        return self
+
+
+class AuditTimelinePageSchema(Schema):
+    entries: list[AuditTimelineEntrySchema]
+    next: str | None = None
+
+
 class GetAuditTimelineResponse(BaseResponse):
     data: list[AuditTimelineEntrySchema]
+    next: str | None = None
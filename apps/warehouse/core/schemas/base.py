@@ -43,9 +43,9 @@ T = TypeVar("T")
 
 class PaginatedResponse(BaseResponse, Generic[T]):
     data: list[T]
-    count: int
-    next: int | None
-    previous: int | None
+    count: int | None
+    next: int | str | None
+    previous: int | str | None
 
 
 class Response(BaseResponse, Generic[T]):
@@ -1,5 +1,6 @@
+from django.contrib.auth.models import User
 from django.http.request import HttpRequest
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 class RequestContext(BaseModel):
@@ -7,9 +8,22 @@ class RequestContext(BaseModel):
     user_id: int | None = None
     username: str | None = None
 
+    _user: User | None = PrivateAttr(default=None)
+
     @classmethod
     def from_django_request(cls, req: HttpRequest) -> RequestContext:
-        return cls(
+        context = cls(
             username=req.user.username,
             user_id=req.user.id,
         )
+        if isinstance(req.user, User):
+            # Already resolved by the authentication, services reuse it.
+            context._user = req.user
+        return context
+
+    @property
+    def user(self) -> User | None:
+        """The acting user, fetched at most once if the context wasn't built from a request."""
+        if self._user is None and self.user_id is not None:
+            self._user = User.objects.get(pk=self.user_id)
+        return self._user
@@ -4,7 +4,7 @@ from typing import Literal
 from ninja import Schema
 from pydantic import Field
 
-from .base import BaseSchema, BaseResponse
+from .base import BaseSchema, BaseResponse, PaginatedResponse
 from .base_orders import (
     BaseOrder,
     OutboundWarehouseOrderBaseSchema,
@@ -71,5 +71,8 @@ class GetManufacturingOrderResponse(BaseResponse):
     data: ManufacturingOrderSchema
 
 
+class GetManufacturingOrdersResponse(PaginatedResponse[ManufacturingOrderSchema]): ...
+
+
 class CreateManufacturingOrderItemResponse(BaseResponse):
     data: ManufacturingOrderItemSchema
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from ninja import Schema
 
 from .base import BaseResponse, Response
@@ -12,6 +14,7 @@ class PrinterSchema(BaseSchema):
     ip: str | None = None
     port: int = 9100
     dpi: int | None = None
+    label_template_code: str | None = None
 
 
 class GetPrintersResponse(BaseResponse):
@@ -24,6 +27,7 @@ class PrinterCreateOrUpdateSchema(Schema):
     ip: str | None = None
     port: int = 9100
     dpi: int | None = None
+    label_template_code: str | None = None
 
 
 class GetPrinterResponse(Response[PrinterSchema]): ...
@@ -32,6 +36,27 @@ class GetPrinterResponse(Response[PrinterSchema]): ...
 class DeletePrinterResponse(Response[PrinterSchema]): ...
 
 
+class LabelTemplateSchema(BaseSchema):
+    code: str
+    description: str | None = None
+    content: str
+    version: int
+    slots: list[str]
+
+
+class GetLabelTemplatesResponse(BaseResponse):
+    data: list[LabelTemplateSchema]
+
+
+class LabelTemplateCreateOrUpdateSchema(Schema):
+    code: str
+    description: str | None = None
+    content: str
+
+
+class GetLabelTemplateResponse(Response[LabelTemplateSchema]): ...
+
+
 class SetDefaultPrinterRequestSchema(Schema):
     printer_code: str | None = None
 
@@ -49,6 +74,44 @@ class PrintBarcodeRequestSchema(Schema):
 class PrintBarcodeResultSchema(Schema):
     printer_code: str
     copies: int
+    job_id: int
 
 
 class PrintBarcodeResponse(Response[PrintBarcodeResultSchema]): ...
+
+
+class LabelSchema(Schema):
+    barcode: str
+    text: str = ""
+    copies: int = 1
+    fields: dict[str, str] = {}
+
+
+class PrintLabelsRequestSchema(Schema):
+    labels: list[LabelSchema]
+
+
+class PrintWarehouseOrderLabelsRequestSchema(Schema):
+    copies: int = 1
+
+
+class PrintLabelsResultSchema(Schema):
+    printer_code: str
+    label_count: int
+    job_id: int
+
+
+class PrintLabelsResponse(Response[PrintLabelsResultSchema]): ...
+
+
+class PrintJobSchema(BaseSchema):
+    id: int
+    printer_code: str
+    state: str
+    label_count: int
+    attempts: int
+    last_error: str | None = None
+    printed_at: datetime | None = None
+
+
+class GetPrintJobResponse(Response[PrintJobSchema]): ...
@@ -88,6 +88,10 @@ class ProductWarehouseAvailability(Schema):
     incoming_amount: Decimal
 
 
+class ProductWarehouseAvailabilityBulkSchema(Schema):
+    product_codes: list[str]
+
+
 class WarehouseLocationDetailSchema(WarehouseLocationSchema):
     items: list[WarehouseItemSchema]
 
@@ -219,6 +223,10 @@ class GetProductWarehouseAvailabilityResponse(BaseResponse):
     data: ProductWarehouseAvailability
 
 
+class GetProductsWarehouseAvailabilityResponse(BaseResponse):
+    data: dict[str, ProductWarehouseAvailability]
+
+
 class GetProductWarehouseInfoResponse(BaseResponse):
     data: list[WarehouseExpandedSchema]
 
@@ -311,3 +319,12 @@ class BarcodeLookupResponse(Schema):
 
 class BarcodeLookupResponseWrapper(BaseResponse):
     data: BarcodeLookupResponse
+
+
+class BarcodeBatchLookupRequest(Schema):
+    barcodes: list[str]
+    product_code: str | None = None
+
+
+class BarcodeBatchLookupResponseWrapper(BaseResponse):
+    data: list[BarcodeLookupResponse]
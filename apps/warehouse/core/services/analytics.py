@@ -1,147 +1,195 @@
 from __future__ import annotations
 
-from datetime import date, datetime, time, timedelta
+from datetime import date, timedelta
+from decimal import Decimal
 
-from django.db.models import Count, Q
-from django.db.models.functions import TruncDate
+from django.db.models import Case, DateField, F, Sum, Value, When
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 from apps.warehouse.core.schemas.analytics import (
+    MovementTrendPointSchema,
+    OrderTrendPointSchema,
+    OrderTrendsSchema,
     RecentOrdersDailyPointSchema,
     RecentOrdersSchema,
+    ValueTrendPointSchema,
 )
-from apps.warehouse.models.orders import (
-    InboundOrder,
-    InboundOrderState,
-    OutboundOrder,
-    OutboundOrderState,
-)
-from apps.warehouse.models.warehouse import (
-    InboundWarehouseOrder,
-    InboundWarehouseOrderState,
-    OutboundWarehouseOrder,
-    OutboundWarehouseOrderState,
+from apps.warehouse.core.services.rollups import (
+    CLOSED_ORDER_STATES,
+    TERMINAL_ORDER_STATES,
+    rollup_service,
 )
+from apps.warehouse.models.analytics import DELETED_ORDER_STATE, RollupOrderKind
 
 
-def _daily_counts(
-    queryset, start: date, end: date
-) -> list[RecentOrdersDailyPointSchema]:
-    tz = timezone.get_current_timezone()
-    raw = (
-        queryset.annotate(day=TruncDate("created", tzinfo=tz))
-        .values("day")
-        .annotate(value=Count("id"))
-    )
-    counts: dict[date, int] = {row["day"]: row["value"] for row in raw}
+def _date_range(days: int) -> tuple[date, date]:
+    today = timezone.localdate()
+    return today - timedelta(days=days - 1), today
 
-    return [
-        RecentOrdersDailyPointSchema(
-            date=start + timedelta(days=offset),
-            value=counts.get(start + timedelta(days=offset), 0),
-        )
-        for offset in range((end - start).days + 1)
-    ]
+
+def _dates(start: date, end: date) -> list[date]:
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def _closed_change(kind: RollupOrderKind) -> Case:
+    """Net number of orders that became closed (or were deleted) on a rollup row."""
+    return Case(
+        When(
+            state__in=(*CLOSED_ORDER_STATES[kind], DELETED_ORDER_STATE),
+            then=F("entered_count") - F("left_count"),
+        ),
+        default=Value(0),
+    )
 
 
 def _daily_active_counts(
-    queryset, start: date, end: date, closed_states: list
+    kind: RollupOrderKind, start: date, end: date
 ) -> list[RecentOrdersDailyPointSchema]:
-    """Count active (non-closed) orders that existed on each day."""
-    tz = timezone.get_current_timezone()
+    """
+    Count active (non-closed) orders that existed on each day.
+
+    Reads the order rollup with all days before ``start`` folded into it, the
+    number of active orders is the running sum of created minus closed orders.
+    """
+    bucket = Greatest(F("day"), Value(start, output_field=DateField()))
+    rows = (
+        rollup_service.order_rows(kind, end)
+        .annotate(bucket=bucket)
+        .values("bucket")
+        .annotate(created=Sum("created_count"), closed=Sum(_closed_change(kind)))
+    )
+    changes = {row["bucket"]: row["created"] - row["closed"] for row in rows}
 
     result = []
-    for offset in range((end - start).days + 1):
-        current_date = start + timedelta(days=offset)
-        day_end = timezone.make_aware(datetime.combine(current_date, time.max), tz)
-
-        # Count orders that:
-        # - were created before or during this day
-        # - were NOT in a closed state during this day
-        # (either never closed, or closed after this day ended)
-        count = (
-            queryset.filter(
-                created__lte=day_end,
-            )
-            .exclude(Q(state__in=closed_states) & Q(changed__lte=day_end))
-            .count()
-        )
+    active = 0
+    for current_date in _dates(start, end):
+        active += changes.get(current_date, 0)
+        result.append(RecentOrdersDailyPointSchema(date=current_date, value=active))
+    return result
 
-        result.append(
-            RecentOrdersDailyPointSchema(
-                date=current_date,
-                value=count,
-            )
-        )
 
-    return result
+def _order_trend(
+    kind: RollupOrderKind, start: date, end: date
+) -> list[OrderTrendPointSchema]:
+    rows = (
+        rollup_service.order_rows(kind, end)
+        .filter(day__gte=start)
+        .values("day")
+        .annotate(
+            created=Sum("created_count"),
+            # Net number of orders finished on the day, drafts are not closed.
+            closed=Sum(
+                Case(
+                    When(
+                        state__in=TERMINAL_ORDER_STATES[kind],
+                        then=F("entered_count") - F("left_count"),
+                    ),
+                    default=Value(0),
+                )
+            ),
+        )
+    )
+    by_day = {row["day"]: row for row in rows}
+    return [
+        OrderTrendPointSchema(
+            date=current_date,
+            created=by_day.get(current_date, {}).get("created", 0),
+            closed=by_day.get(current_date, {}).get("closed", 0),
+        )
+        for current_date in _dates(start, end)
+    ]
 
 
 class AnalyticsService:
     @staticmethod
     def get_active_warehouse_orders(days: int) -> RecentOrdersSchema:
         days = max(1, days)
-        tz = timezone.get_current_timezone()
-        today = timezone.now().astimezone(tz).date()
-        start = today - timedelta(days=days - 1)
-
-        inbound_qs = InboundWarehouseOrder.objects.all()
-        outbound_qs = OutboundWarehouseOrder.objects.all()
-
-        inbound_closed_states = [
-            InboundWarehouseOrderState.IN_TRANSIT,
-            InboundWarehouseOrderState.COMPLETED,
-            InboundWarehouseOrderState.CANCELLED,
-        ]
-        outbound_closed_states = [
-            OutboundWarehouseOrderState.COMPLETED,
-            OutboundWarehouseOrderState.CANCELLED,
-        ]
+        start, today = _date_range(days)
 
         return RecentOrdersSchema(
             days=days,
             inbound=_daily_active_counts(
-                inbound_qs, start, today, inbound_closed_states
+                RollupOrderKind.INBOUND_WAREHOUSE_ORDER, start, today
             ),
             outbound=_daily_active_counts(
-                outbound_qs, start, today, outbound_closed_states
+                RollupOrderKind.OUTBOUND_WAREHOUSE_ORDER, start, today
             ),
         )
 
     @staticmethod
     def get_active_orders(days: int) -> RecentOrdersSchema:
         days = max(1, days)
-        tz = timezone.get_current_timezone()
-        today = timezone.now().astimezone(tz).date()
-        start = today - timedelta(days=days - 1)
+        start, today = _date_range(days)
 
-        inbound_qs = InboundOrder.objects.all()
-        outbound_qs = OutboundOrder.objects.all()
+        return RecentOrdersSchema(
+            days=days,
+            inbound=_daily_active_counts(RollupOrderKind.INBOUND_ORDER, start, today),
+            outbound=_daily_active_counts(RollupOrderKind.OUTBOUND_ORDER, start, today),
+        )
 
-        inbound_closed_states = [
-            InboundOrderState.DRAFT,
-            InboundOrderState.COMPLETED,
-            InboundOrderState.CANCELLED,
-        ]
-        outbound_closed_states = [
-            OutboundOrderState.DRAFT,
-            OutboundOrderState.COMPLETED,
-            OutboundOrderState.CANCELLED,
-            OutboundOrderState.COMPLETED_PAID,
-            OutboundOrderState.SENT,
-            OutboundOrderState.INVOICED,
-            OutboundOrderState.WAITING_FOR_PAYMENT,
-        ]
+    @staticmethod
+    def get_order_trends(days: int) -> OrderTrendsSchema:
+        days = max(1, days)
+        start, today = _date_range(days)
 
-        return RecentOrdersSchema(
+        return OrderTrendsSchema(
             days=days,
-            inbound=_daily_active_counts(
-                inbound_qs, start, today, inbound_closed_states
+            inbound_orders=_order_trend(RollupOrderKind.INBOUND_ORDER, start, today),
+            outbound_orders=_order_trend(RollupOrderKind.OUTBOUND_ORDER, start, today),
+            inbound_warehouse_orders=_order_trend(
+                RollupOrderKind.INBOUND_WAREHOUSE_ORDER, start, today
             ),
-            outbound=_daily_active_counts(
-                outbound_qs, start, today, outbound_closed_states
+            outbound_warehouse_orders=_order_trend(
+                RollupOrderKind.OUTBOUND_WAREHOUSE_ORDER, start, today
             ),
         )
 
+    @staticmethod
+    def get_movement_trends(
+        days: int,
+        stock_product_id: int | None = None,
+        location_id: int | None = None,
+    ) -> list[MovementTrendPointSchema]:
+        days = max(1, days)
+        start, today = _date_range(days)
+
+        rows = (
+            rollup_service.movement_rows(start, today, stock_product_id, location_id)
+            .values("day")
+            .annotate(
+                quantity_in=Sum("quantity_in"),
+                quantity_out=Sum("quantity_out"),
+                movement_count=Sum("movement_count"),
+            )
+        )
+        by_day = {row["day"]: row for row in rows}
+        zero = Decimal(0)
+        return [
+            MovementTrendPointSchema(
+                date=current_date,
+                quantity_in=by_day.get(current_date, {}).get("quantity_in", zero),
+                quantity_out=by_day.get(current_date, {}).get("quantity_out", zero),
+                movement_count=by_day.get(current_date, {}).get("movement_count", 0),
+            )
+            for current_date in _dates(start, today)
+        ]
+
+    @staticmethod
+    def get_value_trends(days: int) -> list[ValueTrendPointSchema]:
+        days = max(1, days)
+        start, today = _date_range(days)
+
+        return [
+            ValueTrendPointSchema(
+                date=row.day,
+                kind=row.kind,
+                currency=row.currency,
+                order_count=row.order_count,
+                total_value=row.total_value,
+            )
+            for row in rollup_service.value_rows(start, today)
+        ]
+
 
 analytics_service = AnalyticsService()
@@ -1,35 +1,35 @@
 from __future__ import annotations
 
-from typing import Any
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Any, NamedTuple
 
-from django.core.exceptions import FieldDoesNotExist
+from django.apps import apps as django_apps
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
+from apps.warehouse.core.exceptions import InvalidCursorError
 from apps.warehouse.core.schemas.analytics import RecentActivityEntrySchema
-from apps.warehouse.core.schemas.audit import AuditTimelineEntrySchema
-from apps.warehouse.models.audit import AuditAction, AuditLog, create_audit_log
+from apps.warehouse.core.schemas.audit import (
+    TIMELINE_PAGE_SIZE,
+    AuditTimelineEntrySchema,
+    AuditTimelinePageSchema,
+)
+from apps.warehouse.core.services.audit_archive import audit_archive_service
+from apps.warehouse.core.services.audit_writer import audit_writer
+from apps.warehouse.models.audit import AuditAction, AuditLog, build_audit_log
 from apps.warehouse.models.warehouse import WarehouseMovement
 
 
-def _get_choice_label_mapping(
-    model_class: type[models.Model] | None, field_name: str
-) -> dict[Any, str] | None:
-    if model_class is None:
+def _choice_labels(field: models.Field) -> dict[Any, str] | None:
+    if not getattr(field, "choices", None):
         return None
 
-    try:
-        field = model_class._meta.get_field(field_name)
-    except FieldDoesNotExist:
-        return None
-
-    field_choices = getattr(field, "choices", None)
-    if not field_choices:
-        return None
-
-    flat_choices = getattr(field, "flatchoices", ())
     labels: dict[Any, str] = {}
-    for raw_value, label in flat_choices:
+    for raw_value, label in field.flatchoices:
         label_text = str(label)
         labels[raw_value] = label_text
         labels[str(raw_value)] = label_text
@@ -37,6 +37,40 @@ def _get_choice_label_mapping(
     return labels or None
 
 
+class ChoiceLabelRegistry:
+    """
+    Display labels of choice fields, per model and field name.
+
+    Built once from the app registry when the app is ready, so formatting the
+    changes of audit log entries doesn't introspect model fields per entry.
+    Models are keyed by their lowercased label, which content types match.
+    """
+
+    def __init__(self) -> None:
+        self._labels: dict[str, dict[str, dict[Any, str]]] | None = None
+
+    def build(self) -> None:
+        labels: dict[str, dict[str, dict[Any, str]]] = {}
+        for model in django_apps.get_models():
+            field_labels = {}
+            for field in model._meta.fields:
+                choice_labels = _choice_labels(field)
+                if choice_labels:
+                    field_labels[field.name] = choice_labels
+            if field_labels:
+                labels[model._meta.label_lower] = field_labels
+        self._labels = labels
+
+    def for_content_type(self, content_type: ContentType) -> dict[str, dict[Any, str]]:
+        if self._labels is None:
+            self.build()
+        labels = self._labels or {}
+        return labels.get(f"{content_type.app_label}.{content_type.model}", {})
+
+
+choice_label_registry = ChoiceLabelRegistry()
+
+
 def _format_choice_value(choice_labels: dict[Any, str], value: Any) -> Any:
     if isinstance(value, list):
         return [_format_choice_value(choice_labels, item) for item in value]
@@ -46,11 +80,11 @@ def _format_choice_value(choice_labels: dict[Any, str], value: Any) -> Any:
 
 def _normalize_choice_changes(log: AuditLog) -> tuple[dict[str, Any], dict[str, Any]]:
     raw_changes = log.changes if isinstance(log.changes, dict) else {}
-    model_class = log.content_type.model_class()
+    field_labels = choice_label_registry.for_content_type(log.content_type)
     normalized_changes: dict[str, Any] = {}
 
     for field_name, value in raw_changes.items():
-        choice_labels = _get_choice_label_mapping(model_class, field_name)
+        choice_labels = field_labels.get(field_name)
         if not choice_labels:
             normalized_changes[field_name] = value
             continue
@@ -113,6 +147,22 @@ def audit_log_to_timeline_entry(log: AuditLog) -> AuditTimelineEntrySchema:
     )
 
 
+def archived_audit_log_to_timeline_entry(record: dict) -> AuditTimelineEntrySchema:
+    log = AuditLog(
+        pk=record["id"],
+        action=record["action"],
+        content_type=ContentType.objects.get_by_natural_key(*record["content_type"]),
+        object_id=record["object_id"],
+        object_repr=record["object_repr"],
+        changes=record["changes"],
+        reason=record["reason"],
+        created=datetime.fromisoformat(record["created"]),
+    )
+    return audit_log_to_timeline_entry(log).model_copy(
+        update={"actor_user": record["username"]}
+    )
+
+
 def movement_to_timeline_entry(movement: WarehouseMovement) -> AuditTimelineEntrySchema:
     location_from_code = (
         movement.location_from.code if movement.location_from else "None"
@@ -152,6 +202,64 @@ def movement_to_timeline_entry(movement: WarehouseMovement) -> AuditTimelineEntr
     )
 
 
+class _TimelinePosition(NamedTuple):
+    source: str
+    id: int
+    happened_at: datetime
+
+
+def _encode_timeline_cursor(position: _TimelinePosition) -> str:
+    payload = json.dumps(
+        [position.source, position.id, position.happened_at.isoformat()]
+    )
+    return urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_timeline_cursor(cursor: str) -> _TimelinePosition:
+    try:
+        source, entry_id, happened_at = json.loads(urlsafe_b64decode(cursor.encode()))
+        return _TimelinePosition(
+            str(source), int(entry_id), datetime.fromisoformat(happened_at)
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise InvalidCursorError(f"Malformed cursor '{cursor}'") from exc
+
+
+def _timeline_branch(
+    queryset: models.QuerySet,
+    source: str,
+    time_field: str,
+    position: _TimelinePosition | None,
+    from_date: datetime | None,
+    to_date: datetime | None,
+) -> models.QuerySet:
+    """Project one timeline source onto the (source, entry_id, happened_at) columns."""
+    if from_date:
+        queryset = queryset.filter(**{f"{time_field}__gte": from_date})
+    if to_date:
+        queryset = queryset.filter(**{f"{time_field}__lte": to_date})
+    if position is not None:
+        # Entries are ordered by time, source and id, all descending.
+        preceding = models.Q(**{f"{time_field}__lt": position.happened_at})
+        if source < position.source:
+            preceding |= models.Q(**{time_field: position.happened_at})
+        elif source == position.source:
+            preceding |= models.Q(
+                **{time_field: position.happened_at, "pk__lt": position.id}
+            )
+        queryset = queryset.filter(preceding)
+
+    return (
+        queryset.order_by()
+        .annotate(
+            source=models.Value(source, output_field=models.CharField()),
+            entry_id=models.F("pk"),
+            happened_at=models.F(time_field),
+        )
+        .values_list("source", "entry_id", "happened_at")
+    )
+
+
 def _fallback_recent_activity_message(log: AuditLog) -> str:
     action_labels = {
         AuditAction.CREATE: "Vytvořen záznam",
@@ -197,9 +305,13 @@ class AuditService:
         reason: str | None = None,
         object_repr: str | None = None,
     ) -> AuditLog:
-        if isinstance(user, int):
-            user = User.objects.get(pk=user)
-        return create_audit_log(
+        """
+        Record an action on ``obj`` through the configured audit writer.
+
+        Inside a transaction the returned entry may not be saved yet, see
+        ``AuditWriter``. Users may be passed by id, they are not fetched.
+        """
+        log = build_audit_log(
             obj=obj,
             action=action,
             user=user,
@@ -207,6 +319,8 @@ class AuditService:
             reason=reason,
             object_repr=object_repr,
         )
+        audit_writer.add(log)
+        return log
 
     @staticmethod
     def get_logs_for_object(obj: models.Model):
@@ -214,7 +328,9 @@ class AuditService:
 
     @staticmethod
     def get_recent_activity(limit: int = 15) -> list[RecentActivityEntrySchema]:
-        logs = AuditLog.objects.select_related("user").order_by("-created")[:limit]
+        logs = AuditLog.objects.select_related("user", "content_type").order_by(
+            "-created"
+        )[:limit]
         return [audit_log_to_recent_activity_entry(log) for log in logs]
 
     @staticmethod
@@ -247,28 +363,108 @@ class AuditService:
         return queryset.filter(conditions)
 
     @staticmethod
-    def get_timeline_for_object(
+    def get_timeline_page(
         obj: models.Model,
+        cursor: str | None = None,
+        page_size: int | None = TIMELINE_PAGE_SIZE,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
         include_related_movements: bool = True,
-    ) -> list[AuditTimelineEntrySchema]:
-        logs = [
-            audit_log_to_timeline_entry(log)
-            for log in AuditService.get_logs_for_object(obj)
-        ]
+    ) -> AuditTimelinePageSchema:
+        """
+        Audit logs of ``obj`` and its related movements, newest first.
+
+        Both sources are merged by a single ``UNION ALL`` query that only selects
+        the sort key, the page's rows are loaded afterwards. ``next`` is a cursor
+        for the following page, ``page_size=None`` returns the whole timeline.
+        """
+        position = _decode_timeline_cursor(cursor) if cursor else None
+        merged = _timeline_branch(
+            AuditLog.objects.for_object(obj),
+            "audit",
+            "created",
+            position,
+            from_date,
+            to_date,
+        )
+        if include_related_movements:
+            merged = merged.union(
+                _timeline_branch(
+                    AuditService._get_related_movements_queryset(obj),
+                    "movement",
+                    "moved_at",
+                    position,
+                    from_date,
+                    to_date,
+                ),
+                all=True,
+            )
+        merged = merged.order_by("-happened_at", "-source", "-entry_id")
 
-        if not include_related_movements:
-            return sorted(logs, key=lambda entry: entry.happened_at, reverse=True)
+        rows = [
+            _TimelinePosition(*row)
+            for row in (merged if page_size is None else merged[: page_size + 1])
+        ]
+        has_more = page_size is not None and len(rows) > page_size
+        rows = rows[:page_size]
 
-        movements = [
-            movement_to_timeline_entry(movement)
-            for movement in AuditService._get_related_movements_queryset(obj)
+        logs = AuditService.get_logs_for_object(obj).in_bulk(
+            [row.id for row in rows if row.source == "audit"]
+        )
+        movements = AuditService._get_related_movements_queryset(obj).in_bulk(
+            [row.id for row in rows if row.source == "movement"]
+        )
+        entries = [
+            audit_log_to_timeline_entry(logs[row.id])
+            if row.source == "audit"
+            else movement_to_timeline_entry(movements[row.id])
+            for row in rows
         ]
 
+        return AuditTimelinePageSchema(
+            entries=entries,
+            next=_encode_timeline_cursor(rows[-1]) if has_more else None,
+        )
+
+    @staticmethod
+    def search_archive(
+        obj: models.Model | None = None,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> list[AuditTimelineEntrySchema]:
+        """
+        Archived audit logs, of ``obj`` if given, newest first.
+
+        Reads the archive files of the months in the range, so narrow ranges
+        are considerably cheaper than searching the whole archive.
+        """
+        content_type = (
+            ContentType.objects.get_for_model(obj, for_concrete_model=False)
+            if obj is not None
+            else None
+        )
+        records = audit_archive_service.iter_records(
+            content_type=content_type,
+            object_id=obj.pk if obj is not None else None,
+            from_date=from_date,
+            to_date=to_date,
+        )
         return sorted(
-            logs + movements,
-            key=lambda entry: entry.happened_at,
+            (archived_audit_log_to_timeline_entry(record) for record in records),
+            key=lambda entry: (entry.happened_at, entry.id),
             reverse=True,
         )
 
+    @staticmethod
+    def get_timeline_for_object(
+        obj: models.Model,
+        include_related_movements: bool = True,
+    ) -> list[AuditTimelineEntrySchema]:
+        return AuditService.get_timeline_page(
+            obj,
+            page_size=None,
+            include_related_movements=include_related_movements,
+        ).entries
+
 
 audit_service = AuditService()
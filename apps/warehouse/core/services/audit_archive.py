@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from apps.warehouse.models.audit import AuditLog
+
+ARCHIVE_CHUNK_SIZE = 2000
+
+# One file per month and archiving run, e.g. ``audit-2025-01-1834.jsonl.gz``.
+_ARCHIVE_PATTERN = "audit-*.jsonl.gz"
+_MONTH_FORMAT = "%Y-%m"
+
+
+def _month_start(moment: datetime, months_back: int = 0) -> datetime:
+    """Start of the local month ``months_back`` months before the one of ``moment``."""
+    local = timezone.localtime(moment)
+    index = local.year * 12 + local.month - 1 - months_back
+    return local.replace(
+        year=index // 12,
+        month=index % 12 + 1,
+        day=1,
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+
+
+def _next_month(start: datetime) -> datetime:
+    return _month_start(start, months_back=-1)
+
+
+class AuditArchiveService:
+    """
+    Moves old audit log entries into compressed JSON lines files.
+
+    ``AuditLog`` is append-only, ``archive`` keeps its table bounded by writing all
+    entries of whole months older than the retention period to gzip files in
+    ``settings.AUDIT_ARCHIVE_DIR`` and deleting them afterwards. The records keep
+    the content type natural key and the username, so they stay readable when the
+    database is restored elsewhere. ``iter_records`` scans only the files of the
+    months in the requested range.
+    """
+
+    @staticmethod
+    def _archive_dir() -> Path:
+        return Path(settings.AUDIT_ARCHIVE_DIR)
+
+    @staticmethod
+    def _serialize(log: AuditLog) -> str:
+        return json.dumps(
+            {
+                "id": log.pk,
+                "created": log.created.isoformat(),
+                "user_id": log.user_id,
+                "username": log.user.username if log.user else None,
+                "action": log.action,
+                "content_type": list(log.content_type.natural_key()),
+                "object_id": log.object_id,
+                "object_repr": log.object_repr,
+                "changes": log.changes,
+                "reason": log.reason,
+            }
+        )
+
+    def _archive_month(self, start: datetime, end: datetime) -> int:
+        logs = AuditLog.objects.filter(created__gte=start, created__lt=end)
+        last_pk = logs.aggregate(last_pk=Max("pk"))["last_pk"]
+        if last_pk is None:
+            return 0
+        logs = logs.filter(pk__lte=last_pk)
+
+        directory = self._archive_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"audit-{start.strftime(_MONTH_FORMAT)}-{last_pk}.jsonl.gz"
+        partial = path.with_name(f".{path.name}.partial")
+        archived = 0
+        with gzip.open(partial, "wt", encoding="utf-8") as file:
+            for log in (
+                logs.select_related("content_type", "user")
+                .order_by("pk")
+                .iterator(chunk_size=ARCHIVE_CHUNK_SIZE)
+            ):
+                file.write(self._serialize(log) + "\n")
+                archived += 1
+        with open(partial, "rb") as file:
+            os.fsync(file.fileno())
+        partial.rename(path)
+
+        # Entries are only deleted once their archive file is complete. Should
+        # this fail, the next run archives them again and readers skip duplicates.
+        logs.delete()
+        return archived
+
+    def archive(self, months: int) -> dict[str, int]:
+        """
+        Archive entries created before the local month ``months`` months ago.
+
+        Returns the number of archived entries per month (``YYYY-MM``).
+        """
+        cutoff = _month_start(timezone.now(), months_back=months)
+        first = AuditLog.objects.filter(created__lt=cutoff).aggregate(
+            first=Min("created")
+        )["first"]
+        if first is None:
+            return {}
+
+        archived = {}
+        start = _month_start(first)
+        while start < cutoff:
+            end = _next_month(start)
+            count = self._archive_month(start, end)
+            if count:
+                archived[start.strftime(_MONTH_FORMAT)] = count
+            start = end
+        return archived
+
+    def iter_records(
+        self,
+        content_type: ContentType | None = None,
+        object_id: int | None = None,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> Iterator[dict]:
+        """Archived entries matching the filters, in no particular order."""
+        directory = self._archive_dir()
+        if not directory.is_dir():
+            return
+
+        content_type_key = list(content_type.natural_key()) if content_type else None
+        first_month = from_date and _month_start(from_date).strftime(_MONTH_FORMAT)
+        last_month = to_date and _month_start(to_date).strftime(_MONTH_FORMAT)
+        seen: set[int] = set()
+        for path in sorted(directory.glob(_ARCHIVE_PATTERN)):
+            month = path.name[len("audit-") :][: len("YYYY-MM")]
+            if (first_month and month < first_month) or (
+                last_month and month > last_month
+            ):
+                continue
+
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    record = json.loads(line)
+                    if record["id"] in seen:
+                        continue
+                    if content_type_key and record["content_type"] != content_type_key:
+                        continue
+                    if object_id is not None and record["object_id"] != object_id:
+                        continue
+                    created = datetime.fromisoformat(record["created"])
+                    if (from_date and created < from_date) or (
+                        to_date and created > to_date
+                    ):
+                        continue
+                    seen.add(record["id"])
+                    yield record
+
+
+audit_archive_service = AuditArchiveService()
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import threading
+import time
+import weakref
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from loguru import logger
+
+from apps.warehouse.models.audit import AuditLog
+
+AUDIT_WRITE_IMMEDIATE = "immediate"
+AUDIT_WRITE_BUFFERED = "buffered"
+AUDIT_WRITE_QUEUE = "queue"
+
+AUDIT_BATCH_SIZE = 500
+
+_QUEUE_SUFFIX = ".jsonl"
+_DRAINING_SUFFIX = ".draining"
+
+
+class _PendingAuditLogs(list[AuditLog]):
+    """Audit log entries of one transaction (or savepoint), written on commit."""
+
+    def __init__(self, writer: AuditWriter, mode: str) -> None:
+        super().__init__()
+        self.writer = writer
+        self.mode = mode
+
+    def __call__(self) -> None:
+        self.writer._write(self.mode, self)
+
+
+class AuditWriter:
+    """
+    Writes audit log entries according to ``settings.AUDIT_WRITE_MODE``.
+
+    ``immediate`` inserts every entry as soon as it is added. ``buffered`` collects
+    the entries added inside a transaction and inserts them with a single
+    ``bulk_create`` once the transaction commits, which keeps the inserts out of
+    the write lock of the audited changes. Entries of a rolled back transaction or
+    savepoint are dropped together with their ``on_commit`` callback. ``queue``
+    buffers the same way but appends the committed entries to a local file in
+    ``settings.AUDIT_QUEUE_DIR`` instead, ``drain_queue`` loads them later.
+    A failed buffered insert falls back to the queue, so entries aren't lost.
+    """
+
+    def __init__(self) -> None:
+        # Open buffers of this thread's connections. Only the ``on_commit`` list
+        # holds a buffer, so it disappears from here when its transaction or
+        # savepoint is rolled back, or once it has been written.
+        self._local = threading.local()
+
+    def add(self, log: AuditLog) -> None:
+        mode = settings.AUDIT_WRITE_MODE
+        connection = transaction.get_connection()
+        if mode == AUDIT_WRITE_IMMEDIATE:
+            log.save()
+            return
+        # Dated when added, the insert itself may happen a while later.
+        log.created = timezone.now()
+        if not connection.in_atomic_block:
+            self._write(mode, [log])
+            return
+
+        self._pending(connection, mode).append(log)
+
+    def _pending(self, connection, mode: str) -> _PendingAuditLogs:
+        buffers: weakref.WeakValueDictionary[tuple, _PendingAuditLogs] | None
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = weakref.WeakValueDictionary()
+
+        # One callback per savepoint, so a savepoint rollback drops exactly its own
+        # entries.
+        key = (connection.alias, mode, tuple(connection.savepoint_ids))
+        pending = buffers.get(key)
+        if pending is None:
+            pending = buffers[key] = _PendingAuditLogs(self, mode)
+            transaction.on_commit(pending, robust=True)
+        return pending
+
+    def _write(self, mode: str, logs: list[AuditLog]) -> None:
+        if not logs:
+            return
+        if mode == AUDIT_WRITE_QUEUE:
+            self._append_to_queue(logs)
+            return
+
+        try:
+            AuditLog.objects.bulk_create(logs, batch_size=AUDIT_BATCH_SIZE)
+        except DatabaseError:
+            logger.exception("Failed to write {} audit log entries, queued.", len(logs))
+            self._append_to_queue(logs)
+
+    # ---------------------------------------------------------------------
+    # Local queue
+    # ---------------------------------------------------------------------
+
+    @staticmethod
+    def _queue_dir() -> Path:
+        return Path(settings.AUDIT_QUEUE_DIR)
+
+    @staticmethod
+    def _serialize(log: AuditLog) -> str:
+        return json.dumps(
+            {
+                "user_id": log.user_id,
+                "action": log.action,
+                "content_type_id": log.content_type_id,
+                "object_id": log.object_id,
+                "object_repr": log.object_repr,
+                "changes": log.changes,
+                "reason": log.reason,
+                # Kept so that drained entries are dated by the audited change.
+                "created": log.created.isoformat(),
+            }
+        )
+
+    @staticmethod
+    def _is_current(file, path: Path) -> bool:
+        """Whether the locked ``file`` is still the one stored at ``path``."""
+        try:
+            return os.stat(path).st_ino == os.fstat(file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def _append_to_queue(self, logs: list[AuditLog]) -> None:
+        directory = self._queue_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{os.getpid()}{_QUEUE_SUFFIX}"
+        lines = "".join(self._serialize(log) + "\n" for log in logs)
+
+        while True:
+            with open(path, "a", encoding="utf-8") as file:
+                fcntl.flock(file, fcntl.LOCK_EX)
+                # A drain may have taken the file between opening and locking it.
+                if not self._is_current(file, path):
+                    continue
+                file.write(lines)
+                file.flush()
+                os.fsync(file.fileno())
+                return
+
+    def _load(self, lines: list[str]) -> int:
+        logs: list[AuditLog] = []
+        created: list[datetime] = []
+        for line in lines:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            # Raises on malformed timestamps rather than writing NULL.
+            created.append(datetime.fromisoformat(data.pop("created")))
+            logs.append(AuditLog(**data))
+
+        with transaction.atomic():
+            AuditLog.objects.bulk_create(logs, batch_size=AUDIT_BATCH_SIZE)
+            # ``bulk_create`` stamps ``auto_now_add`` fields with the current time.
+            for log, timestamp in zip(logs, created):
+                log.created = log.changed = timestamp
+            AuditLog.objects.bulk_update(
+                logs, ["created", "changed"], batch_size=AUDIT_BATCH_SIZE
+            )
+        return len(logs)
+
+    def drain_queue(self) -> int:
+        """Insert all queued entries into the database, returns their number."""
+        directory = self._queue_dir()
+        if not directory.is_dir():
+            return 0
+
+        drained = 0
+        paths = sorted(directory.glob(f"*{_DRAINING_SUFFIX}")) + sorted(
+            directory.glob(f"*{_QUEUE_SUFFIX}")
+        )
+        for path in paths:
+            try:
+                file = open(path, encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with file:
+                # Waits for writers appending to the file and for other drains.
+                fcntl.flock(file, fcntl.LOCK_EX)
+                if not self._is_current(file, path):
+                    continue
+                if path.suffix == _QUEUE_SUFFIX:
+                    # New entries go to a fresh file from now on.
+                    path = path.rename(
+                        path.with_name(
+                            f"{path.stem}-{time.time_ns()}{_DRAINING_SUFFIX}"
+                        )
+                    )
+                drained += self._load(file.readlines())
+                path.unlink()
+        return drained
+
+
+audit_writer = AuditWriter()
@@ -1,22 +1,37 @@
 from __future__ import annotations
 
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 
 from apps.warehouse.core import zebra_printer
 from apps.warehouse.core.exceptions import ApiBaseException, NotFoundException
-from apps.warehouse.core.schemas.printer import PrintBarcodeResultSchema
-from apps.warehouse.models.printer import Printer, UserAppSettings
+from apps.warehouse.core.schemas.printer import (
+    LabelSchema,
+    PrintBarcodeResultSchema,
+    PrintLabelsResultSchema,
+)
+from apps.warehouse.core.services.label_templates import label_templates_service
+from apps.warehouse.core.services.print_spooler import print_spooler_service
+from apps.warehouse.models.barcode import Barcode
+from apps.warehouse.models.printer import Printer, PrintJob, UserAppSettings
+from apps.warehouse.models.warehouse import (
+    InboundWarehouseOrder,
+    TrackingLevel,
+    WarehouseItem,
+)
 
 
 def _resolve_printer(user: User, printer_code: str | None) -> Printer:
     if printer_code:
         try:
-            return Printer.objects.get(code=printer_code)
+            return Printer.objects.select_related("label_template").get(
+                code=printer_code
+            )
         except Printer.DoesNotExist:
             raise NotFoundException(f"Printer '{printer_code}' not found")
 
     settings_obj = (
-        UserAppSettings.objects.select_related("default_printer")
+        UserAppSettings.objects.select_related("default_printer__label_template")
         .filter(user=user)
         .first()
     )
@@ -28,6 +43,32 @@ def _resolve_printer(user: User, printer_code: str | None) -> Printer:
     return settings_obj.default_printer
 
 
+def _enqueue_labels(
+    user: User,
+    labels: list[zebra_printer.Label],
+    printer_code: str | None,
+    template_code: str | None = None,
+) -> PrintJob:
+    printer = _resolve_printer(user, printer_code)
+    template = label_templates_service.resolve(printer, template_code)
+
+    if not printer.ip:
+        raise ApiBaseException(
+            f"Printer '{printer.code}' has no IP address configured",
+            http_status=400,
+        )
+
+    try:
+        zpl = zebra_printer.render_labels(labels, template)
+    except ValueError as exc:
+        raise ApiBaseException(str(exc), http_status=400)
+
+    # One job is one write to the printer, sent by the print spooler worker.
+    return print_spooler_service.enqueue(
+        printer, zpl, label_count=sum(label.copies for label in labels), user=user
+    )
+
+
 class BarcodePrinterService:
     @staticmethod
     def print_barcode(
@@ -36,32 +77,98 @@ class BarcodePrinterService:
         text: str = "",
         printer_code: str | None = None,
         copies: int = 1,
+        template_code: str | None = None,
     ) -> PrintBarcodeResultSchema:
         if copies < 1:
             raise ApiBaseException("Copies must be at least 1", http_status=400)
 
-        printer = _resolve_printer(user, printer_code)
+        job = _enqueue_labels(
+            user,
+            [zebra_printer.Label(barcode, text, copies)],
+            printer_code,
+            template_code,
+        )
+        return PrintBarcodeResultSchema(
+            printer_code=job.printer.code, copies=copies, job_id=job.pk
+        )
+
+    @staticmethod
+    def print_labels(
+        user: User,
+        labels: list[LabelSchema],
+        printer_code: str | None = None,
+        template_code: str | None = None,
+    ) -> PrintLabelsResultSchema:
+        if not labels:
+            raise ApiBaseException("No labels to print", http_status=400)
+
+        job = _enqueue_labels(
+            user,
+            [
+                zebra_printer.Label(
+                    label.barcode, label.text, label.copies, label.fields
+                )
+                for label in labels
+            ],
+            printer_code,
+            template_code,
+        )
+        return PrintLabelsResultSchema(
+            printer_code=job.printer.code, label_count=job.label_count, job_id=job.pk
+        )
+
+    @classmethod
+    def print_warehouse_order_labels(
+        cls,
+        user: User,
+        warehouse_order_code: str,
+        printer_code: str | None = None,
+        copies: int = 1,
+        template_code: str | None = None,
+    ) -> PrintLabelsResultSchema:
+        """
+        Print the labels of all serialized items received by a warehouse order.
 
-        if not printer.ip:
-            raise ApiBaseException(
-                f"Printer '{printer.code}' has no IP address configured",
-                http_status=400,
+        Besides the barcode and the product name (``text``), templates can use the
+        ``product_code`` and ``warehouse_order_code`` slots.
+        """
+        if not InboundWarehouseOrder.objects.filter(code=warehouse_order_code).exists():
+            raise NotFoundException(
+                f"Warehouse order '{warehouse_order_code}' not found"
             )
 
-        try:
-            zebra_printer.print_barcode(
-                barcode=barcode,
-                text=text,
-                ip=printer.ip,
-                port=printer.port,
+        items = list(
+            WarehouseItem.objects.filter(
+                order_in__code=warehouse_order_code,
+                tracking_level__in=(
+                    TrackingLevel.SERIALIZED_PIECE,
+                    TrackingLevel.SERIALIZED_PACKAGE,
+                ),
+            )
+            .select_related("stock_product")
+            .order_by("pk")
+        )
+        barcodes = dict(
+            Barcode.objects.filter(
+                content_type=ContentType.objects.get_for_model(WarehouseItem),
+                object_id__in=[item.pk for item in items],
+                is_primary=True,
+            ).values_list("object_id", "code")
+        )
+        labels = [
+            LabelSchema(
+                barcode=barcodes[item.pk],
+                text=item.stock_product.name,
                 copies=copies,
+                fields={
+                    "product_code": item.stock_product.code,
+                    "warehouse_order_code": warehouse_order_code,
+                },
             )
-        except ValueError as exc:
-            raise ApiBaseException(str(exc), http_status=400)
-        except (ConnectionError, TimeoutError) as exc:
-            raise ApiBaseException(str(exc), http_status=502)
-
-        return PrintBarcodeResultSchema(printer_code=printer.code, copies=copies)
+            for item in items
+            if item.pk in barcodes
+        ]
+        return cls.print_labels(user, labels, printer_code, template_code)
 
 
 barcode_printer_service = BarcodePrinterService()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models.signals import post_delete, post_init, post_save
+
+from apps.warehouse.models.barcode import Barcode
+
+BARCODE_CACHE_SIZE = 4096
+# Bounds staleness of entries changed by other worker processes.
+BARCODE_CACHE_TTL_SECONDS = 300
+
+_ORIGINAL_CODE_ATTR = "_barcode_resolution_code"
+
+ResolvedBarcode = tuple[type[models.Model], int]
+
+
+class BarcodeResolutionCache:
+    """
+    In-process LRU cache mapping a barcode to the model and pk it is attached to.
+
+    Barcode saves and deletes in this process drop the affected codes right away,
+    entries changed elsewhere expire after ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_size: int = BARCODE_CACHE_SIZE,
+        ttl: float = BARCODE_CACHE_TTL_SECONDS,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, ResolvedBarcode]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, code: str) -> ResolvedBarcode | None:
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None:
+                return None
+            expires_at, resolved = entry
+            if expires_at < time.monotonic():
+                del self._entries[code]
+                return None
+            self._entries.move_to_end(code)
+            return resolved
+
+    def _put(self, code: str, resolved: ResolvedBarcode) -> None:
+        with self._lock:
+            self._entries[code] = (time.monotonic() + self.ttl, resolved)
+            self._entries.move_to_end(code)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def resolve(self, code: str) -> ResolvedBarcode | None:
+        """Return the (model, pk) the barcode points to, ``None`` for unknown codes."""
+        resolved = self._get(code)
+        if resolved is not None:
+            return resolved
+
+        row = (
+            Barcode.objects.filter(code=code)
+            .values_list("content_type_id", "object_id")
+            .first()
+        )
+        if row is None:
+            return None
+        content_type_id, object_id = row
+        # Content types are cached by Django, this doesn't hit the database again.
+        model_class = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model_class is None:
+            return None
+
+        resolved = (model_class, object_id)
+        self._put(code, resolved)
+        return resolved
+
+    def resolve_many(self, codes: Iterable[str]) -> dict[str, ResolvedBarcode]:
+        """Resolve many barcodes at once, all uncached ones are looked up in one query."""
+        result: dict[str, ResolvedBarcode] = {}
+        missing = set()
+        for code in codes:
+            resolved = self._get(code)
+            if resolved is None:
+                missing.add(code)
+            else:
+                result[code] = resolved
+        if not missing:
+            return result
+
+        rows = Barcode.objects.filter(code__in=missing).values_list(
+            "code", "content_type_id", "object_id"
+        )
+        for code, content_type_id, object_id in rows:
+            model_class = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model_class is None:
+                continue
+            result[code] = (model_class, object_id)
+            self._put(code, result[code])
+        return result
+
+    def invalidate(self, *codes: str | None) -> None:
+        with self._lock:
+            for code in codes:
+                self._entries.pop(code, None)  # type: ignore[arg-type]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # ---------------------------------------------------------------------
+    # Signal handlers
+    # ---------------------------------------------------------------------
+
+    @staticmethod
+    def _on_post_init(sender, instance: Barcode, **kwargs) -> None:
+        setattr(instance, _ORIGINAL_CODE_ATTR, instance.__dict__.get("code"))
+
+    def _on_post_save(self, sender, instance: Barcode, **kwargs) -> None:
+        self.invalidate(instance.code, getattr(instance, _ORIGINAL_CODE_ATTR, None))
+        setattr(instance, _ORIGINAL_CODE_ATTR, instance.code)
+
+    def _on_post_delete(self, sender, instance: Barcode, **kwargs) -> None:
+        self.invalidate(instance.code, getattr(instance, _ORIGINAL_CODE_ATTR, None))
+
+    def connect_signals(self) -> None:
+        uid = "warehouse.barcode_resolution"
+        post_init.connect(self._on_post_init, sender=Barcode, dispatch_uid=uid)
+        post_save.connect(self._on_post_save, sender=Barcode, dispatch_uid=uid)
+        post_delete.connect(self._on_post_delete, sender=Barcode, dispatch_uid=uid)
+
+
+barcode_resolution_cache = BarcodeResolutionCache()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import time
+from functools import cached_property
+from hashlib import sha256
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+COUNT_CACHE_TIMEOUT = 300
+
+_VERSION_KEY = "warehouse:count-version:{table}"
+_COUNT_KEY = "warehouse:count:{digest}"
+
+# Models listed by the paginators with ``cache_count``, and the models their
+# filters join. Only counts reading nothing but these tables are cached.
+COUNTED_MODELS = (
+    "warehouse.StockProduct",
+    "warehouse.ProductType",
+    "warehouse.ProductGroup",
+    "warehouse.Customer",
+    "warehouse.CustomerGroup",
+    "warehouse.WarehouseLocation",
+    "warehouse.UnitOfMeasure",
+    "warehouse.InvoicePaymentMethod",
+)
+
+
+class CountCacheService:
+    """
+    Caches ``COUNT(*)`` of list querysets.
+
+    Entries are keyed by the normalized SQL of the count query together with the
+    write version of every table it reads, so any save or delete on one of those
+    tables makes the cached count unreachable. Writes are only tracked for
+    ``COUNTED_MODELS``, counts reading other tables are always taken afresh.
+    """
+
+    @cached_property
+    def _quoted_tables(self) -> dict[str, str]:
+        return {
+            model._meta.db_table: connection.ops.quote_name(model._meta.db_table)
+            for model in apps.get_models(include_auto_created=True)
+        }
+
+    @cached_property
+    def _counted_models(self) -> list[type[models.Model]]:
+        counted = [apps.get_model(label) for label in COUNTED_MODELS]
+        through = [
+            field.remote_field.through
+            for model in counted
+            for field in model._meta.many_to_many
+        ]
+        return [*counted, *through]
+
+    @cached_property
+    def _counted_tables(self) -> frozenset[str]:
+        return frozenset(model._meta.db_table for model in self._counted_models)
+
+    def _tables_in(self, sql: str) -> list[str]:
+        return sorted(
+            table for table, quoted in self._quoted_tables.items() if quoted in sql
+        )
+
+    def count(self, queryset: models.QuerySet) -> int:
+        # Joins for select_related don't change the count, only filters count.
+        queryset = queryset.order_by().select_related(None)
+        sql, params = queryset.query.sql_with_params()
+
+        tables = self._tables_in(sql)
+        if not self._counted_tables.issuperset(tables):
+            return queryset.count()
+
+        version_keys = [_VERSION_KEY.format(table=table) for table in tables]
+        versions = cache.get_many(version_keys)
+        for key in version_keys:
+            if key not in versions:
+                # A version evicted from the cache must not match older counts.
+                versions[key] = cache.get_or_set(key, time.time_ns, None)
+        token = ",".join(f"{key}={versions[key]}" for key in version_keys)
+        digest = sha256(f"{sql}|{params!r}|{token}".encode()).hexdigest()
+        key = _COUNT_KEY.format(digest=digest)
+
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, COUNT_CACHE_TIMEOUT)
+        return count
+
+    @staticmethod
+    def invalidate(model: type[models.Model]) -> None:
+        cache.set(_VERSION_KEY.format(table=model._meta.db_table), time.time_ns(), None)
+
+    def _on_write(self, sender, **kwargs) -> None:
+        self.invalidate(sender)
+        # Counts taken by other requests before this transaction commits are stale too.
+        transaction.on_commit(lambda: self.invalidate(sender))
+
+    def connect_signals(self) -> None:
+        for model in self._counted_models:
+            for signal in (post_save, post_delete, m2m_changed):
+                signal.connect(
+                    self._on_write,
+                    sender=model,
+                    dispatch_uid=f"warehouse.count_cache.{model._meta.label_lower}",
+                )
+
+
+count_cache_service = CountCacheService()
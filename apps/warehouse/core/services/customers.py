@@ -10,6 +10,7 @@ from apps.warehouse.core.schemas.customer import (
     ContactPersonCreateOrUpdateSchema,
 )
 from apps.warehouse.core.services.audit import audit_service
+from apps.warehouse.core.services.lookup_cache import lookup_cache_service
 from apps.warehouse.core.audit_messages import AuditMessages
 from apps.warehouse.models.audit import AuditAction
 from apps.warehouse.core.transformation import customer_orm_to_schema
@@ -90,7 +91,7 @@ class CustomerService:
         if not code:
             return None
         try:
-            return PriceGroup.objects.get(code=code)
+            return lookup_cache_service.get(PriceGroup, code)
         except PriceGroup.DoesNotExist:
             raise WarehouseGenericError(
                 f"Discount group (price group) with code '{code}' not found"
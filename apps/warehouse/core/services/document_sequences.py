@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.warehouse.models.sequence import DocumentSequence
+
+# Number of the last document issued in a period before its sequence row existed,
+# called with the code prefix of the period (e.g. ``PV202501``) and its start.
+Seed = Callable[[str, datetime], int]
+
+
+def _month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def last_code_seed(queryset: models.QuerySet, field_name: str = "code") -> Seed:
+    """Seed from the highest code of the period stored in ``field_name``."""
+
+    def seed(monthly_prefix: str, start: datetime) -> int:
+        last_code = (
+            queryset.filter(
+                created__gte=start, **{f"{field_name}__startswith": monthly_prefix}
+            )
+            .order_by(f"-{field_name}")
+            .values_list(field_name, flat=True)
+            .first()
+        )
+        return int(str(last_code)[len(monthly_prefix) :]) if last_code else 0
+
+    return seed
+
+
+def count_seed(queryset: models.QuerySet) -> Seed:
+    """Seed from the number of documents created in the period."""
+    return lambda monthly_prefix, start: queryset.filter(created__gte=start).count()
+
+
+class DocumentSequencesService:
+    """
+    Monthly numbered document codes, e.g. ``PV2025010042``.
+
+    Every sequence keeps its last number per month in a ``DocumentSequence`` row.
+    Numbers are taken with a single ``UPDATE ... SET last_number = last_number + n``,
+    which locks the row until the surrounding transaction ends: concurrent
+    creates get distinct numbers, and a rolled back create gives its number back.
+    The row of a new month starts from ``seed``, which runs the old scan over the
+    documents once, so numbering continues where existing documents left off.
+    """
+
+    def allocate(
+        self, name: str, prefix: str, count: int = 1, seed: Seed | None = None
+    ) -> list[str]:
+        """Reserve ``count`` consecutive codes of the current month."""
+        if count < 1:
+            raise ValueError("Count must be at least 1")
+
+        now = timezone.now()
+        period = f"{now.year}{now.month:02d}"
+        monthly_prefix = f"{prefix}{period}"
+        sequences = DocumentSequence.objects.filter(name=name, period=period)
+        with transaction.atomic():
+            if not sequences.update(last_number=F("last_number") + count, changed=now):
+                # A concurrent first allocation makes this a plain get.
+                DocumentSequence.objects.get_or_create(
+                    name=name,
+                    period=period,
+                    defaults={
+                        "last_number": seed(monthly_prefix, _month_start(now))
+                        if seed
+                        else 0
+                    },
+                )
+                sequences.update(last_number=F("last_number") + count, changed=now)
+            last_number = sequences.values_list("last_number", flat=True).get()
+
+        return [
+            f"{monthly_prefix}{number:04d}"
+            for number in range(last_number - count + 1, last_number + 1)
+        ]
+
+    def next_code(self, name: str, prefix: str, seed: Seed | None = None) -> str:
+        return self.allocate(name, prefix, seed=seed)[0]
+
+
+document_sequences_service = DocumentSequencesService()
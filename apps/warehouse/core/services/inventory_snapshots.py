@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
 
 from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, QuerySet
 from django.utils import timezone
 
 from apps.warehouse.core.exceptions import WarehouseGenericError
@@ -20,9 +23,55 @@ from apps.warehouse.models.warehouse import (
     InventorySnapshotLine,
     InventorySnapshotTriggerSource,
     WarehouseItem,
+    WarehouseMovement,
 )
 
 PRICE_SCALE = Decimal("0.0001")
+SNAPSHOT_CHUNK_SIZE = 2000
+
+# Called with the number of lines written so far and the total number of items.
+SnapshotProgressCallback = Callable[[int, int], None]
+
+# A delta is stored in full instead when it would change more than this share of
+# its base, or when its base already has this many deltas.
+DELTA_COMPACTION_RATIO = Decimal("0.5")
+DELTA_MAX_PER_BASE = 30
+
+LINE_ORDERING = ("product_code", "location_code", "warehouse_item_id_at_snapshot")
+
+
+@dataclass
+class _SnapshotTotals:
+    purchase: defaultdict[str, Decimal] = field(
+        default_factory=lambda: defaultdict(Decimal)
+    )
+    receipt: defaultdict[str, Decimal] = field(
+        default_factory=lambda: defaultdict(Decimal)
+    )
+    receipt_unpriced_line_count: int = 0
+    line_count: int = 0
+
+    @classmethod
+    def of(cls, snapshot: InventorySnapshot) -> _SnapshotTotals:
+        totals = cls(
+            receipt_unpriced_line_count=snapshot.receipt_unpriced_line_count,
+            line_count=snapshot.line_count,
+        )
+        for currency, value in snapshot.purchase_totals_by_currency.items():
+            totals.purchase[currency] = Decimal(value)
+        for currency, value in snapshot.receipt_totals_by_currency.items():
+            totals.receipt[currency] = Decimal(value)
+        return totals
+
+    def add(self, line: InventorySnapshotLine, sign: int = 1) -> None:
+        self.line_count += sign
+        self.purchase[line.purchase_currency] += sign * line.purchase_line_value
+        if line.receipt_price_available:
+            assert line.receipt_currency is not None
+            assert line.receipt_line_value is not None
+            self.receipt[line.receipt_currency] += sign * line.receipt_line_value
+        else:
+            self.receipt_unpriced_line_count += sign
 
 
 class InventorySnapshotService:
@@ -75,6 +124,7 @@ class InventorySnapshotService:
             trigger_source=snapshot.trigger_source,
             cadence=snapshot.cadence,
             bucket_key=snapshot.bucket_key,
+            base_snapshot_id=snapshot.base_snapshot_id,
             line_count=snapshot.line_count,
             purchase_totals=cls._deserialize_totals(
                 snapshot.purchase_totals_by_currency
@@ -88,8 +138,9 @@ class InventorySnapshotService:
     def _to_detail_schema(
         cls,
         snapshot: InventorySnapshot,
+        lines: Iterable[InventorySnapshotLine],
     ) -> InventorySnapshotDetailSchema:
-        lines = [
+        line_schemas = [
             InventorySnapshotLineSchema(
                 id=line.pk,
                 warehouse_item_id=line.warehouse_item_id,
@@ -109,40 +160,111 @@ class InventorySnapshotService:
                 receipt_price_available=line.receipt_price_available,
                 receipt_price_fallback_reason=line.receipt_price_fallback_reason,
             )
-            for line in snapshot.lines.all()
+            for line in lines
         ]
 
         summary = cls._to_summary_schema(snapshot)
-        return InventorySnapshotDetailSchema(**summary.model_dump(), lines=lines)
+        return InventorySnapshotDetailSchema(**summary.model_dump(), lines=line_schemas)
+
+    @staticmethod
+    def _lines_queryset(snapshot: InventorySnapshot) -> QuerySet[InventorySnapshotLine]:
+        """Full view of the snapshot, deltas are overlaid over their base lines."""
+        if snapshot.base_snapshot_id is None:
+            return snapshot.lines.order_by(*LINE_ORDERING)
+
+        superseded = snapshot.lines.values("warehouse_item_id_at_snapshot")
+        return InventorySnapshotLine.objects.filter(
+            Q(snapshot_id=snapshot.base_snapshot_id)
+            & ~Q(warehouse_item_id_at_snapshot__in=superseded)
+            | Q(snapshot=snapshot, is_removal=False)
+        ).order_by(*LINE_ORDERING)
 
     @staticmethod
     def list_snapshots_queryset():
-        return InventorySnapshot.objects.all()
+        return InventorySnapshot.objects.filter(is_complete=True)
 
     @classmethod
     def get_snapshot(cls, snapshot_id: int) -> InventorySnapshotDetailSchema:
-        snapshot = InventorySnapshot.objects.prefetch_related("lines").get(
-            pk=snapshot_id
-        )
-        return cls._to_detail_schema(snapshot)
+        snapshot = InventorySnapshot.objects.get(pk=snapshot_id)
+        return cls._to_detail_schema(snapshot, cls._lines_queryset(snapshot))
 
     @classmethod
     def get_latest_snapshot_value(cls) -> LatestInventoryValueSchema:
-        snapshot = InventorySnapshot.objects.first()
+        snapshot = InventorySnapshot.objects.filter(is_complete=True).first()
         if snapshot is None:
             return LatestInventoryValueSchema(snapshot=None)
         return LatestInventoryValueSchema(snapshot=cls._to_summary_schema(snapshot))
 
     @classmethod
-    def create_snapshot(
+    def _build_line(
+        cls, snapshot: InventorySnapshot, item: WarehouseItem
+    ) -> InventorySnapshotLine:
+        # ``_physical_items`` leaves out items without a location.
+        assert item.location is not None
+        purchase_unit_price = cls._quantize(item.stock_product.purchase_price)
+
+        receipt_currency: str | None = None
+        receipt_unit_price: Decimal | None = None
+        receipt_line_value: Decimal | None = None
+        receipt_price_available = False
+        receipt_price_fallback_reason: str | None = None
+
+        source_item = item.source_order_item
+        if source_item is None:
+            receipt_price_fallback_reason = "missing_source_order_item"
+        elif source_item.warehouse_order.order is None:
+            # Received without an inbound order, e.g. from manufacturing.
+            receipt_price_fallback_reason = "missing_source_order"
+        else:
+            receipt_currency = source_item.warehouse_order.order.currency
+            receipt_unit_price = cls._quantize(source_item.unit_price_at_receipt)
+            receipt_line_value = cls._quantize(item.amount * receipt_unit_price)
+            receipt_price_available = True
+
+        return InventorySnapshotLine(
+            snapshot=snapshot,
+            warehouse_item=item,
+            warehouse_item_id_at_snapshot=item.pk,
+            stock_product=item.stock_product,
+            product_code=item.stock_product.code,
+            product_name=item.stock_product.name,
+            location=item.location,
+            location_code=item.location.code,
+            source_order_item=item.source_order_item,
+            quantity=item.amount,
+            unit_of_measure=item.stock_product.unit_of_measure.name,
+            tracking_level=item.tracking_level,
+            purchase_currency=item.stock_product.currency,
+            purchase_unit_price=purchase_unit_price,
+            purchase_line_value=cls._quantize(item.amount * purchase_unit_price),
+            receipt_currency=receipt_currency,
+            receipt_unit_price=receipt_unit_price,
+            receipt_line_value=receipt_line_value,
+            receipt_price_available=receipt_price_available,
+            receipt_price_fallback_reason=receipt_price_fallback_reason,
+        )
+
+    @staticmethod
+    def _delta_base() -> InventorySnapshot | None:
+        """Latest full snapshot that can still take another delta."""
+        base = InventorySnapshot.objects.filter(
+            is_complete=True, base_snapshot__isnull=True
+        ).first()
+        if base is None or base.deltas.count() >= DELTA_MAX_PER_BASE:
+            return None
+        return base
+
+    @classmethod
+    def _start_snapshot(
         cls,
         *,
-        trigger_source: str = InventorySnapshotTriggerSource.MANUAL,
-        cadence: str | None = None,
-        bucket_key: str | None = None,
-        force: bool = False,
-        captured_at: datetime | None = None,
-    ) -> InventorySnapshotDetailSchema:
+        trigger_source: str,
+        cadence: str | None,
+        bucket_key: str | None,
+        force: bool,
+        captured_at: datetime | None,
+        delta: bool,
+    ) -> InventorySnapshot:
         captured_at = captured_at or timezone.now()
         derived_bucket_key = bucket_key or cls._resolve_bucket_key(cadence, captured_at)
 
@@ -167,100 +289,263 @@ class InventorySnapshotService:
                         f"Snapshot already exists for cadence '{cadence}' and bucket '{derived_bucket_key}'."
                     )
 
-        items = list(
-            WarehouseItem.physical_stock.select_related(
+        return InventorySnapshot.objects.create(
+            captured_at=captured_at,
+            trigger_source=trigger_source,
+            cadence=cadence,
+            bucket_key=derived_bucket_key,
+            base_snapshot=cls._delta_base() if delta else None,
+            is_complete=False,
+        )
+
+    @staticmethod
+    def _physical_items() -> QuerySet[WarehouseItem]:
+        """Physical items that can be put on a snapshot line, i.e. have a location."""
+        return (
+            WarehouseItem.physical_stock.filter(location__isnull=False)
+            .select_related(
                 "stock_product",
                 "stock_product__unit_of_measure",
                 "location",
                 "source_order_item",
                 "source_order_item__warehouse_order",
                 "source_order_item__warehouse_order__order",
-            ).order_by("stock_product__code", "location__code", "pk")
+            )
+            .order_by("stock_product__code", "location__code", "pk")
+        )
+
+    @classmethod
+    def _changed_items(cls, base: InventorySnapshot) -> QuerySet[WarehouseItem]:
+        """
+        Physical items whose snapshot line may differ from the one in ``base``.
+
+        Covers items missing from the base, items moved or edited since, and items
+        whose product, location or receipt (the frozen line values come from
+        those) changed since. ``base.created`` precedes reading its items, so
+        anything changed during that read is picked up again.
+        """
+        since = base.created
+        return cls._physical_items().filter(
+            ~Q(pk__in=base.lines.values("warehouse_item_id_at_snapshot"))
+            | Q(changed__gt=since)
+            | Q(stock_product__changed__gt=since)
+            | Q(stock_product__unit_of_measure__changed__gt=since)
+            | Q(location__changed__gt=since)
+            | Q(source_order_item__changed__gt=since)
+            | Q(source_order_item__warehouse_order__order__changed__gt=since)
+            | Exists(
+                WarehouseMovement.objects.filter(
+                    item=OuterRef("pk"), moved_at__gt=since
+                )
+            )
         )
 
-        purchase_totals: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-        receipt_totals: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-        receipt_unpriced_line_count = 0
+    @classmethod
+    def _removed_lines(cls, base: InventorySnapshot) -> QuerySet[InventorySnapshotLine]:
+        """Lines of ``base`` whose item is no longer in physical stock."""
+        return base.lines.exclude(
+            warehouse_item_id_at_snapshot__in=cls._physical_items().values("pk")
+        )
 
+    @classmethod
+    def _capture_lines(
+        cls,
+        snapshot: InventorySnapshot,
+        *,
+        chunk_size: int,
+        atomic_batches: bool,
+        on_progress: SnapshotProgressCallback | None = None,
+    ) -> None:
+        """
+        Stream physical stock into ``snapshot`` lines, ``chunk_size`` items at a time.
+
+        Only one batch of items and lines is held in memory. Totals are accumulated
+        as the batches are written. With ``atomic_batches`` every batch is committed
+        on its own, so long snapshots don't hold the database write lock throughout.
+
+        Delta snapshots only store lines of changed items plus removal markers for
+        items gone since the base. Their totals are the base totals adjusted by the
+        difference, so they describe the full stock just like full snapshots do.
+        """
+        base = snapshot.base_snapshot
+        if base is not None:
+            items = cls._changed_items(base)
+            removed = cls._removed_lines(base)
+            change_count = items.count() + removed.count()
+            if change_count > base.line_count * DELTA_COMPACTION_RATIO:
+                base = snapshot.base_snapshot = None
+        if base is None:
+            items = cls._physical_items()
+            totals = _SnapshotTotals()
+        else:
+            totals = _SnapshotTotals.of(base)
+        total = items.count() if on_progress else 0
+        written = 0
+
+        def flush(batch: list[InventorySnapshotLine]) -> None:
+            nonlocal written
+            if atomic_batches:
+                with transaction.atomic():
+                    InventorySnapshotLine.objects.bulk_create(batch)
+            else:
+                InventorySnapshotLine.objects.bulk_create(batch)
+            written += sum(not line.is_removal for line in batch)
+            if on_progress:
+                on_progress(written, total)
+
+        batch: list[InventorySnapshotLine] = []
+        for item in items.iterator(chunk_size=chunk_size):
+            line = cls._build_line(snapshot, item)
+            totals.add(line)
+            batch.append(line)
+            if len(batch) >= chunk_size:
+                flush(batch)
+                batch = []
+
+        if base is not None:
+            for line in removed.iterator(chunk_size=chunk_size):
+                line.pk = None
+                line.snapshot = snapshot
+                line.is_removal = True
+                batch.append(line)
+                if len(batch) >= chunk_size:
+                    flush(batch)
+                    batch = []
+        if batch:
+            flush(batch)
+
+        if base is not None:
+            superseded = base.lines.filter(
+                warehouse_item_id_at_snapshot__in=snapshot.lines.values(
+                    "warehouse_item_id_at_snapshot"
+                )
+            )
+            for line in superseded.iterator(chunk_size=chunk_size):
+                totals.add(line, sign=-1)
+
+        snapshot.line_count = totals.line_count
+        snapshot.purchase_totals_by_currency = cls._serialize_totals(totals.purchase)
+        snapshot.receipt_totals_by_currency = cls._serialize_totals(totals.receipt)
+        snapshot.receipt_unpriced_line_count = totals.receipt_unpriced_line_count
+        snapshot.is_complete = True
+        snapshot.save(
+            update_fields=[
+                "base_snapshot",
+                "line_count",
+                "purchase_totals_by_currency",
+                "receipt_totals_by_currency",
+                "receipt_unpriced_line_count",
+                "is_complete",
+                "changed",
+            ]
+        )
+
+    @classmethod
+    def create_snapshot(
+        cls,
+        *,
+        trigger_source: str = InventorySnapshotTriggerSource.MANUAL,
+        cadence: str | None = None,
+        bucket_key: str | None = None,
+        force: bool = False,
+        captured_at: datetime | None = None,
+        delta: bool = False,
+        chunk_size: int = SNAPSHOT_CHUNK_SIZE,
+    ) -> InventorySnapshotDetailSchema:
         with transaction.atomic():
-            snapshot = InventorySnapshot.objects.create(
-                captured_at=captured_at,
+            snapshot = cls._start_snapshot(
                 trigger_source=trigger_source,
                 cadence=cadence,
-                bucket_key=derived_bucket_key,
+                bucket_key=bucket_key,
+                force=force,
+                captured_at=captured_at,
+                delta=delta,
             )
+            cls._capture_lines(snapshot, chunk_size=chunk_size, atomic_batches=False)
 
-            lines: list[InventorySnapshotLine] = []
-            for item in items:
-                purchase_currency = item.stock_product.currency
-                purchase_unit_price = cls._quantize(item.stock_product.purchase_price)
-                purchase_line_value = cls._quantize(item.amount * purchase_unit_price)
-                purchase_totals[purchase_currency] += purchase_line_value
-
-                receipt_currency: str | None = None
-                receipt_unit_price: Decimal | None = None
-                receipt_line_value: Decimal | None = None
-                receipt_price_available = False
-                receipt_price_fallback_reason: str | None = None
-
-                if item.source_order_item:
-                    receipt_currency = (
-                        item.source_order_item.warehouse_order.order.currency
-                    )
-                    receipt_unit_price = cls._quantize(
-                        item.source_order_item.unit_price_at_receipt
-                    )
-                    receipt_line_value = cls._quantize(item.amount * receipt_unit_price)
-                    receipt_price_available = True
-                    receipt_totals[receipt_currency] += receipt_line_value
-                else:
-                    receipt_unpriced_line_count += 1
-                    receipt_price_fallback_reason = "missing_source_order_item"
-
-                lines.append(
-                    InventorySnapshotLine(
-                        snapshot=snapshot,
-                        warehouse_item=item,
-                        warehouse_item_id_at_snapshot=item.pk,
-                        stock_product=item.stock_product,
-                        product_code=item.stock_product.code,
-                        product_name=item.stock_product.name,
-                        location=item.location,
-                        location_code=item.location.code,
-                        source_order_item=item.source_order_item,
-                        quantity=item.amount,
-                        unit_of_measure=item.stock_product.unit_of_measure.name,
-                        tracking_level=item.tracking_level,
-                        purchase_currency=purchase_currency,
-                        purchase_unit_price=purchase_unit_price,
-                        purchase_line_value=purchase_line_value,
-                        receipt_currency=receipt_currency,
-                        receipt_unit_price=receipt_unit_price,
-                        receipt_line_value=receipt_line_value,
-                        receipt_price_available=receipt_price_available,
-                        receipt_price_fallback_reason=receipt_price_fallback_reason,
-                    )
-                )
-
-            InventorySnapshotLine.objects.bulk_create(lines)
+        return cls.get_snapshot(snapshot.pk)
 
-            snapshot.line_count = len(lines)
-            snapshot.purchase_totals_by_currency = cls._serialize_totals(
-                purchase_totals
-            )
-            snapshot.receipt_totals_by_currency = cls._serialize_totals(receipt_totals)
-            snapshot.receipt_unpriced_line_count = receipt_unpriced_line_count
-            snapshot.save(
-                update_fields=[
-                    "line_count",
-                    "purchase_totals_by_currency",
-                    "receipt_totals_by_currency",
-                    "receipt_unpriced_line_count",
-                    "changed",
-                ]
+    @classmethod
+    def stream_snapshot(
+        cls,
+        *,
+        trigger_source: str = InventorySnapshotTriggerSource.MANUAL,
+        cadence: str | None = None,
+        bucket_key: str | None = None,
+        force: bool = False,
+        captured_at: datetime | None = None,
+        delta: bool = False,
+        chunk_size: int = SNAPSHOT_CHUNK_SIZE,
+        on_progress: SnapshotProgressCallback | None = None,
+    ) -> InventorySnapshotSummarySchema:
+        """
+        Create a snapshot committing its lines in batches, meant for large stock.
+
+        The snapshot stays hidden from listings until all lines are written, a failed
+        run removes what was written so far. Returns the summary only, so the lines
+        are never loaded back into memory.
+        """
+        snapshot = cls._start_snapshot(
+            trigger_source=trigger_source,
+            cadence=cadence,
+            bucket_key=bucket_key,
+            force=force,
+            captured_at=captured_at,
+            delta=delta,
+        )
+        try:
+            cls._capture_lines(
+                snapshot,
+                chunk_size=chunk_size,
+                atomic_batches=True,
+                on_progress=on_progress,
             )
+        except BaseException:
+            snapshot.delete()
+            raise
 
-        return cls.get_snapshot(snapshot.pk)
+        return cls._to_summary_schema(snapshot)
+
+    @classmethod
+    def compact_snapshot(
+        cls, snapshot_id: int, chunk_size: int = SNAPSHOT_CHUNK_SIZE
+    ) -> InventorySnapshotSummarySchema:
+        """
+        Rewrite a delta snapshot as a full one, detaching it from its base.
+
+        The snapshot keeps its id, totals and reconstructed lines, afterwards its
+        base can be deleted once no other delta refers to it.
+        """
+        with transaction.atomic():
+            snapshot = InventorySnapshot.objects.select_for_update().get(pk=snapshot_id)
+            if snapshot.base_snapshot_id is None:
+                return cls._to_summary_schema(snapshot)
+
+            # Copies get higher pks than any existing line, which keeps them out of
+            # the reconstructed view while it is being paged through.
+            last_line_pk = (
+                InventorySnapshotLine.objects.order_by("-pk")
+                .values_list("pk", flat=True)
+                .first()
+                or 0
+            )
+            lines = cls._lines_queryset(snapshot).filter(pk__lte=last_line_pk)
+            cursor = 0
+            while True:
+                batch = list(lines.filter(pk__gt=cursor).order_by("pk")[:chunk_size])
+                if not batch:
+                    break
+                cursor = batch[-1].pk
+                for line in batch:
+                    line.pk = None
+                    line.snapshot = snapshot
+                InventorySnapshotLine.objects.bulk_create(batch)
+
+            snapshot.lines.filter(pk__lte=last_line_pk).delete()
+            snapshot.base_snapshot = None
+            snapshot.save(update_fields=["base_snapshot", "changed"])
+
+        return cls._to_summary_schema(snapshot)
 
 
 inventory_snapshot_service = InventorySnapshotService()
@@ -1,5 +1,4 @@
-from calendar import monthrange
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 from decimal import Decimal
 
 from django.db import transaction
@@ -19,7 +18,11 @@ from apps.warehouse.core.schemas.invoice import (
     OutboundInvoiceCreateSchema,
 )
 from apps.warehouse.core.services import audit_service
-from apps.warehouse.core.services.pdf import print_html_to_pdf
+from apps.warehouse.core.services.document_sequences import (
+    document_sequences_service,
+    last_code_seed,
+)
+from apps.warehouse.core.services.pdf import PDF_KIND_INVOICE, pdf_cache_service
 from apps.warehouse.core.transformation import invoice_orm_to_detail_schema
 from apps.warehouse.models.audit import AuditAction
 from apps.warehouse.models.customer import Customer
@@ -32,16 +35,6 @@ from apps.warehouse.models.orders import (
 from apps.warehouse.models.warehouse import OutboundWarehouseOrderState
 
 
-def _get_end_of_month(date: datetime) -> datetime:
-    last_day = monthrange(date.year, date.month)[1]
-    return date.replace(day=last_day)
-
-
-def _get_month_range(date: datetime) -> tuple[datetime, datetime]:
-    last_day = _get_end_of_month(date)
-    return date.replace(day=1, hour=0, minute=0, second=0, microsecond=0), last_day
-
-
 class InvoicesService:
     @staticmethod
     def _build_invoice_changes(
@@ -200,22 +193,10 @@ class InvoicesService:
 
     @staticmethod
     def generate_next_outbound_invoice_code() -> str:
-        now = timezone.now()
-        dt_range = _get_month_range(now)
-        prefix = f"SINV{now.year}{now.month:02d}"
-        sequence = (
-            Invoice.objects.filter(
-                created__range=dt_range, code__startswith=prefix
-            ).count()
-            + 1
+        return document_sequences_service.next_code(
+            "outbound_invoice", "SINV", seed=last_code_seed(Invoice.objects.all())
         )
 
-        while True:
-            code = f"{prefix}{sequence:04d}"
-            if not Invoice.objects.filter(code=code).exists():
-                return code
-            sequence += 1
-
     @classmethod
     def get_invoice(cls, invoice_code: str) -> InvoiceDetailSchema:
         invoice = cls._get_invoice_queryset().get(code=invoice_code)
@@ -249,7 +230,9 @@ class InvoicesService:
 
     @classmethod
     def get_pdf(cls, invoice_code: str) -> bytes:
-        return print_html_to_pdf(content_html=cls.get_html(invoice_code))
+        return pdf_cache_service.get_pdf(
+            PDF_KIND_INVOICE, invoice_code, cls.get_html(invoice_code)
+        )
 
     @classmethod
     def create_outbound_invoice(
@@ -368,6 +351,8 @@ class InvoicesService:
                 )
                 outbound_orders_service.sync_state_from_invoice(order, context)
 
+            pdf_cache_service.prerender(PDF_KIND_INVOICE, invoice.code, cls.get_html)
+
         created_invoice = cls._get_invoice_queryset().get(pk=invoice.pk)
         return invoice_orm_to_detail_schema(created_invoice)
 
@@ -443,6 +428,8 @@ class InvoicesService:
             for order in cls._get_related_outbound_orders(invoice):
                 outbound_orders_service.sync_state_from_invoice(order, context)
 
+            pdf_cache_service.prerender(PDF_KIND_INVOICE, invoice.code, cls.get_html)
+
         updated_invoice = cls._get_invoice_queryset().get(pk=invoice.pk)
         return invoice_orm_to_detail_schema(updated_invoice)
 
@@ -479,6 +466,8 @@ class InvoicesService:
             for order in cls._get_related_outbound_orders(invoice):
                 outbound_orders_service.sync_state_from_invoice(order, context)
 
+            pdf_cache_service.prerender(PDF_KIND_INVOICE, invoice.code, cls.get_html)
+
         paid_invoice = cls._get_invoice_queryset().get(pk=invoice.pk)
         return invoice_orm_to_detail_schema(paid_invoice)
 
@@ -1,51 +1,191 @@
-from django.db.models import QuerySet
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import close_old_connections, models, transaction
+from django.db.models import Max, QuerySet
+from loguru import logger
+
+from apps.warehouse.models.orders import InboundOrderItem, OutboundOrderItem
+
+# Order items are stored with indexes ``INDEX_GAP`` apart, so an item can be
+# moved between two others by giving it an index from the gap in between. The
+# stored index is only a sort key, the API exposes the 0-based position instead.
+INDEX_GAP = 1024
+
+# Indexes stay below this limit, which leaves room above them for staging.
+INDEX_LIMIT = 2**30
+
+# Gaps narrower than this are spread out again after the move commits.
+_MIN_GAP = 2
+
+ModelT = TypeVar("ModelT", bound=models.Model)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _ordered(items_qs: QuerySet[ModelT]) -> QuerySet[ModelT]:
+    return items_qs.order_by("index", "created")
+
+
+def get_item_at(items_qs: QuerySet[ModelT], position: int) -> ModelT:
+    """Item at the 0-based ``position``, raises the model's ``DoesNotExist``."""
+    if position < 0:
+        return items_qs.none().get()
+    return _ordered(items_qs)[position : position + 1].get()
+
+
+def get_item_position(
+    items_qs: QuerySet, item: InboundOrderItem | OutboundOrderItem
+) -> int:
+    return items_qs.filter(index__lt=item.index).count()
+
+
+def _index_between(before: int | None, after: int | None) -> int | None:
+    """Free index between two neighbours, ``None`` when there is no room."""
+    if after is None:
+        index = (before if before is not None else 0) + INDEX_GAP
+        return index if index < INDEX_LIMIT else None
+    lower = before if before is not None else -1
+    if after - lower < _MIN_GAP:
+        return None
+    return (lower + after) // 2
+
+
+def _index_at(indexes: list[int], position: int) -> int | None:
+    before = indexes[position - 1] if position > 0 else None
+    after = indexes[position] if position < len(indexes) else None
+    return _index_between(before, after)
+
+
+def next_item_index(items_qs: QuerySet) -> int:
+    """Index for an item appended after all items of ``items_qs``."""
+    last = items_qs.aggregate(last=Max("index"))["last"]
+    index = _index_between(last, None)
+    if index is None:
+        renormalize_order_items(items_qs)
+        index = _index_between(items_qs.aggregate(last=Max("index"))["last"], None)
+        # Renormalized indexes end far below ``INDEX_LIMIT``.
+        assert index is not None
+    return index
+
+
+def index_for_position(items_qs: QuerySet, position: int) -> int:
+    """Index that places a new item at the 0-based ``position`` of ``items_qs``."""
+    indexes = list(_ordered(items_qs).values_list("index", flat=True))
+    position = max(0, min(position, len(indexes)))
+    index = _index_at(indexes, position)
+    if index is None:
+        renormalize_order_items(items_qs)
+        indexes = list(_ordered(items_qs).values_list("index", flat=True))
+        index = _index_at(indexes, position)
+        # Renormalized indexes leave a gap at every position.
+        assert index is not None
+    return index
 
 
 def reorder_order_items(items_qs: QuerySet, item_index: int, new_index: int) -> None:
     """
-    Move the item at `item_index` to `new_index`, resequencing all other items.
+    Move the item at position `item_index` to position `new_index`.
 
-    Items are sorted by their current `index` field.  After the move every item
-    gets a fresh 0-based sequential index so the list stays compact.
+    Only the moved item is written: it gets an index from the gap between its
+    new neighbours. Narrow gaps are spread out again in the background once the
+    transaction commits, an exhausted gap right away.
 
     Must be called inside a ``transaction.atomic()`` block; the caller should
     also pass a ``select_for_update()`` queryset to prevent concurrent races.
     """
-    items = list(items_qs.order_by("index"))
+    rows = list(_ordered(items_qs).values_list("pk", "index"))
 
-    if not items:
+    if not rows:
         return
 
-    current_pos = next(
-        (i for i, item in enumerate(items) if item.index == item_index), None
-    )
-    if current_pos is None:
-        from django.core.exceptions import ObjectDoesNotExist
-
+    if not 0 <= item_index < len(rows):
         raise ObjectDoesNotExist(f"Order item with index {item_index} does not exist.")
 
-    target_pos = max(0, min(new_index, len(items) - 1))
+    target_pos = max(0, min(new_index, len(rows) - 1))
 
-    if current_pos == target_pos:
+    if item_index == target_pos:
         return
 
-    moving_item = items.pop(current_pos)
-    items.insert(target_pos, moving_item)
-
-    model = type(moving_item)
-
-    # The (order, index) unique constraint means the final indices can't be
-    # written in one pass: bulk_update's UPDATE still applies row by row
-    # under the hood, so directly swapping values would momentarily duplicate
-    # an index and violate the constraint. Stage every item through indices
-    # strictly above the current maximum first - values no row can already
-    # hold - then assign the final 0..n-1 sequence once every row has moved
-    # out of the way.
-    staging_base = max(item.index for item in items) + 1
-    for offset, item in enumerate(items):
-        item.index = staging_base + offset
-    model.objects.bulk_update(items, ["index"])
-
-    for i, item in enumerate(items):
-        item.index = i
-    model.objects.bulk_update(items, ["index"])
+    pk, _ = rows.pop(item_index)
+    indexes = [index for _, index in rows]
+    index = _index_at(indexes, target_pos)
+    if index is None:
+        renormalize_order_items(items_qs)
+        indexes = list(
+            _ordered(items_qs.exclude(pk=pk)).values_list("index", flat=True)
+        )
+        index = _index_at(indexes, target_pos)
+
+    items_qs.model.objects.filter(pk=pk).update(index=index)
+
+    neighbours = indexes[max(0, target_pos - 1) : target_pos + 1]
+    if any(abs(index - neighbour) < _MIN_GAP for neighbour in neighbours):
+        _renormalize_later(items_qs)
+
+
+def renormalize_order_items(items_qs: QuerySet) -> int:
+    """
+    Spread the indexes of ``items_qs`` out to ``INDEX_GAP`` apart again.
+
+    Returns the number of items that had to be written.
+    """
+    with transaction.atomic():
+        items = list(_ordered(items_qs))
+        targets = [(position + 1) * INDEX_GAP for position in range(len(items))]
+        if [item.index for item in items] == targets:
+            return 0
+
+        model = type(items[0])
+
+        # The (order, index) unique constraint means the final indices can't be
+        # written in one pass: bulk_update's UPDATE still applies row by row
+        # under the hood, so directly swapping values would momentarily duplicate
+        # an index and violate the constraint. Stage every item through indices
+        # strictly above both the current and the final ones - values no row can
+        # hold - then assign the final sequence once every row has moved out of
+        # the way.
+        staging_base = max(max(item.index for item in items), targets[-1]) + 1
+        for offset, item in enumerate(items):
+            item.index = staging_base + offset
+        model.objects.bulk_update(items, ["index"])
+
+        for item, index in zip(items, targets):
+            item.index = index
+        model.objects.bulk_update(items, ["index"])
+    return len(items)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="item-renormalize"
+            )
+        return _executor
+
+
+def _renormalize_in_background(items_qs: QuerySet) -> None:
+    try:
+        renormalize_order_items(items_qs)
+    except Exception:
+        logger.exception("Failed to renormalize order item indexes.")
+    finally:
+        # Only the worker's own connection, never one inside a transaction.
+        if not transaction.get_connection().in_atomic_block:
+            close_old_connections()
+
+
+def _renormalize_later(items_qs: QuerySet) -> None:
+    items_qs = items_qs.all()
+
+    def submit() -> Future[None]:
+        return _get_executor().submit(_renormalize_in_background, items_qs)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from apps.warehouse.core.exceptions import ApiBaseException, NotFoundException
+from apps.warehouse.core.schemas.printer import (
+    LabelTemplateCreateOrUpdateSchema,
+    LabelTemplateSchema,
+)
+from apps.warehouse.core.transformation import label_template_orm_to_schema
+from apps.warehouse.core.zebra_printer import CompiledTemplate
+from apps.warehouse.models.printer import LabelTemplate, Printer
+
+
+def _compile(content: str) -> CompiledTemplate:
+    try:
+        return CompiledTemplate(content)
+    except ValueError as exc:
+        raise ApiBaseException(str(exc), http_status=400)
+
+
+class LabelTemplatesService:
+    """
+    ZPL label templates, assigned to printers or picked per print request.
+
+    A template is parsed into a ``CompiledTemplate`` the first time it is used
+    and kept in memory per template version, which every save increments. Labels
+    are then rendered by filling the slots of the compiled template. Printers
+    without a template print ``zebra_printer.DEFAULT_TEMPLATE``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._compiled: dict[int, tuple[int, str, CompiledTemplate]] = {}
+
+    def get_compiled(self, template: LabelTemplate) -> CompiledTemplate:
+        with self._lock:
+            cached = self._compiled.get(template.pk)
+        # The content is compared as well, ids of deleted rows may be reused.
+        if cached is not None and cached[:2] == (template.version, template.content):
+            return cached[2]
+
+        compiled = _compile(template.content)
+        with self._lock:
+            self._compiled[template.pk] = (template.version, template.content, compiled)
+        return compiled
+
+    def resolve(
+        self, printer: Printer, template_code: str | None = None
+    ) -> CompiledTemplate | None:
+        """Template given by ``template_code``, else the one of ``printer``."""
+        if template_code:
+            return self.get_compiled(self.get_template(template_code))
+        if printer.label_template is not None:
+            return self.get_compiled(printer.label_template)
+        return None
+
+    @staticmethod
+    def get_templates() -> QuerySet[LabelTemplate]:
+        return LabelTemplate.objects.order_by("code")
+
+    @staticmethod
+    def get_template(code: str) -> LabelTemplate:
+        try:
+            return LabelTemplate.objects.get(code=code)
+        except LabelTemplate.DoesNotExist:
+            raise NotFoundException(f"Label template '{code}' not found")
+
+    def to_schema(self, template: LabelTemplate) -> LabelTemplateSchema:
+        return label_template_orm_to_schema(template, self.get_compiled(template))
+
+    @transaction.atomic
+    def create_template(
+        self, params: LabelTemplateCreateOrUpdateSchema
+    ) -> LabelTemplateSchema:
+        if LabelTemplate.objects.filter(code=params.code).exists():
+            raise ApiBaseException(
+                "Label template with this code already exists", http_status=400
+            )
+
+        compiled = _compile(params.content)
+        template = LabelTemplate.objects.create(
+            code=params.code,
+            description=params.description,
+            content=params.content,
+        )
+        return label_template_orm_to_schema(template, compiled)
+
+    @transaction.atomic
+    def update_template(
+        self, code: str, params: LabelTemplateCreateOrUpdateSchema
+    ) -> LabelTemplateSchema:
+        template = self.get_template(code)
+
+        if (
+            params.code != code
+            and LabelTemplate.objects.filter(code=params.code).exists()
+        ):
+            raise ApiBaseException(
+                "Label template with this code already exists", http_status=400
+            )
+
+        compiled = _compile(params.content)
+        template.code = params.code
+        template.description = params.description
+        template.content = params.content
+        template.save(update_fields=["code", "description", "content", "changed"])
+        return label_template_orm_to_schema(template, compiled)
+
+    @transaction.atomic
+    def delete_template(self, code: str) -> LabelTemplateSchema:
+        template = self.get_template(code)
+        schema = self.to_schema(template)
+        template.delete()
+        return schema
+
+
+label_templates_service = LabelTemplatesService()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import time
+from hashlib import sha256
+from typing import TypeVar, cast
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.warehouse.models.packaging import PackageType, UnitOfMeasure
+from apps.warehouse.models.product import PriceGroup, StockProduct
+from apps.warehouse.models.warehouse import WarehouseLocation
+
+LOOKUP_CACHE_TIMEOUT = 600
+
+# Natural key each cached model is looked up by.
+LOOKUP_FIELDS: dict[type[models.Model], str] = {
+    StockProduct: "code",
+    WarehouseLocation: "code",
+    UnitOfMeasure: "name",
+    PackageType: "name",
+    PriceGroup: "code",
+}
+
+_VERSION_KEY = "warehouse:lookup-version:{label}"
+_ENTRY_KEY = "warehouse:lookup:{label}:{version}:{digest}"
+_STATS_KEY = "warehouse:lookup-stats:{label}:{outcome}"
+
+ModelT = TypeVar("ModelT", bound=models.Model)
+
+
+class LookupCacheService:
+    """
+    Shared cache of catalogue rows looked up by their natural key.
+
+    Every cached model has a version token stored in the cache next to the entries.
+    Saves and deletes bump the token, which makes all entries of that model
+    unreachable without having to enumerate them. The entries live in the
+    configured Django cache, so all worker processes share them. With
+    ``settings.LOOKUP_CACHE_STATS`` hits and misses are counted per model too.
+    """
+
+    @staticmethod
+    def _label(model: type[models.Model]) -> str:
+        return model._meta.label_lower
+
+    def _version(self, model: type[models.Model]) -> int:
+        # Only returns None for a stored None, the token never is one.
+        return cast(
+            int,
+            cache.get_or_set(
+                _VERSION_KEY.format(label=self._label(model)), time.time_ns, None
+            ),
+        )
+
+    def _count(self, model: type[models.Model], outcome: str) -> None:
+        if not settings.LOOKUP_CACHE_STATS:
+            return
+        key = _STATS_KEY.format(label=self._label(model), outcome=outcome)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # ``incr`` requires the key to exist, a racing ``add`` is harmless.
+            if not cache.add(key, 1, None):
+                cache.incr(key)
+
+    def get(self, model: type[ModelT], value: str) -> ModelT:
+        """
+        Return the ``model`` row whose natural key equals ``value``.
+
+        Raises ``model.DoesNotExist`` like ``Model.objects.get`` does, unknown keys
+        are not cached. Every call returns a fresh instance.
+        """
+        field = LOOKUP_FIELDS[model]
+        key = _ENTRY_KEY.format(
+            label=self._label(model),
+            version=self._version(model),
+            # Natural keys may contain characters that aren't valid in cache keys.
+            digest=sha256(value.encode()).hexdigest(),
+        )
+        instance = cache.get(key)
+        if instance is not None:
+            self._count(model, "hits")
+            return instance
+
+        self._count(model, "misses")
+        instance = model._default_manager.get(**{field: value})
+        cache.set(key, instance, LOOKUP_CACHE_TIMEOUT)
+        return instance
+
+    def invalidate(self, model: type[models.Model]) -> None:
+        cache.set(_VERSION_KEY.format(label=self._label(model)), time.time_ns(), None)
+
+    def _stats_keys(self) -> dict[tuple[str, str], str]:
+        return {
+            (self._label(model), outcome): _STATS_KEY.format(
+                label=self._label(model), outcome=outcome
+            )
+            for model in LOOKUP_FIELDS
+            for outcome in ("hits", "misses")
+        }
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Hit and miss counters per model label since the last ``reset_stats``."""
+        keys = self._stats_keys()
+        values = cache.get_many(list(keys.values()))
+        stats: dict[str, dict[str, int]] = {}
+        for (label, outcome), key in keys.items():
+            stats.setdefault(label, {})[outcome] = values.get(key, 0)
+        return stats
+
+    def reset_stats(self) -> None:
+        cache.delete_many(list(self._stats_keys().values()))
+
+    # ---------------------------------------------------------------------
+    # Signal handlers
+    # ---------------------------------------------------------------------
+
+    def _on_write(self, sender, **kwargs) -> None:
+        self.invalidate(sender)
+        # Rows cached by other requests before this transaction commits are stale too.
+        transaction.on_commit(lambda: self.invalidate(sender))
+
+    def connect_signals(self) -> None:
+        for model in LOOKUP_FIELDS:
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    self._on_write, sender=model, dispatch_uid="warehouse.lookup_cache"
+                )
+
+
+lookup_cache_service = LookupCacheService()
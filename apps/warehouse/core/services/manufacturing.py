@@ -1,5 +1,3 @@
-from calendar import monthrange
-from datetime import datetime
 from decimal import Decimal
 from typing import cast
 
@@ -21,6 +19,11 @@ from apps.warehouse.core.schemas.manufacturing import (
     ManufacturingOrderSchema,
 )
 from apps.warehouse.core.services import audit_service
+from apps.warehouse.core.services.document_sequences import (
+    document_sequences_service,
+    last_code_seed,
+)
+from apps.warehouse.core.services.lookup_cache import lookup_cache_service
 from apps.warehouse.core.services.warehouse_order_factory import (
     WarehouseOrderKind,
     create_warehouse_order,
@@ -44,35 +47,14 @@ from apps.warehouse.models.warehouse import (
 )
 
 
-def _get_end_of_month(date: datetime) -> datetime:
-    last_day = monthrange(date.year, date.month)[1]
-    return date.replace(day=last_day)
-
-
-def _get_month_range(date: datetime) -> tuple[datetime, datetime]:
-    last_day = _get_end_of_month(date)
-    return date.replace(day=1, hour=0, minute=0, second=0, microsecond=0), last_day
-
-
 class ManufacturingOrdersService:
     @staticmethod
     def generate_next_code() -> str:
-        now = timezone.now()
-        dt_range = _get_month_range(now)
-        monthly_prefix = f"PV{now.year}{now.month:02d}"
-        last_code = (
-            ManufacturingOrder.objects.filter(
-                created__range=dt_range,
-                code__startswith=monthly_prefix,
-            )
-            .order_by("-code")
-            .values_list("code", flat=True)
-            .first()
+        return document_sequences_service.next_code(
+            "manufacturing_order",
+            "PV",
+            seed=last_code_seed(ManufacturingOrder.objects.all()),
         )
-        next_number = 1
-        if last_code:
-            next_number = int(str(last_code)[len(monthly_prefix) :]) + 1
-        return f"{monthly_prefix}{next_number:04d}"
 
     @staticmethod
     def get_manufacturing_orders(
@@ -170,8 +152,8 @@ class ManufacturingOrdersService:
         order = ManufacturingOrder.objects.get(code=code)
         cls._ensure_editable(order)
 
-        in_product = StockProduct.objects.get(code=item.in_product_code)
-        out_product = StockProduct.objects.get(code=item.out_product_code)
+        in_product = lookup_cache_service.get(StockProduct, item.in_product_code)
+        out_product = lookup_cache_service.get(StockProduct, item.out_product_code)
 
         with transaction.atomic():
             next_index = order.items.count()
@@ -197,8 +179,8 @@ class ManufacturingOrdersService:
         order = ManufacturingOrder.objects.get(code=code)
         cls._ensure_editable(order)
 
-        in_product = StockProduct.objects.get(code=item.in_product_code)
-        out_product = StockProduct.objects.get(code=item.out_product_code)
+        in_product = lookup_cache_service.get(StockProduct, item.in_product_code)
+        out_product = lookup_cache_service.get(StockProduct, item.out_product_code)
 
         with transaction.atomic():
             item_model = ManufacturingOrderItem.objects.get(pk=item_id, order=order)
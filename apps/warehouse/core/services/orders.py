@@ -1,5 +1,3 @@
-from calendar import monthrange
-from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
 
 from django.core.files.uploadedfile import UploadedFile
@@ -24,8 +22,22 @@ from apps.warehouse.core.schemas.orders import (
 )
 from apps.warehouse.core.audit_messages import AuditMessages
 from apps.warehouse.core.services import audit_service
-from apps.warehouse.core.services.item_reorder import reorder_order_items
-from apps.warehouse.core.services.pdf import print_html_to_pdf
+from apps.warehouse.core.services.document_sequences import (
+    document_sequences_service,
+    count_seed,
+)
+from apps.warehouse.core.services.item_reorder import (
+    get_item_at,
+    get_item_position,
+    index_for_position,
+    next_item_index,
+    reorder_order_items,
+)
+from apps.warehouse.core.services.lookup_cache import lookup_cache_service
+from apps.warehouse.core.services.pdf import (
+    PDF_KIND_INBOUND_ORDER,
+    pdf_cache_service,
+)
 from apps.warehouse.core.transformation import (
     inbound_order_item_orm_to_schema,
     inbound_order_orm_to_schema,
@@ -45,16 +57,6 @@ from apps.warehouse.models.orders import (
 from apps.warehouse.models.product import StockProduct
 
 
-def _get_end_of_month(date: datetime) -> datetime:
-    last_day = monthrange(date.year, date.month)[1]
-    return date.replace(day=last_day)
-
-
-def _get_month_range(date: datetime) -> tuple[datetime, datetime]:
-    last_day = _get_end_of_month(date)
-    return date.replace(day=1, hour=0, minute=0, second=0, microsecond=0), last_day
-
-
 class OrdersService:
     @staticmethod
     def _compute_unit_price(amount: Decimal, total_price: Decimal) -> Decimal:
@@ -136,19 +138,17 @@ class OrdersService:
 
     @staticmethod
     def generate_next_incoming_order_code() -> str:
-        now = timezone.now()
-        dt_range = _get_month_range(now)
-        orders_this_month = InboundOrder.objects.filter(created__range=dt_range).count()
-        return f"OV{now.year}{now.month:02d}{orders_this_month + 1:04d}"
+        return document_sequences_service.next_code(
+            "inbound_order", "OV", seed=count_seed(InboundOrder.objects.all())
+        )
 
     @staticmethod
     def generate_next_credit_note_code() -> str:
-        now = timezone.now()
-        dt_range = _get_month_range(now)
-        notes_this_month = CreditNoteToSupplier.objects.filter(
-            created__range=dt_range
-        ).count()
-        return f"DV{now.year}{now.month:02d}{notes_this_month + 1:04d}"
+        return document_sequences_service.next_code(
+            "supplier_credit_note",
+            "DV",
+            seed=count_seed(CreditNoteToSupplier.objects.all()),
+        )
 
     @staticmethod
     def update_or_create_incoming(
@@ -215,10 +215,14 @@ class OrdersService:
     ) -> InboundOrderItemSchema:
         order = InboundOrder.objects.get(code=code)
         OrdersService._ensure_inbound_order_editable(order)
-        stock_product = StockProduct.objects.get(code=item.product_code)
+        stock_product = lookup_cache_service.get(StockProduct, item.product_code)
 
         with transaction.atomic():
-            next_index = order.items.count()
+            items_qs = order.items.select_for_update()
+            if item.index is not None:
+                index = index_for_position(items_qs, item.index)
+            else:
+                index = next_item_index(items_qs)
             amount = Decimal(str(item.amount))
             total_price = Decimal(str(item.total_price))
             item_model = InboundOrderItem.objects.create(
@@ -227,10 +231,11 @@ class OrdersService:
                 order=order,
                 total_price=total_price,
                 unit_price=OrdersService._compute_unit_price(amount, total_price),
-                index=item.index if item.index is not None else next_index,
+                index=index,
             )
 
-        return inbound_order_item_orm_to_schema(item_model)
+            position = get_item_position(order.items, item_model)
+        return inbound_order_item_orm_to_schema(item_model, position)
 
     @staticmethod
     def update_item(
@@ -238,7 +243,7 @@ class OrdersService:
     ) -> InboundOrderItemSchema:
         order = InboundOrder.objects.get(code=code)
         OrdersService._ensure_inbound_order_editable(order)
-        item_model = InboundOrderItem.objects.get(order=order, index=item_index)
+        item_model = get_item_at(order.items, item_index)
 
         with transaction.atomic():
             amount = Decimal(str(item.amount))
@@ -248,17 +253,23 @@ class OrdersService:
             item_model.unit_price = OrdersService._compute_unit_price(
                 amount, total_price
             )
+            item_model.save(
+                update_fields=["amount", "total_price", "unit_price", "changed"]
+            )
             if item.index is not None:
-                item_model.index = item.index
-            item_model.save()
+                reorder_order_items(
+                    order.items.select_for_update(), item_index, item.index
+                )
+                item_model.refresh_from_db(fields=["index"])
 
-        return inbound_order_item_orm_to_schema(item_model)
+            position = get_item_position(order.items, item_model)
+        return inbound_order_item_orm_to_schema(item_model, position)
 
     @staticmethod
     def remove_item(code: str, item_index: int) -> bool:
         order = InboundOrder.objects.get(code=code)
         OrdersService._ensure_inbound_order_editable(order)
-        item = InboundOrderItem.objects.get(order=order, index=item_index)
+        item = get_item_at(order.items, item_index)
         with transaction.atomic():
             item.delete()
 
@@ -361,6 +372,9 @@ class OrdersService:
                 ),
                 changes={"state": {"old": old_state, "new": new_state}},
             )
+            pdf_cache_service.prerender(
+                PDF_KIND_INBOUND_ORDER, order.code, OrdersService.get_html
+            )
 
         return inbound_order_orm_to_schema(order)
 
@@ -411,7 +425,9 @@ class OrdersService:
 
     @classmethod
     def get_pdf(cls, code: str) -> bytes:
-        return print_html_to_pdf(content_html=cls.get_html(code))
+        return pdf_cache_service.get_pdf(
+            PDF_KIND_INBOUND_ORDER, code, cls.get_html(code)
+        )
 
     @classmethod
     def get_or_create_credit_note(
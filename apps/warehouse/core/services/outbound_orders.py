@@ -1,5 +1,3 @@
-from calendar import monthrange
-from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
 from typing import cast
 
@@ -22,7 +20,18 @@ from apps.warehouse.core.schemas.orders import (
     OutboundOrderSchema,
 )
 from apps.warehouse.core.services import audit_service
-from apps.warehouse.core.services.item_reorder import reorder_order_items
+from apps.warehouse.core.services.document_sequences import (
+    document_sequences_service,
+    last_code_seed,
+)
+from apps.warehouse.core.services.item_reorder import (
+    get_item_at,
+    get_item_position,
+    index_for_position,
+    next_item_index,
+    reorder_order_items,
+)
+from apps.warehouse.core.services.lookup_cache import lookup_cache_service
 from apps.warehouse.core.services.products import stock_product_service
 from apps.warehouse.core.services.warehouse_order_factory import (
     WarehouseOrderKind,
@@ -53,16 +62,6 @@ from apps.warehouse.models.warehouse import (
 )
 
 
-def _get_end_of_month(date: datetime) -> datetime:
-    last_day = monthrange(date.year, date.month)[1]
-    return date.replace(day=last_day)
-
-
-def _get_month_range(date: datetime) -> tuple[datetime, datetime]:
-    last_day = _get_end_of_month(date)
-    return date.replace(day=1, hour=0, minute=0, second=0, microsecond=0), last_day
-
-
 class OutboundOrdersService:
     _EDITABLE_WAREHOUSE_ORDER_STATES = (
         OutboundWarehouseOrderState.DRAFT,
@@ -136,7 +135,7 @@ class OutboundOrdersService:
     def _get_desired_package_or_none(name: str | None) -> PackageType | None:
         if not name:
             return None
-        return PackageType.objects.get(name=name)
+        return lookup_cache_service.get(PackageType, name)
 
     @staticmethod
     def _get_desired_batch_or_none(batch_code: str | None) -> Batch | None:
@@ -193,7 +192,6 @@ class OutboundOrdersService:
                 f"Outbound warehouse order '{warehouse_order.code}' has no linked order."
             )
 
-        next_index = 0
         for order_item in linked_order.items.select_related(
             "stock_product",
             "desired_package_type",
@@ -225,10 +223,9 @@ class OutboundOrdersService:
                     amount=chunk_amount,
                     desired_package_type=order_item.desired_package_type,
                     desired_batch=order_item.desired_batch,
-                    index=next_index,
+                    index=order_item.index,
                 )
                 created_any = True
-                next_index += 1
                 remaining_amount -= chunk_amount
 
             if remaining_amount > 0 or not created_any:
@@ -241,9 +238,8 @@ class OutboundOrdersService:
                     else order_item.amount,
                     desired_package_type=order_item.desired_package_type,
                     desired_batch=order_item.desired_batch,
-                    index=next_index,
+                    index=order_item.index,
                 )
-                next_index += 1
 
     @staticmethod
     def _with_pricing_details(
@@ -366,31 +362,19 @@ class OutboundOrdersService:
     @staticmethod
     def _generate_next_monthly_code(
         *,
+        name: str,
         queryset: QuerySet[OutboundOrder],
         field_name: str,
         prefix: str,
     ) -> str:
-        now = timezone.now()
-        dt_range = _get_month_range(now)
-        monthly_prefix = f"{prefix}{now.year}{now.month:02d}"
-        last_code = (
-            queryset.filter(
-                created__range=dt_range, **{f"{field_name}__startswith": monthly_prefix}
-            )
-            .exclude(**{field_name: ""})
-            .order_by(f"-{field_name}")
-            .values_list(field_name, flat=True)
-            .first()
+        return document_sequences_service.next_code(
+            name, prefix, seed=last_code_seed(queryset, field_name)
         )
-        next_number = 1
-        if last_code:
-            next_number = int(str(last_code)[len(monthly_prefix) :]) + 1
-
-        return f"{monthly_prefix}{next_number:04d}"
 
     @classmethod
     def generate_next_outgoing_order_code(cls) -> str:
         return cls._generate_next_monthly_code(
+            name="outbound_order",
             queryset=OutboundOrder.objects.all(),
             field_name="code",
             prefix="OV",
@@ -399,6 +383,7 @@ class OutboundOrdersService:
     @classmethod
     def generate_next_calculation_code(cls) -> str:
         return cls._generate_next_monthly_code(
+            name="outbound_calculation",
             queryset=OutboundOrder.objects.exclude(calculation_code__isnull=True),
             field_name="calculation_code",
             prefix="K",
@@ -672,14 +657,18 @@ class OutboundOrdersService:
             code=code
         )
         cls._assert_order_editable(order)
-        stock_product = StockProduct.objects.get(code=item.product_code)
+        stock_product = lookup_cache_service.get(StockProduct, item.product_code)
         desired_package_type = cls._get_desired_package_or_none(
             item.desired_package_type_name
         )
         desired_batch = cls._get_desired_batch_or_none(item.desired_batch_code)
 
         with transaction.atomic():
-            next_index = order.items.count()
+            items_qs = order.items.select_for_update()
+            if item.index is not None:
+                index = index_for_position(items_qs, item.index)
+            else:
+                index = next_item_index(items_qs)
             amount = Decimal(str(item.amount))
             total_price = Decimal(str(item.total_price))
             cls._validate_desired_packaging(
@@ -693,7 +682,7 @@ class OutboundOrdersService:
                 order=order,
                 total_price=total_price,
                 unit_price=cls._compute_unit_price(amount, total_price),
-                index=item.index if item.index is not None else next_index,
+                index=index,
                 desired_package_type=desired_package_type,
                 desired_batch=desired_batch,
                 note=item.note,
@@ -703,6 +692,7 @@ class OutboundOrdersService:
                 order_item=item_model,
                 context=context,
             )
+            position = get_item_position(order.items, item_model)
         selected_unit_price = cls._compute_unit_price(amount, total_price)
         pricing_details = cls._build_item_pricing_details(
             order=order,
@@ -710,7 +700,7 @@ class OutboundOrdersService:
             selected_unit_price=selected_unit_price,
         )
         return outbound_order_item_orm_to_schema(
-            item_model, pricing_details=pricing_details
+            item_model, position, pricing_details=pricing_details
         )
 
     @classmethod
@@ -725,7 +715,7 @@ class OutboundOrdersService:
             code=code
         )
         cls._assert_order_editable(order)
-        item_model = OutboundOrderItem.objects.get(order=order, index=item_index)
+        item_model = get_item_at(order.items, item_index)
         desired_package_type = cls._get_desired_package_or_none(
             item.desired_package_type_name
         )
@@ -747,21 +737,25 @@ class OutboundOrdersService:
             item_model.desired_package_type = desired_package_type
             item_model.desired_batch = desired_batch
             item_model.note = item.note
-            if item.index is not None:
-                item_model.index = item.index
             item_model.save()
+            if item.index is not None:
+                reorder_order_items(
+                    order.items.select_for_update(), item_index, item.index
+                )
+                item_model.refresh_from_db(fields=["index"])
             cls._sync_order_item_to_warehouse_orders(
                 order=order,
                 order_item=item_model,
                 context=context,
             )
+            position = get_item_position(order.items, item_model)
         pricing_details = cls._build_item_pricing_details(
             order=order,
             stock_product=item_model.stock_product,
             selected_unit_price=item_model.unit_price,
         )
         return outbound_order_item_orm_to_schema(
-            item_model, pricing_details=pricing_details
+            item_model, position, pricing_details=pricing_details
         )
 
     @classmethod
@@ -775,10 +769,7 @@ class OutboundOrdersService:
             code=code
         )
         cls._assert_order_editable(order)
-        item_model = OutboundOrderItem.objects.get(
-            order=order,
-            index=item_index,
-        )
+        item_model = get_item_at(order.items, item_index)
         if cls._get_assigned_warehouse_requirements(item_model).exists():
             raise WarehouseItemBadRequestError(
                 "Assigned warehouse items prevent removing this order item."
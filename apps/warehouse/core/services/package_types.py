@@ -4,6 +4,7 @@ from django.db import transaction
 from django.db.models import Q, QuerySet
 
 from apps.warehouse.core.schemas.packaging import PackageTypeCreateOrUpdateSchema
+from apps.warehouse.core.services.lookup_cache import lookup_cache_service
 from apps.warehouse.core.transformation import package_type_orm_to_schema
 from apps.warehouse.models.packaging import PackageType, UnitOfMeasure
 
@@ -25,7 +26,7 @@ class PackageTypesService:
     def create_package_type(params: PackageTypeCreateOrUpdateSchema):
         unit_of_measure = None
         if params.unit:
-            unit_of_measure = UnitOfMeasure.objects.get(name=params.unit)
+            unit_of_measure = lookup_cache_service.get(UnitOfMeasure, params.unit)
 
         package_type, _ = PackageType.objects.update_or_create(
             name=params.name,
@@ -45,7 +46,7 @@ class PackageTypesService:
         )
         unit_of_measure = None
         if params.unit:
-            unit_of_measure = UnitOfMeasure.objects.get(name=params.unit)
+            unit_of_measure = lookup_cache_service.get(UnitOfMeasure, params.unit)
 
         package_type.name = params.name
         package_type.description = params.description
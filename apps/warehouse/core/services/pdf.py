@@ -1,5 +1,186 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from hashlib import sha256
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from loguru import logger
+
+from apps.warehouse.models.orders import InboundOrder, Invoice
+
+PDF_KIND_INVOICE = "invoice"
+PDF_KIND_INBOUND_ORDER = "inbound-order"
+
+# Documents whose files are removed when their model row changes.
+_CACHED_DOCUMENTS: dict[type[models.Model], str] = {
+    Invoice: PDF_KIND_INVOICE,
+    InboundOrder: PDF_KIND_INBOUND_ORDER,
+}
+
+
 def print_html_to_pdf(content_html: str) -> bytes:
     # lazy import if requried binaries are missing
     from weasyprint import HTML  # type: ignore
 
     return HTML(string=content_html).write_pdf()
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique name per writer, threads may render the same document at once.
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".partial", delete=False
+    ) as partial:
+        partial.write(content)
+    Path(partial.name).replace(path)
+
+
+def _render_to_file(
+    content_html: str, path: str, render: Callable[[str], bytes]
+) -> None:
+    """Render ``content_html`` into ``path`` with ``render``, runs in the render pool."""
+    _write_atomic(Path(path), render(content_html))
+
+
+class PdfCacheService:
+    """
+    Rendered PDF documents, stored on disk and addressed by their HTML.
+
+    A document is stored as ``<kind>/<code digest>/<HTML digest>.pdf`` in
+    ``settings.PDF_CACHE_DIR``, so any change that shows in the rendered HTML
+    misses the cache by itself. Saving or deleting an invoice or inbound order
+    removes all files of its document. ``prerender`` renders a document in a pool
+    of ``settings.PDF_RENDER_WORKERS`` processes once the current transaction
+    commits, downloads of the same version then wait for that render instead of
+    starting their own.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_pid: int | None = None
+        self._pending: dict[Path, Future[None]] = {}
+
+    @staticmethod
+    def _document_dir(kind: str, code: str) -> Path:
+        # Codes may contain characters that aren't valid in file names.
+        return Path(settings.PDF_CACHE_DIR) / kind / sha256(code.encode()).hexdigest()
+
+    def _path(self, kind: str, code: str, content_html: str) -> Path:
+        digest = sha256(content_html.encode()).hexdigest()
+        return self._document_dir(kind, code) / f"{digest}.pdf"
+
+    def get_pdf(self, kind: str, code: str, content_html: str) -> bytes:
+        path = self._path(kind, code, content_html)
+        with self._lock:
+            pending = self._pending.get(path)
+        if pending is not None:
+            # A failed pre-render is logged by its callback, render inline below.
+            pending.exception()
+
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            pass
+
+        content = print_html_to_pdf(content_html)
+        _write_atomic(path, content)
+        return content
+
+    def invalidate(self, kind: str, code: str) -> None:
+        shutil.rmtree(self._document_dir(kind, code), ignore_errors=True)
+
+    # ---------------------------------------------------------------------
+    # Background rendering
+    # ---------------------------------------------------------------------
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # A pool is not usable across a fork, e.g. of preloaded server workers, nor
+        # once one of its processes died, e.g. killed for running out of memory.
+        if (
+            self._executor is None
+            or self._executor_pid != os.getpid()
+            or self._executor._broken  # type: ignore[attr-defined]
+        ):
+            # Spawned workers import this module, which needs the app registry.
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.PDF_RENDER_WORKERS, initializer=django.setup
+            )
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _on_rendered(self, path: Path, future: Future[None]) -> None:
+        with self._lock:
+            self._pending.pop(path, None)
+        if future.exception() is not None:
+            logger.opt(exception=future.exception()).warning(
+                "Pre-rendering PDF '{}' failed.", path
+            )
+
+    def _submit(self, kind: str, code: str, render_html: Callable[[str], str]) -> None:
+        content_html = render_html(code)
+        path = self._path(kind, code, content_html)
+        with self._lock:
+            if path in self._pending or path.exists():
+                return
+            try:
+                future = self._get_executor().submit(
+                    _render_to_file, content_html, str(path), print_html_to_pdf
+                )
+            except BrokenProcessPool:
+                # The pool broke since it was checked, start a new one.
+                self._executor = None
+                future = self._get_executor().submit(
+                    _render_to_file, content_html, str(path), print_html_to_pdf
+                )
+            self._pending[path] = future
+        future.add_done_callback(lambda done: self._on_rendered(path, done))
+
+    def prerender(
+        self, kind: str, code: str, render_html: Callable[[str], str]
+    ) -> None:
+        """
+        Render the document in the background once the transaction commits.
+
+        ``render_html`` builds the document HTML from ``code``, it runs in this
+        process, right after the commit. Disabled with ``PDF_RENDER_WORKERS = 0``.
+        """
+        if settings.PDF_RENDER_WORKERS <= 0:
+            return
+
+        def submit() -> None:
+            try:
+                self._submit(kind, code, render_html)
+            except Exception:
+                logger.exception("Failed to pre-render PDF of {} '{}'.", kind, code)
+
+        transaction.on_commit(submit)
+
+    # ---------------------------------------------------------------------
+    # Signal handlers
+    # ---------------------------------------------------------------------
+
+    def _on_write(self, sender, instance, raw=False, **kwargs) -> None:
+        if raw:
+            return
+        kind, code = _CACHED_DOCUMENTS[sender], instance.code
+        transaction.on_commit(lambda: self.invalidate(kind, code))
+
+    def connect_signals(self) -> None:
+        for model in _CACHED_DOCUMENTS:
+            uid = f"warehouse.pdf_cache.{model.__name__}"
+            post_save.connect(self._on_write, sender=model, dispatch_uid=uid)
+            post_delete.connect(self._on_write, sender=model, dispatch_uid=uid)
+
+
+pdf_cache_service = PdfCacheService()
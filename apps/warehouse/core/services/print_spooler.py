@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import close_old_connections
+from django.utils import timezone
+from loguru import logger
+
+from apps.warehouse.core.exceptions import NotFoundException
+from apps.warehouse.core.zebra_printer import PrinterConnection
+from apps.warehouse.models.printer import Printer, PrintJob, PrintJobState
+
+# Delay before the first retry of a failed job, doubled with every further attempt.
+RETRY_DELAY = timedelta(seconds=5)
+MAX_RETRY_DELAY = timedelta(minutes=5)
+
+
+class PrintSpoolerService:
+    """
+    Queues print jobs in the database and sends them from a worker process.
+
+    ``enqueue`` only stores a ``PrintJob``, so requests never wait for a printer.
+    The worker (``manage.py run_print_spooler``) claims due jobs in queue order and
+    sends them over one persistent ``PrinterConnection`` per printer address.
+    A failed job is retried with an exponential delay until it has been attempted
+    ``settings.PRINT_JOB_MAX_ATTEMPTS`` times. Jobs of a printer that is backing
+    off are postponed without counting an attempt.
+    """
+
+    def __init__(self) -> None:
+        self._connections: dict[tuple[str, int], PrinterConnection] = {}
+
+    def enqueue(
+        self,
+        printer: Printer,
+        payload: str,
+        label_count: int = 1,
+        user: User | None = None,
+    ) -> PrintJob:
+        return PrintJob.objects.create(
+            printer=printer,
+            payload=payload,
+            label_count=label_count,
+            user=user if user is not None and user.is_authenticated else None,
+        )
+
+    @staticmethod
+    def get_job(job_id: int) -> PrintJob:
+        try:
+            return PrintJob.objects.select_related("printer").get(pk=job_id)
+        except PrintJob.DoesNotExist:
+            raise NotFoundException(f"Print job '{job_id}' not found")
+
+    # ---------------------------------------------------------------------
+    # Worker
+    # ---------------------------------------------------------------------
+
+    def _connection(self, printer: Printer) -> PrinterConnection:
+        key = (printer.ip or "", printer.port)
+        if key not in self._connections:
+            self._connections[key] = PrinterConnection(
+                printer.ip or "", printer.port, timeout=settings.PRINTER_TIMEOUT
+            )
+        return self._connections[key]
+
+    @staticmethod
+    def _claim() -> PrintJob | None:
+        """Mark the next due job as printing, ``None`` if there is none."""
+        while True:
+            now = timezone.now()
+            job = (
+                PrintJob.objects.filter(
+                    state=PrintJobState.QUEUED, next_attempt_at__lte=now
+                )
+                .select_related("printer")
+                .order_by("next_attempt_at", "id")
+                .first()
+            )
+            if job is None:
+                return None
+            # Another worker may have claimed the job since it was read.
+            if PrintJob.objects.filter(pk=job.pk, state=PrintJobState.QUEUED).update(
+                state=PrintJobState.PRINTING, changed=now
+            ):
+                job.state = PrintJobState.PRINTING
+                return job
+
+    @staticmethod
+    def _postpone(job: PrintJob, delay: float) -> None:
+        job.state = PrintJobState.QUEUED
+        job.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        job.save(update_fields=["state", "next_attempt_at", "changed"])
+
+    @staticmethod
+    def _fail(job: PrintJob, error: Exception, retry: bool = True) -> None:
+        job.attempts += 1
+        job.last_error = str(error)
+        if not retry or job.attempts >= settings.PRINT_JOB_MAX_ATTEMPTS:
+            job.state = PrintJobState.FAILED
+            logger.warning(f"Print job {job.pk} failed: {error}")
+        else:
+            job.state = PrintJobState.QUEUED
+            job.next_attempt_at = timezone.now() + min(
+                MAX_RETRY_DELAY, RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+        job.save(
+            update_fields=[
+                "attempts",
+                "last_error",
+                "state",
+                "next_attempt_at",
+                "changed",
+            ]
+        )
+
+    def process(self, job: PrintJob) -> None:
+        if not job.printer.ip:
+            error = ConnectionError(
+                f"Printer '{job.printer.code}' has no IP address configured"
+            )
+            self._fail(job, error, retry=False)
+            return
+
+        connection = self._connection(job.printer)
+        retry_in = connection.retry_in()
+        if retry_in:
+            self._postpone(job, retry_in)
+            return
+
+        try:
+            connection.send(job.payload)
+        except (ConnectionError, TimeoutError) as exc:
+            self._fail(job, exc)
+            return
+
+        job.attempts += 1
+        job.state = PrintJobState.PRINTED
+        job.printed_at = timezone.now()
+        job.last_error = None
+        job.save(
+            update_fields=["attempts", "state", "printed_at", "last_error", "changed"]
+        )
+
+    def drain(self) -> int:
+        """Process all due jobs, returns their number."""
+        processed = 0
+        while job := self._claim():
+            self.process(job)
+            processed += 1
+        return processed
+
+    @staticmethod
+    def recover() -> int:
+        """Queue jobs again that a stopped worker left in printing state."""
+        return PrintJob.objects.filter(state=PrintJobState.PRINTING).update(
+            state=PrintJobState.QUEUED, changed=timezone.now()
+        )
+
+    def close(self) -> None:
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
+
+    def run(
+        self, poll_interval: float = 1.0, stop: threading.Event | None = None
+    ) -> None:
+        """Drain due jobs every ``poll_interval`` seconds until ``stop`` is set."""
+        stop = stop or threading.Event()
+        recovered = self.recover()
+        if recovered:
+            logger.info(f"Re-queued {recovered} interrupted print jobs")
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                self.drain()
+                stop.wait(poll_interval)
+        finally:
+            self.close()
+
+
+print_spooler_service = PrintSpoolerService()
@@ -5,6 +5,7 @@ from django.db import transaction
 from django.db.models import Q, QuerySet
 
 from apps.warehouse.core.exceptions import ApiBaseException
+from apps.warehouse.core.services.label_templates import label_templates_service
 from apps.warehouse.core.schemas.printer import (
     PrinterCreateOrUpdateSchema,
     PrinterSchema,
@@ -16,7 +17,7 @@ from apps.warehouse.models.printer import Printer, UserAppSettings
 class PrintersService:
     @staticmethod
     def get_printers(search_term: str | None = None) -> QuerySet[Printer]:
-        qs = Printer.objects.all()
+        qs = Printer.objects.select_related("label_template")
         if search_term:
             qs = qs.filter(
                 Q(code__icontains=search_term) | Q(description__icontains=search_term)
@@ -37,6 +38,11 @@ class PrintersService:
             ip=params.ip,
             port=params.port,
             dpi=params.dpi,
+            label_template=(
+                label_templates_service.get_template(params.label_template_code)
+                if params.label_template_code
+                else None
+            ),
         )
         return printer_orm_to_schema(printer)
 
@@ -55,8 +61,21 @@ class PrintersService:
         printer.ip = params.ip
         printer.port = params.port
         printer.dpi = params.dpi
+        printer.label_template = (
+            label_templates_service.get_template(params.label_template_code)
+            if params.label_template_code
+            else None
+        )
         printer.save(
-            update_fields=["code", "description", "ip", "port", "dpi", "changed"]
+            update_fields=[
+                "code",
+                "description",
+                "ip",
+                "port",
+                "dpi",
+                "label_template",
+                "changed",
+            ]
         )
         return printer_orm_to_schema(printer)
 
@@ -93,7 +112,7 @@ class PrintersService:
     @staticmethod
     def get_default_printer(user: User) -> PrinterSchema | None:
         settings_obj = (
-            UserAppSettings.objects.select_related("default_printer")
+            UserAppSettings.objects.select_related("default_printer__label_template")
             .filter(user=user)
             .first()
         )
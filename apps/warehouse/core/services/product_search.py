@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import unicodedata
+from collections.abc import Iterable
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, QuerySet, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+
+from apps.warehouse.models.product import StockProduct
+
+SEARCH_TABLE = "warehouse_stockproduct_search"
+# The trigram tokenizer can only match terms of at least three characters.
+MIN_MATCH_LENGTH = 3
+
+_PRODUCT_TABLE = StockProduct._meta.db_table
+_COLUMNS = ("code", "name", "attributes")
+
+
+def normalize(text: str) -> str:
+    """Lowercase ``text`` and strip diacritics, so 'Šroub' and 'sroub' index the same."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+class ProductSearchService:
+    """
+    Full-text index of stock products backed by an SQLite FTS5 trigram table.
+
+    The table holds normalized code, name and attribute values keyed by the product
+    pk, so any substring of them is matched through the index and ranked by bm25.
+    Other database backends fall back to plain ``icontains`` filtering.
+    """
+
+    @staticmethod
+    def is_available() -> bool:
+        return connection.vendor == "sqlite"
+
+    @staticmethod
+    def _document(product: StockProduct) -> tuple[int, str, str, str]:
+        attributes = product.attributes or {}
+        attribute_text = " ".join(
+            f"{key} {value}" for key, value in attributes.items() if value is not None
+        )
+        return (
+            product.pk,
+            normalize(product.code),
+            normalize(product.name),
+            normalize(attribute_text),
+        )
+
+    def index(self, products: Iterable[StockProduct]) -> None:
+        if not self.is_available():
+            return
+        documents = [self._document(product) for product in products]
+        if not documents:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+                [(document[0],) for document in documents],
+            )
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(_COLUMNS)}) "
+                "VALUES (%s, %s, %s, %s)",
+                documents,
+            )
+
+    def remove(self, product_ids: Iterable[int]) -> None:
+        if not self.is_available():
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+                [(product_id,) for product_id in product_ids],
+            )
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+        """Re-index every product from scratch, returns the number of indexed products."""
+        if not self.is_available():
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+        count = 0
+        batch: list[StockProduct] = []
+        products = StockProduct.objects.only("code", "name", "attributes")
+        for product in products.iterator(chunk_size=batch_size):
+            batch.append(product)
+            if len(batch) >= batch_size:
+                self.index(batch)
+                count += len(batch)
+                batch = []
+        self.index(batch)
+        return count + len(batch)
+
+    def search(
+        self, queryset: QuerySet[StockProduct], search_term: str
+    ) -> QuerySet[StockProduct]:
+        """Narrow ``queryset`` to products matching ``search_term``, best matches first."""
+        if not self.is_available():
+            return queryset.filter(
+                Q(code__icontains=search_term) | Q(name__icontains=search_term)
+            )
+
+        terms = normalize(search_term).split()
+        if not terms:
+            return queryset
+        exact_code = Case(
+            When(code__iexact=search_term.strip(), then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+
+        matchable = [term for term in terms if len(term) >= MIN_MATCH_LENGTH]
+        if len(matchable) != len(terms):
+            # Short terms can't use the trigram index, scan the (already normalized) table.
+            column_match = " OR ".join(f"{column} LIKE %s" for column in _COLUMNS)
+            where = " AND ".join(f"({column_match})" for _ in terms)
+            params = [f"%{term}%" for term in terms for _ in _COLUMNS]
+            return (
+                queryset.filter(
+                    pk__in=RawSQL(
+                        f"SELECT rowid FROM {SEARCH_TABLE} WHERE {where}", params
+                    )
+                )
+                .annotate(search_exact=exact_code)
+                .order_by("search_exact", "code")
+            )
+
+        match = " ".join(_phrase(term) for term in matchable)
+        rank = RawSQL(
+            f"SELECT rank FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND rowid = {_PRODUCT_TABLE}.id",
+            (match,),
+        )
+        return (
+            queryset.filter(
+                pk__in=RawSQL(
+                    f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s",
+                    (match,),
+                )
+            )
+            .annotate(search_exact=exact_code, search_rank=rank)
+            .order_by("search_exact", "search_rank", "code")
+        )
+
+    # ---------------------------------------------------------------------
+    # Signal handlers
+    # ---------------------------------------------------------------------
+
+    def _on_post_save(self, sender, instance, **kwargs) -> None:
+        self.index([instance])
+
+    def _on_post_delete(self, sender, instance, **kwargs) -> None:
+        self.remove([instance.pk])
+
+    def connect_signals(self) -> None:
+        uid = "warehouse.product_search"
+        post_save.connect(self._on_post_save, sender=StockProduct, dispatch_uid=uid)
+        post_delete.connect(self._on_post_delete, sender=StockProduct, dispatch_uid=uid)
+
+
+product_search_service = ProductSearchService()
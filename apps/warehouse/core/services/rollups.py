@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+
+from apps.warehouse.models.analytics import (
+    DELETED_ORDER_STATE,
+    MovementDailyRollup,
+    OrderDailyRollup,
+    RollupOrderKind,
+    RollupValueKind,
+    ValueDailyRollup,
+)
+from apps.warehouse.models.orders import (
+    InboundOrder,
+    InboundOrderState,
+    OutboundOrder,
+    OutboundOrderState,
+)
+from apps.warehouse.models.warehouse import (
+    InboundWarehouseOrder,
+    InboundWarehouseOrderState,
+    OutboundWarehouseOrder,
+    OutboundWarehouseOrderState,
+    WarehouseMovement,
+)
+
+ORDER_KINDS: dict[type[models.Model], RollupOrderKind] = {
+    InboundOrder: RollupOrderKind.INBOUND_ORDER,
+    OutboundOrder: RollupOrderKind.OUTBOUND_ORDER,
+    InboundWarehouseOrder: RollupOrderKind.INBOUND_WAREHOUSE_ORDER,
+    OutboundWarehouseOrder: RollupOrderKind.OUTBOUND_WAREHOUSE_ORDER,
+}
+
+# States in which an order no longer counts as active.
+CLOSED_ORDER_STATES: dict[RollupOrderKind, tuple[int, ...]] = {
+    RollupOrderKind.INBOUND_ORDER: (
+        InboundOrderState.DRAFT,
+        InboundOrderState.COMPLETED,
+        InboundOrderState.CANCELLED,
+    ),
+    RollupOrderKind.OUTBOUND_ORDER: (
+        OutboundOrderState.DRAFT,
+        OutboundOrderState.COMPLETED,
+        OutboundOrderState.CANCELLED,
+        OutboundOrderState.COMPLETED_PAID,
+        OutboundOrderState.SENT,
+        OutboundOrderState.INVOICED,
+        OutboundOrderState.WAITING_FOR_PAYMENT,
+    ),
+    RollupOrderKind.INBOUND_WAREHOUSE_ORDER: (
+        InboundWarehouseOrderState.IN_TRANSIT,
+        InboundWarehouseOrderState.COMPLETED,
+        InboundWarehouseOrderState.CANCELLED,
+    ),
+    RollupOrderKind.OUTBOUND_WAREHOUSE_ORDER: (
+        OutboundWarehouseOrderState.COMPLETED,
+        OutboundWarehouseOrderState.CANCELLED,
+    ),
+}
+
+# States in which an order has been finished, the subset of the closed states
+# an order doesn't start out in.
+TERMINAL_ORDER_STATES: dict[RollupOrderKind, tuple[int, ...]] = {
+    RollupOrderKind.INBOUND_ORDER: (
+        InboundOrderState.COMPLETED,
+        InboundOrderState.CANCELLED,
+    ),
+    RollupOrderKind.OUTBOUND_ORDER: (
+        OutboundOrderState.COMPLETED,
+        OutboundOrderState.CANCELLED,
+        OutboundOrderState.COMPLETED_PAID,
+        OutboundOrderState.SENT,
+        OutboundOrderState.INVOICED,
+        OutboundOrderState.WAITING_FOR_PAYMENT,
+    ),
+    RollupOrderKind.INBOUND_WAREHOUSE_ORDER: (
+        InboundWarehouseOrderState.COMPLETED,
+        InboundWarehouseOrderState.CANCELLED,
+    ),
+    RollupOrderKind.OUTBOUND_WAREHOUSE_ORDER: (
+        OutboundWarehouseOrderState.COMPLETED,
+        OutboundWarehouseOrderState.CANCELLED,
+    ),
+}
+
+# Order states counted as received / shipped, per order model.
+VALUE_STATES: dict[type[models.Model], tuple[RollupValueKind, tuple[int, ...]]] = {
+    InboundOrder: (RollupValueKind.RECEIPT, (InboundOrderState.COMPLETED,)),
+    OutboundOrder: (
+        RollupValueKind.SHIPMENT,
+        (
+            OutboundOrderState.SENT,
+            OutboundOrderState.INVOICED,
+            OutboundOrderState.WAITING_FOR_PAYMENT,
+            OutboundOrderState.COMPLETED,
+            OutboundOrderState.COMPLETED_PAID,
+        ),
+    ),
+}
+
+_STATE_ATTR = "_rollup_state"
+ZERO = Decimal(0)
+
+
+def _local_day(moment: datetime | None = None) -> date:
+    return timezone.localdate(moment or timezone.now())
+
+
+def _bump(model: type[models.Model], keys: dict, **deltas) -> None:
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+    row, _ = model._default_manager.get_or_create(**keys)
+    model._default_manager.filter(pk=row.pk).update(
+        **{name: F(name) + value for name, value in deltas.items()}
+    )
+
+
+class AnalyticsRollupService:
+    """
+    Daily rollups of order activity, stock movements and received/shipped value.
+
+    The rollup rows are adjusted in the transaction of the write they describe,
+    so dashboards read a handful of rows per day instead of scanning the raw
+    history. ``rebuild`` recomputes them from the raw tables, it uses the last
+    change of an order as the day it reached its current state.
+    """
+
+    # ---------------------------------------------------------------------
+    # Incremental updates
+    # ---------------------------------------------------------------------
+
+    @staticmethod
+    def _order_value(order: models.Model) -> Decimal:
+        return order.items.aggregate(total=Sum("total_price"))["total"] or ZERO  # type: ignore[attr-defined]
+
+    def _record_value(
+        self, order: models.Model, previous: int | None, current: int | None
+    ) -> None:
+        if type(order) not in VALUE_STATES:
+            return
+        kind, states = VALUE_STATES[type(order)]
+        was_counted = previous in states
+        is_counted = current in states
+        if was_counted == is_counted:
+            return
+        sign = 1 if is_counted else -1
+        _bump(
+            ValueDailyRollup,
+            {"day": _local_day(), "kind": kind, "currency": order.currency},  # type: ignore[attr-defined]
+            order_count=sign,
+            total_value=sign * self._order_value(order),
+        )
+
+    def record_order_transition(
+        self, order: models.Model, previous: int | None, current: int
+    ) -> None:
+        """Account for ``order`` moving from ``previous`` (``None`` if new) to ``current``."""
+        kind = ORDER_KINDS[type(order)]
+        day = _local_day()
+        if previous is not None:
+            _bump(
+                OrderDailyRollup,
+                {"day": day, "kind": kind, "state": previous},
+                left_count=1,
+            )
+        _bump(
+            OrderDailyRollup,
+            {"day": day, "kind": kind, "state": current},
+            created_count=int(previous is None),
+            entered_count=1,
+        )
+        if current != DELETED_ORDER_STATE:
+            self._record_value(order, previous, current)
+
+    @staticmethod
+    def record_movement(movement: WarehouseMovement, sign: int = 1) -> None:
+        day = _local_day(movement.moved_at)
+        for location_id, field in (
+            (movement.location_to_id, "quantity_in"),
+            (movement.location_from_id, "quantity_out"),
+        ):
+            if location_id is None:
+                continue
+            _bump(
+                MovementDailyRollup,
+                {
+                    "day": day,
+                    "stock_product_id": movement.stock_product_id,
+                    "location_id": location_id,
+                },
+                **{field: sign * movement.amount, "movement_count": sign},
+            )
+
+    # ---------------------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------------------
+
+    @staticmethod
+    def order_rows(kind: RollupOrderKind, end: date):
+        return OrderDailyRollup.objects.filter(kind=kind, day__lte=end)
+
+    @staticmethod
+    def movement_rows(
+        start: date,
+        end: date,
+        stock_product_id: int | None = None,
+        location_id: int | None = None,
+    ):
+        rows = MovementDailyRollup.objects.filter(day__gte=start, day__lte=end)
+        if stock_product_id is not None:
+            rows = rows.filter(stock_product_id=stock_product_id)
+        if location_id is not None:
+            rows = rows.filter(location_id=location_id)
+        return rows
+
+    @staticmethod
+    def value_rows(start: date, end: date):
+        return ValueDailyRollup.objects.filter(day__gte=start, day__lte=end)
+
+    # ---------------------------------------------------------------------
+    # Backfill
+    # ---------------------------------------------------------------------
+
+    @staticmethod
+    def _per_day(queryset, field: str):
+        return queryset.annotate(
+            day=TruncDate(field, tzinfo=timezone.get_current_timezone())
+        )
+
+    def _rebuild_orders(self) -> int:
+        rows: dict[tuple, OrderDailyRollup] = {}
+
+        def row(day: date, kind: str, state: int) -> OrderDailyRollup:
+            key = (day, kind, state)
+            if key not in rows:
+                rows[key] = OrderDailyRollup(day=day, kind=kind, state=state)
+            return rows[key]
+
+        for model, kind in ORDER_KINDS.items():
+            created = (
+                self._per_day(model._default_manager.all(), "created")
+                .values("day", "state")
+                .annotate(count=Count("id"))
+            )
+            for entry in created:
+                row(entry["day"], kind, entry["state"]).created_count += entry["count"]
+
+            closed = (
+                self._per_day(
+                    model._default_manager.filter(state__in=CLOSED_ORDER_STATES[kind]),
+                    "changed",
+                )
+                .values("day", "state")
+                .annotate(count=Count("id"))
+            )
+            for entry in closed:
+                row(entry["day"], kind, entry["state"]).entered_count += entry["count"]
+
+        OrderDailyRollup.objects.all().delete()
+        OrderDailyRollup.objects.bulk_create(rows.values(), batch_size=1000)
+        return len(rows)
+
+    def _rebuild_movements(self) -> int:
+        rows: dict[tuple, MovementDailyRollup] = {}
+        for location_field, quantity_field in (
+            ("location_to_id", "quantity_in"),
+            ("location_from_id", "quantity_out"),
+        ):
+            grouped = (
+                self._per_day(
+                    WarehouseMovement.objects.filter(
+                        **{f"{location_field}__isnull": False}
+                    ),
+                    "moved_at",
+                )
+                .values("day", "stock_product_id", location_field)
+                .annotate(quantity=Sum("amount"), count=Count("id"))
+            )
+            for entry in grouped:
+                key = (entry["day"], entry["stock_product_id"], entry[location_field])
+                if key not in rows:
+                    rows[key] = MovementDailyRollup(
+                        day=key[0], stock_product_id=key[1], location_id=key[2]
+                    )
+                setattr(rows[key], quantity_field, entry["quantity"])
+                rows[key].movement_count += entry["count"]
+
+        MovementDailyRollup.objects.all().delete()
+        MovementDailyRollup.objects.bulk_create(rows.values(), batch_size=1000)
+        return len(rows)
+
+    def _rebuild_values(self) -> int:
+        rows: list[ValueDailyRollup] = []
+        for model, (kind, states) in VALUE_STATES.items():
+            grouped = (
+                self._per_day(
+                    model._default_manager.filter(state__in=states), "changed"
+                )
+                .values("day", "currency")
+                .annotate(
+                    count=Count("id", distinct=True), value=Sum("items__total_price")
+                )
+            )
+            rows.extend(
+                ValueDailyRollup(
+                    day=entry["day"],
+                    kind=kind,
+                    currency=entry["currency"],
+                    order_count=entry["count"],
+                    total_value=entry["value"] or ZERO,
+                )
+                for entry in grouped
+            )
+
+        ValueDailyRollup.objects.all().delete()
+        ValueDailyRollup.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    @transaction.atomic
+    def rebuild(self) -> dict[str, int]:
+        """Recompute all rollups from the raw tables, returns row counts per rollup."""
+        return {
+            "orders": self._rebuild_orders(),
+            "movements": self._rebuild_movements(),
+            "values": self._rebuild_values(),
+        }
+
+    # ---------------------------------------------------------------------
+    # Signal handlers
+    # ---------------------------------------------------------------------
+
+    @staticmethod
+    def _on_order_post_init(sender, instance, **kwargs) -> None:
+        setattr(instance, _STATE_ATTR, instance.__dict__.get("state"))
+
+    def _on_order_post_save(self, sender, instance, created, raw=False, **kwargs):
+        if raw:
+            return
+        previous = None if created else getattr(instance, _STATE_ATTR, None)
+        setattr(instance, _STATE_ATTR, instance.state)
+        if created or previous != instance.state:
+            self.record_order_transition(instance, previous, instance.state)
+
+    def _on_order_post_delete(self, sender, instance, **kwargs) -> None:
+        self.record_order_transition(
+            instance, getattr(instance, _STATE_ATTR, None), DELETED_ORDER_STATE
+        )
+
+    def _on_movement_post_save(self, sender, instance, created, raw=False, **kwargs):
+        # Movements are append-only records, only their creation is accounted.
+        if created and not raw:
+            self.record_movement(instance)
+
+    def _on_movement_post_delete(self, sender, instance, **kwargs) -> None:
+        self.record_movement(instance, sign=-1)
+
+    def connect_signals(self) -> None:
+        for model in ORDER_KINDS:
+            uid = f"warehouse.rollups.{model.__name__}"
+            post_init.connect(self._on_order_post_init, sender=model, dispatch_uid=uid)
+            post_save.connect(self._on_order_post_save, sender=model, dispatch_uid=uid)
+            post_delete.connect(
+                self._on_order_post_delete, sender=model, dispatch_uid=uid
+            )
+        uid = "warehouse.rollups.WarehouseMovement"
+        post_save.connect(
+            self._on_movement_post_save, sender=WarehouseMovement, dispatch_uid=uid
+        )
+        post_delete.connect(
+            self._on_movement_post_delete, sender=WarehouseMovement, dispatch_uid=uid
+        )
+
+
+rollup_service = AnalyticsRollupService()
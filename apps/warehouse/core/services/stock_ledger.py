@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from decimal import Decimal
+from typing import Any
+
+from django.db import models, transaction
+from django.db.models import Sum
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+
+from apps.warehouse.core.schemas.warehouse import ProductWarehouseAvailability
+from apps.warehouse.models.orders import (
+    InboundOrder,
+    InboundOrderItem,
+    InboundOrderState,
+    OutboundOrder,
+    OutboundOrderItem,
+    OutboundOrderState,
+)
+from apps.warehouse.models.product import StockProduct
+from apps.warehouse.models.warehouse import (
+    OutboundWarehouseOrderItem,
+    ProductStockLedger,
+    WarehouseItem,
+)
+
+ZERO = Decimal(0)
+
+INCOMING_INBOUND_ORDER_STATES = (
+    InboundOrderState.DRAFT,
+    InboundOrderState.SUBMITTED,
+    InboundOrderState.RECEIVING,
+)
+BOOKED_OUTBOUND_ORDER_STATES = (
+    OutboundOrderState.SUBMITTED,
+    OutboundOrderState.PICKING,
+    OutboundOrderState.PACKING,
+    OutboundOrderState.SHIPPING,
+)
+
+ON_HAND = "on_hand_amount"
+BOOKED = "booked_amount"
+INCOMING = "incoming_amount"
+LEDGER_FIELDS = (ON_HAND, BOOKED, INCOMING)
+
+# Fields whose change can move a product's availability, per tracked model.
+_TRACKED_FIELDS: dict[type[models.Model], tuple[str, ...]] = {
+    WarehouseItem: ("stock_product_id", "amount"),
+    OutboundWarehouseOrderItem: ("stock_product_id", "warehouse_item_id"),
+    InboundOrderItem: ("stock_product_id", "amount", "order_id"),
+    OutboundOrderItem: ("stock_product_id", "amount", "order_id"),
+    InboundOrder: ("state",),
+    OutboundOrder: ("state",),
+}
+_LEDGER_FIELD_BY_MODEL: dict[type[models.Model], str] = {
+    WarehouseItem: ON_HAND,
+    OutboundWarehouseOrderItem: ON_HAND,
+    InboundOrderItem: INCOMING,
+    OutboundOrderItem: BOOKED,
+    InboundOrder: INCOMING,
+    OutboundOrder: BOOKED,
+}
+_SNAPSHOT_ATTR = "_stock_ledger_snapshot"
+
+
+def _normalize(value: Decimal) -> Decimal:
+    """Drop the trailing zeros of the stored scale without switching to exponent notation."""
+    if value == value.to_integral_value():
+        return value.quantize(Decimal(1))
+    return value.normalize()
+
+
+def _grouped_totals(queryset: models.QuerySet) -> dict[int, Decimal]:
+    return {
+        row["stock_product_id"]: row["total"] or ZERO
+        for row in queryset.values("stock_product_id").annotate(total=Sum("amount"))
+    }
+
+
+class StockLedgerService:
+    @staticmethod
+    def on_hand_totals(product_ids: Iterable[int] | None = None) -> dict[int, Decimal]:
+        queryset = WarehouseItem.physical_stock.all()
+        if product_ids is not None:
+            queryset = queryset.filter(stock_product_id__in=product_ids)
+        return _grouped_totals(queryset.order_by())
+
+    @staticmethod
+    def booked_totals(product_ids: Iterable[int] | None = None) -> dict[int, Decimal]:
+        queryset = OutboundOrderItem.objects.filter(
+            order__state__in=BOOKED_OUTBOUND_ORDER_STATES
+        )
+        if product_ids is not None:
+            queryset = queryset.filter(stock_product_id__in=product_ids)
+        return _grouped_totals(queryset.order_by())
+
+    @staticmethod
+    def incoming_totals(
+        product_ids: Iterable[int] | None = None,
+    ) -> dict[int, Decimal]:
+        queryset = InboundOrderItem.objects.filter(
+            order__state__in=INCOMING_INBOUND_ORDER_STATES
+        )
+        if product_ids is not None:
+            queryset = queryset.filter(stock_product_id__in=product_ids)
+        return _grouped_totals(queryset.order_by())
+
+    def _totals_for(
+        self, field: str
+    ) -> Callable[[Iterable[int] | None], dict[int, Decimal]]:
+        return {
+            ON_HAND: self.on_hand_totals,
+            BOOKED: self.booked_totals,
+            INCOMING: self.incoming_totals,
+        }[field]
+
+    @staticmethod
+    def to_schema(ledger: ProductStockLedger | None) -> ProductWarehouseAvailability:
+        if ledger is None:
+            return ProductWarehouseAvailability(
+                total_amount=ZERO, available_amount=ZERO, incoming_amount=ZERO
+            )
+        return ProductWarehouseAvailability(
+            total_amount=_normalize(ledger.on_hand_amount),
+            available_amount=_normalize(ledger.available_amount),
+            incoming_amount=_normalize(ledger.incoming_amount),
+        )
+
+    def get_availability(self, stock_product_code: str) -> ProductWarehouseAvailability:
+        ledger = ProductStockLedger.objects.filter(
+            stock_product__code=stock_product_code
+        ).first()
+        return self.to_schema(ledger)
+
+    def get_bulk_availability(
+        self, stock_product_codes: Iterable[str]
+    ) -> dict[str, ProductWarehouseAvailability]:
+        """Availability of many products keyed by code, unknown codes are left out."""
+        products = StockProduct.objects.filter(
+            code__in=set(stock_product_codes)
+        ).select_related("stock_ledger")
+        return {
+            product.code: self.to_schema(getattr(product, "stock_ledger", None))
+            for product in products
+        }
+
+    def refresh(
+        self,
+        product_ids: Iterable[int | None],
+        fields: Iterable[str] = LEDGER_FIELDS,
+    ) -> None:
+        """Recompute the given ledger fields of the given products from the source rows."""
+        ids = {product_id for product_id in product_ids if product_id is not None}
+        if not ids:
+            return
+        fields = tuple(fields)
+
+        with transaction.atomic():
+            rows = list(
+                ProductStockLedger.objects.select_for_update().filter(
+                    stock_product_id__in=ids
+                )
+            )
+            missing = ids - {row.stock_product_id for row in rows}
+            if missing:
+                ProductStockLedger.objects.bulk_create(
+                    [ProductStockLedger(stock_product_id=pk) for pk in missing],
+                    ignore_conflicts=True,
+                )
+                rows = list(
+                    ProductStockLedger.objects.select_for_update().filter(
+                        stock_product_id__in=ids
+                    )
+                )
+                # Fresh rows start at zero, every component has to be filled in.
+                fields = LEDGER_FIELDS
+
+            totals = {field: self._totals_for(field)(ids) for field in fields}
+            now = timezone.now()
+            for row in rows:
+                for field in fields:
+                    setattr(row, field, totals[field].get(row.stock_product_id, ZERO))
+                row.available_amount = row.on_hand_amount - row.booked_amount
+                row.changed = now
+
+            ProductStockLedger.objects.bulk_update(
+                rows, [*fields, "available_amount", "changed"]
+            )
+
+    def _compute_all(self) -> dict[int, dict[str, Decimal]]:
+        totals = {field: self._totals_for(field)(None) for field in LEDGER_FIELDS}
+        expected: dict[int, dict[str, Decimal]] = {}
+        for product_id in StockProduct.objects.values_list("pk", flat=True):
+            values = {
+                field: totals[field].get(product_id, ZERO) for field in LEDGER_FIELDS
+            }
+            values["available_amount"] = values[ON_HAND] - values[BOOKED]
+            expected[product_id] = values
+        return expected
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+        """Recompute the whole ledger from scratch, returns the number of rows written."""
+        expected = self._compute_all()
+        with transaction.atomic():
+            ProductStockLedger.objects.bulk_create(
+                [
+                    ProductStockLedger(stock_product_id=product_id, **values)
+                    for product_id, values in expected.items()
+                ],
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["stock_product"],
+                update_fields=[*LEDGER_FIELDS, "available_amount", "changed"],
+            )
+        return len(expected)
+
+    def verify(self) -> list[str]:
+        """Compare the ledger with live aggregates, returns a description of every drift."""
+        expected = self._compute_all()
+        stored = {row.stock_product_id: row for row in ProductStockLedger.objects.all()}
+        codes = dict(StockProduct.objects.values_list("pk", "code"))
+
+        problems = []
+        for product_id, values in expected.items():
+            row = stored.get(product_id)
+            for field, value in values.items():
+                actual = getattr(row, field) if row is not None else ZERO
+                if actual != value:
+                    problems.append(
+                        f"{codes[product_id]}: {field} is {actual}, expected {value}"
+                    )
+        return problems
+
+    # ---------------------------------------------------------------------
+    # Signal handlers
+    # ---------------------------------------------------------------------
+
+    @staticmethod
+    def _snapshot(instance: models.Model) -> tuple[Any, ...]:
+        return tuple(
+            instance.__dict__.get(name) for name in _TRACKED_FIELDS[type(instance)]
+        )
+
+    def _on_post_init(self, sender, instance, **kwargs) -> None:
+        setattr(instance, _SNAPSHOT_ATTR, self._snapshot(instance))
+
+    def _on_post_save(
+        self, sender, instance, created, raw=False, update_fields=None, **kwargs
+    ) -> None:
+        if raw:
+            return
+
+        tracked = _TRACKED_FIELDS[sender]
+        previous = getattr(instance, _SNAPSHOT_ATTR, None)
+        current = self._snapshot(instance)
+        setattr(instance, _SNAPSHOT_ATTR, current)
+
+        if update_fields is not None:
+            attnames = {sender._meta.get_field(name).attname for name in update_fields}
+            if attnames.isdisjoint(tracked):
+                return
+        elif not created and previous == current:
+            return
+
+        field = _LEDGER_FIELD_BY_MODEL[sender]
+        if sender in (InboundOrder, OutboundOrder):
+            product_ids = set(instance.items.values_list("stock_product_id", flat=True))
+        else:
+            product_ids = {instance.stock_product_id}
+            if previous is not None:
+                product_ids.add(previous[tracked.index("stock_product_id")])
+        self.refresh(product_ids, fields=(field,))
+
+    def _on_post_delete(self, sender, instance, **kwargs) -> None:
+        if sender is OutboundWarehouseOrderItem and instance.warehouse_item_id is None:
+            return
+        self.refresh(
+            {instance.stock_product_id}, fields=(_LEDGER_FIELD_BY_MODEL[sender],)
+        )
+
+    def connect_signals(self) -> None:
+        for model in _TRACKED_FIELDS:
+            uid = f"warehouse.stock_ledger.{model.__name__}"
+            post_init.connect(self._on_post_init, sender=model, dispatch_uid=uid)
+            post_save.connect(self._on_post_save, sender=model, dispatch_uid=uid)
+            if model not in (InboundOrder, OutboundOrder):
+                # Order deletions cascade to their items, which refresh the ledger.
+                post_delete.connect(
+                    self._on_post_delete, sender=model, dispatch_uid=uid
+                )
+
+
+stock_ledger_service = StockLedgerService()
@@ -1,11 +1,12 @@
 import uuid
+from collections import defaultdict
+from collections.abc import Iterable
 from decimal import Decimal
 from typing import cast
 
-from django.contrib.auth.models import User
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
-from django.db.models import QuerySet, Sum
+from django.db import models, transaction
+from django.db.models import Prefetch, QuerySet, Sum
 from django.utils import timezone
 
 from apps.warehouse.core.exceptions import (
@@ -35,9 +36,16 @@ from apps.warehouse.core.schemas.warehouse import (
     MoveItemRequest,
 )
 from apps.warehouse.core.services.audit import audit_service
+from apps.warehouse.core.services.barcode_resolution import barcode_resolution_cache
+from apps.warehouse.core.services.lookup_cache import lookup_cache_service
 from apps.warehouse.core.services.manufacturing import manufacturing_orders_service
 from apps.warehouse.core.services.orders import inbound_orders_service
 from apps.warehouse.core.services.outbound_orders import outbound_orders_service
+from apps.warehouse.core.services.stock_ledger import (
+    BOOKED_OUTBOUND_ORDER_STATES,
+    INCOMING_INBOUND_ORDER_STATES,
+    stock_ledger_service,
+)
 from apps.warehouse.core.services.warehouse_order_factory import (
     WarehouseOrderKind,
     create_warehouse_order,
@@ -56,7 +64,6 @@ from apps.warehouse.models.barcode import BarcodeType, Barcode
 from apps.warehouse.models.orders import (
     InboundOrder,
     InboundOrderState,
-    OutboundOrderState,
     CreditNoteState,
     CreditNoteToSupplier,
     CreditNoteToSupplierItem,
@@ -77,6 +84,27 @@ from apps.warehouse.models.warehouse import (
     Batch,
 )
 
+SCAN_MATCHING_ITEMS_LIMIT = 20
+SCAN_ITEM_RELATED = (
+    "stock_product",
+    "stock_product__unit_of_measure",
+    "location",
+    "location__warehouse",
+    "batch",
+    "package_type",
+    "package_type__unit_of_measure",
+)
+# Reverse relation from a scanned entity to its warehouse items
+SCAN_ITEMS_RELATION: dict[type[models.Model], str] = {
+    Batch: "inventory",
+    WarehouseLocation: "items",
+    StockProduct: "warehouseitem_set",
+}
+SCAN_ENTITY_RELATED: dict[type[models.Model], tuple[str, ...]] = {
+    WarehouseLocation: ("warehouse",),
+    StockProduct: ("type", "unit_of_measure", "group"),
+}
+
 
 def generate_warehouse_item_code() -> str:
     return str(uuid.uuid4())[:13]
@@ -121,7 +149,9 @@ class MovementService:
             location_from = item.location
             amount = amount or item.amount
             if isinstance(new_location_or_code, str):
-                new_location = WarehouseLocation.objects.get(code=new_location_or_code)
+                new_location = lookup_cache_service.get(
+                    WarehouseLocation, new_location_or_code
+                )
             else:
                 new_location = new_location_or_code
 
@@ -285,9 +315,7 @@ class MovementService:
                     amount=amount,
                     item=movement_item,
                     batch=movement_batch,
-                    worker=User.objects.get(pk=context.user_id)
-                    if context.user_id
-                    else None,
+                    worker=context.user,
                 )
 
 
@@ -350,163 +378,129 @@ class WarehouseService:
         )
 
     @staticmethod
-    def barcode_lookup(
-        barcode: str, product_code: str | None = None
-    ) -> BarcodeLookupResponse:
+    def _scan_items_queryset(
+        product_code: str | None = None,
+    ) -> QuerySet[WarehouseItem]:
+        items = WarehouseItem.physical_stock.select_related(*SCAN_ITEM_RELATED)
+        if product_code:
+            items = items.filter(stock_product__code=product_code)
+        return items.order_by("pk")
+
+    @staticmethod
+    def _fetch_scanned_entities(
+        model_class: type[models.Model],
+        object_ids: Iterable[int],
+        product_code: str | None = None,
+    ) -> dict[int, models.Model]:
         """
-        Look up a barcode and identify what entity it represents.
-        Returns details about the scanned entity and matching warehouse items if applicable.
+        Fetch the scanned entities of one type, each with its matching physical stock
+        items prefetched into ``scan_items``.
         """
-        # Try to find the barcode in the database
-        barcode_obj = (
-            Barcode.objects.select_related("content_type").filter(code=barcode).first()
-        )
-
-        if not barcode_obj:
-            return BarcodeLookupResponse(
-                found=False,
-                entity_type=None,
-                warehouse_item=None,
-                batch=None,
-                location=None,
-                product=None,
-                matching_items=None,
-            )
-
-        # Determine what type of entity this barcode points to
-        content_type = barcode_obj.content_type
-        model_class = content_type.model_class()
-
-        if not model_class:
-            return BarcodeLookupResponse(
-                found=False,
-                entity_type=None,
-                warehouse_item=None,
-                batch=None,
-                location=None,
-                product=None,
-                matching_items=None,
+        if model_class is WarehouseItem:
+            queryset = WarehouseItem.physical_stock.select_related(*SCAN_ITEM_RELATED)
+        elif model_class in SCAN_ITEMS_RELATION:
+            items = WarehouseService._scan_items_queryset(
+                # A scanned product is already the filter
+                None if model_class is StockProduct else product_code
             )
-
-        # Fetch the actual object
-        entity = model_class.objects.filter(pk=barcode_obj.object_id).first()  # type: ignore[attr-defined]
-
-        if not entity:
-            return BarcodeLookupResponse(
-                found=False,
-                entity_type=None,
-                warehouse_item=None,
-                batch=None,
-                location=None,
-                product=None,
-                matching_items=None,
+            queryset = model_class._default_manager.select_related(
+                *SCAN_ENTITY_RELATED.get(model_class, ())
+            ).prefetch_related(
+                Prefetch(
+                    SCAN_ITEMS_RELATION[model_class],
+                    queryset=items[:SCAN_MATCHING_ITEMS_LIMIT],
+                    to_attr="scan_items",
+                )
             )
+        else:
+            queryset = model_class._default_manager.all()
+        return queryset.in_bulk(list(object_ids))
 
-        # Build response based on entity type
-        response = BarcodeLookupResponse(
-            found=True,
-            entity_type=None,
-            warehouse_item=None,
-            batch=None,
-            location=None,
-            product=None,
-            matching_items=None,
-        )
+    @staticmethod
+    def _scan_response(entity: models.Model | None) -> BarcodeLookupResponse:
+        if entity is None:
+            return BarcodeLookupResponse(found=False)
 
         if isinstance(entity, WarehouseItem):
-            # Check if item is already assigned to an outbound order
-            item = (
-                WarehouseItem.physical_stock.select_related(
-                    "stock_product",
-                    "stock_product__unit_of_measure",
-                    "location",
-                    "location__warehouse",
-                    "batch",
-                    "package_type",
-                    "package_type__unit_of_measure",
-                )
-                .filter(pk=entity.pk)
-                .first()
+            return BarcodeLookupResponse(
+                found=True,
+                entity_type="warehouse_item",
+                warehouse_item=warehouse_item_orm_to_schema(entity),
             )
-            if item:
-                response.entity_type = "warehouse_item"
-                response.warehouse_item = warehouse_item_orm_to_schema(item)
-            else:
-                # Item is already assigned or doesn't exist in physical stock
-                return BarcodeLookupResponse(
-                    found=False,
-                    entity_type=None,
-                    warehouse_item=None,
-                    batch=None,
-                    location=None,
-                    product=None,
-                    matching_items=None,
-                )
 
-        elif isinstance(entity, Batch):
+        response = BarcodeLookupResponse(found=True)
+        if isinstance(entity, Batch):
             response.entity_type = "batch"
             response.batch = batch_orm_to_schema(entity)
-
-            # Find matching warehouse items with this batch (use physical_stock to include putaway)
-            items_qs = WarehouseItem.physical_stock.select_related(
-                "stock_product",
-                "stock_product__unit_of_measure",
-                "location",
-                "location__warehouse",
-                "batch",
-                "package_type",
-                "package_type__unit_of_measure",
-            ).filter(batch=entity)
-
-            if product_code:
-                items_qs = items_qs.filter(stock_product__code=product_code)
-
-            response.matching_items = [
-                warehouse_item_orm_to_schema(item) for item in items_qs[:20]
-            ]
-
         elif isinstance(entity, WarehouseLocation):
             response.entity_type = "location"
             response.location = location_orm_to_schema(entity)
+        elif isinstance(entity, StockProduct):
+            response.entity_type = "product"
+            response.product = product_orm_to_schema(entity)
+        else:
+            return response
 
-            # Find available warehouse items at this location (use physical_stock to include putaway)
-            items_qs = WarehouseItem.physical_stock.select_related(
-                "stock_product",
-                "stock_product__unit_of_measure",
-                "location",
-                "location__warehouse",
-                "batch",
-                "package_type",
-                "package_type__unit_of_measure",
-            ).filter(location=entity)
+        # Prefetched by ``_fetch_scanned_entities``.
+        scan_items: list[WarehouseItem] = getattr(entity, "scan_items")
+        response.matching_items = [
+            warehouse_item_orm_to_schema(item) for item in scan_items
+        ]
+        return response
 
-            if product_code:
-                items_qs = items_qs.filter(stock_product__code=product_code)
+    @staticmethod
+    def barcode_lookup(
+        barcode: str, product_code: str | None = None
+    ) -> BarcodeLookupResponse:
+        """
+        Look up a barcode and identify what entity it represents.
+        Returns details about the scanned entity and matching warehouse items if applicable.
 
-            response.matching_items = [
-                warehouse_item_orm_to_schema(item) for item in items_qs[:20]
-            ]
+        Barcodes resolve through an in-process cache, the entity and its physical stock
+        items are then fetched in one prefetch pass. Warehouse items already assigned
+        to an outbound order are reported as not found.
+        """
+        resolved = barcode_resolution_cache.resolve(barcode)
+        if resolved is None:
+            return BarcodeLookupResponse(found=False)
 
-        elif isinstance(entity, StockProduct):
-            response.entity_type = "product"
-            response.product = product_orm_to_schema(entity)
+        model_class, object_id = resolved
+        entities = WarehouseService._fetch_scanned_entities(
+            model_class, [object_id], product_code
+        )
+        return WarehouseService._scan_response(entities.get(object_id))
 
-            # Find available warehouse items of this product (use physical_stock to include putaway)
-            items_qs = WarehouseItem.physical_stock.select_related(
-                "stock_product",
-                "stock_product__unit_of_measure",
-                "location",
-                "location__warehouse",
-                "batch",
-                "package_type",
-                "package_type__unit_of_measure",
-            ).filter(stock_product=entity)
+    @staticmethod
+    def barcode_lookup_many(
+        barcodes: list[str], product_code: str | None = None
+    ) -> list[BarcodeLookupResponse]:
+        """
+        Look up many barcodes at once, the results follow the order of ``barcodes``.
 
-            response.matching_items = [
-                warehouse_item_orm_to_schema(item) for item in items_qs[:20]
-            ]
+        All barcodes resolve with a single query, the scanned entities are then fetched
+        with one query (plus its items prefetch) per entity type.
+        """
+        resolved = barcode_resolution_cache.resolve_many(barcodes)
+
+        ids_by_model: dict[type[models.Model], set[int]] = defaultdict(set)
+        for model_class, object_id in resolved.values():
+            ids_by_model[model_class].add(object_id)
+        entities = {
+            model_class: WarehouseService._fetch_scanned_entities(
+                model_class, object_ids, product_code
+            )
+            for model_class, object_ids in ids_by_model.items()
+        }
 
-        return response
+        responses = []
+        for barcode in barcodes:
+            if barcode not in resolved:
+                responses.append(BarcodeLookupResponse(found=False))
+                continue
+            model_class, object_id = resolved[barcode]
+            entity = entities[model_class].get(object_id)
+            responses.append(WarehouseService._scan_response(entity))
+        return responses
 
     @staticmethod
     def create_warehouse_movement(
@@ -514,7 +508,7 @@ class WarehouseService:
     ) -> None:
         warehouse_order = InboundWarehouseOrder.objects.get(code=warehouse_order_code)
         item = warehouse_order.items.get(pk=item_id)
-        new_location = WarehouseLocation.objects.get(code=new_location_code)
+        new_location = lookup_cache_service.get(WarehouseLocation, new_location_code)
 
         movement_data: dict[str, object] = dict(
             location_from=item.location,
@@ -712,7 +706,7 @@ class WarehouseService:
             amount=new_item.amount,
             item=new_item,
             batch=item.batch,
-            worker=User.objects.get(pk=context.user_id) if context.user_id else None,
+            worker=context.user,
         )
 
         return new_item
@@ -786,7 +780,7 @@ class WarehouseService:
             amount=unpacked_item.amount,
             item=unpacked_item,
             batch=unpacked_item.batch,
-            worker=User.objects.get(pk=context.user_id) if context.user_id else None,
+            worker=context.user,
         )
 
         return unpacked_item
@@ -1009,9 +1003,7 @@ class WarehouseService:
                         amount=order_item.amount,
                         item=warehouse_item,
                         batch=warehouse_item.batch,
-                        worker=User.objects.get(pk=context.user_id)
-                        if context.user_id
-                        else None,
+                        worker=context.user,
                     )
 
                     # Restore item location
@@ -1196,9 +1188,7 @@ class WarehouseService:
                 amount=final_order_item.amount,
                 item=assigned_item,
                 batch=assigned_item.batch,
-                worker=User.objects.get(pk=context.user_id)
-                if context.user_id
-                else None,
+                worker=context.user,
             )
             assigned_item.location = None
             assigned_item.save(update_fields=["location_id", "changed"])
@@ -1373,7 +1363,7 @@ class WarehouseService:
                     f"Warehouse order '{code}' arrival has already been confirmed."
                 )
 
-            location = WarehouseLocation.objects.get(code=location_code)
+            location = lookup_cache_service.get(WarehouseLocation, location_code)
 
             w_order.pickup_location = location
             w_order.save(update_fields=["pickup_location"])
@@ -1452,11 +1442,7 @@ class WarehouseService:
 
         return InboundOrderItem.objects.filter(
             stock_product__code=stock_product_code,
-            order__state__in=(
-                InboundOrderState.DRAFT,
-                InboundOrderState.SUBMITTED,
-                InboundOrderState.RECEIVING,
-            ),
+            order__state__in=INCOMING_INBOUND_ORDER_STATES,
         ).aggregate(total_amount=Sum("amount")).get("total_amount") or Decimal("0")
 
     @staticmethod
@@ -1466,27 +1452,20 @@ class WarehouseService:
 
         return OutboundOrderItem.objects.filter(
             stock_product__code=stock_product_code,
-            order__state__in=(
-                OutboundOrderState.SUBMITTED,
-                OutboundOrderState.PICKING,
-                OutboundOrderState.PACKING,
-                OutboundOrderState.SHIPPING,
-            ),
+            order__state__in=BOOKED_OUTBOUND_ORDER_STATES,
         ).aggregate(total_amount=Sum("amount")).get("total_amount") or Decimal("0")
 
-    @classmethod
-    def get_total_availability(
-        cls, stock_product_code: str
-    ) -> ProductWarehouseAvailability:
-        warehouse_amount = cls.get_warehouse_availability(stock_product_code)
-        incoming_amount = cls.get_incoming_availability(stock_product_code)
-        booked_amount = cls.get_booked_availability(stock_product_code)
-
-        return ProductWarehouseAvailability(
-            total_amount=warehouse_amount,
-            available_amount=warehouse_amount - booked_amount,
-            incoming_amount=incoming_amount,
-        )
+    @staticmethod
+    def get_total_availability(stock_product_code: str) -> ProductWarehouseAvailability:
+        """Read the product's availability from the materialized stock ledger."""
+        return stock_ledger_service.get_availability(stock_product_code)
+
+    @staticmethod
+    def get_bulk_availability(
+        stock_product_codes: list[str],
+    ) -> dict[str, ProductWarehouseAvailability]:
+        """Read availability of many products at once, in a single query."""
+        return stock_ledger_service.get_bulk_availability(stock_product_codes)
 
     @staticmethod
     def preview_packaging(
@@ -1501,8 +1480,8 @@ class WarehouseService:
             raise WarehouseGenericError(
                 "Warehouse order has no pickup location set — cannot preview packaging."
             )
-        product = StockProduct.objects.get(code=product_code)
-        package = PackageType.objects.get(name=package_name)
+        product = lookup_cache_service.get(StockProduct, product_code)
+        package = lookup_cache_service.get(PackageType, package_name)
 
         if not package.unit_of_measure:
             package_amount_in_product_uom: float | None = float(order_item.amount)
@@ -1568,7 +1547,7 @@ class WarehouseService:
             raise WarehouseGenericError(
                 "Warehouse order has no pickup location set — cannot preview batching."
             )
-        product = StockProduct.objects.get(code=product_code)
+        product = lookup_cache_service.get(StockProduct, product_code)
 
         if batch_code:
             barcode = Barcode.objects.select_related("content_type").get(
@@ -1624,7 +1603,7 @@ class WarehouseService:
             raise WarehouseGenericError(
                 "Warehouse order has no pickup location set — cannot preview serial tracking."
             )
-        product = StockProduct.objects.get(code=product_code)
+        product = lookup_cache_service.get(StockProduct, product_code)
 
         requested_amount = Decimal(str(amount))
         if requested_amount <= 0 or requested_amount % 1 != 0:
@@ -1678,7 +1657,9 @@ class WarehouseService:
                 for i, item in enumerate(to_be_added):
                     new_order_item = InboundWarehouseOrderItem.objects.create(
                         warehouse_order=order,
-                        stock_product=StockProduct.objects.get(code=item.product_code),
+                        stock_product=lookup_cache_service.get(
+                            StockProduct, item.product_code
+                        ),
                         amount=Decimal(str(item.amount)),
                         index=next_index + i,
                     )
@@ -1732,14 +1713,14 @@ class WarehouseService:
                         batch_barcode = new_item.batch.primary_barcode.code
 
                     package_type = (
-                        PackageType.objects.get(name=new_item.package.type)
+                        lookup_cache_service.get(PackageType, new_item.package.type)
                         if new_item.package
                         else None
                     )
                     InboundWarehouseOrderItem.objects.create(
                         warehouse_order=order,
-                        stock_product=StockProduct.objects.get(
-                            code=new_item.product.code
+                        stock_product=lookup_cache_service.get(
+                            StockProduct, new_item.product.code
                         ),
                         amount=Decimal(str(new_item.amount)),
                         tracking_level=new_item.tracking_level,
@@ -2051,9 +2032,7 @@ class WarehouseService:
                     amount=item.amount,
                     item=item,
                     batch=batch,
-                    worker=User.objects.get(pk=context.user_id)
-                    if context.user_id
-                    else None,
+                    worker=context.user,
                 )
 
             # Move state transition INSIDE atomic block to fix idempotency (bug #3)
@@ -2235,7 +2214,7 @@ class WarehouseService:
             )
 
         item = warehouse_order.items.get(pk=item_id)
-        new_location = WarehouseLocation.objects.get(code=new_location_code)
+        new_location = lookup_cache_service.get(WarehouseLocation, new_location_code)
 
         with transaction.atomic():
             movement_service.move_item(item, context, new_location)
@@ -2473,9 +2452,7 @@ class WarehouseService:
                         amount=amount,
                         item=offloaded_wh,
                         batch=offloaded_wh.batch,
-                        worker=User.objects.get(pk=context.user_id)
-                        if context.user_id
-                        else None,
+                        worker=context.user,
                     )
 
             audit_service.add_entry(
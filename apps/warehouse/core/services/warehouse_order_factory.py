@@ -1,13 +1,14 @@
-from calendar import monthrange
-from datetime import datetime
 from enum import Enum
 
 from django.db import transaction
-from django.utils import timezone
 
 from apps.warehouse.core.audit_messages import AuditMessages
 from apps.warehouse.core.schemas.context import RequestContext
 from apps.warehouse.core.services.audit import audit_service
+from apps.warehouse.core.services.document_sequences import (
+    document_sequences_service,
+    last_code_seed,
+)
 from apps.warehouse.models.audit import AuditAction
 from apps.warehouse.models.manufacturing import ManufacturingOrder
 from apps.warehouse.models.orders import InboundOrder, OutboundOrder
@@ -44,36 +45,18 @@ class WarehouseOrderKind(str, Enum):
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def _get_month_range(date: datetime) -> tuple[datetime, datetime]:
-    last_day = monthrange(date.year, date.month)[1]
-    start = date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    end = date.replace(day=last_day)
-    return start, end
-
-
 def generate_next_code(model, prefix: str) -> str:
     """
     Generate the next sequential warehouse order code for *model* with *prefix*.
 
-    Uses last-code-suffix inference rather than a COUNT so concurrent inserts
-    cannot produce collisions (unlike count + 1 which races under load).
+    Every model and prefix pair has its own document sequence, see
+    ``DocumentSequencesService``.
     """
-    now = timezone.now()
-    dt_range = _get_month_range(now)
-    monthly_prefix = f"{prefix}{now.year}{now.month:02d}"
-    last_code = (
-        model.objects.filter(
-            created__range=dt_range,
-            code__startswith=monthly_prefix,
-        )
-        .order_by("-code")
-        .values_list("code", flat=True)
-        .first()
+    return document_sequences_service.next_code(
+        f"{model._meta.model_name}:{prefix}",
+        prefix,
+        seed=last_code_seed(model.objects.all()),
     )
-    next_number = 1
-    if last_code:
-        next_number = int(str(last_code)[len(monthly_prefix) :]) + 1
-    return f"{monthly_prefix}{next_number:04d}"
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from decimal import Decimal, ROUND_HALF_UP
 from pathlib import Path
 
@@ -45,8 +46,15 @@ from apps.warehouse.core.schemas.orders import (
     OutboundOrderItemSchema,
     OutboundOrderItemPricingDetailsSchema,
 )
-from apps.warehouse.core.schemas.packaging import PackageTypeSchema
-from apps.warehouse.core.schemas.printer import PrinterSchema
+from apps.warehouse.core.schemas.packaging import (
+    PackageTypeSchema,
+    UnitOfMeasureSchema,
+)
+from apps.warehouse.core.schemas.printer import (
+    LabelTemplateSchema,
+    PrinterSchema,
+    PrintJobSchema,
+)
 from apps.warehouse.core.schemas.product import (
     ProductSchema,
     DynamicProductPriceSchema,
@@ -67,6 +75,7 @@ from apps.warehouse.core.schemas.warehouse import (
     WarehouseLocationWithCountSchema,
     BatchSchema,
 )
+from apps.warehouse.core.zebra_printer import CompiledTemplate
 from apps.warehouse.models.barcode import Barcode
 from apps.warehouse.models.customer import Customer, CustomerGroup
 from apps.warehouse.models.manufacturing import (
@@ -87,8 +96,8 @@ from apps.warehouse.models.orders import (
     Invoice,
     InvoicePaymentMethod,
 )
-from apps.warehouse.models.packaging import PackageType
-from apps.warehouse.models.printer import Printer
+from apps.warehouse.models.packaging import PackageType, UnitOfMeasure
+from apps.warehouse.models.printer import LabelTemplate, Printer, PrintJob
 from apps.warehouse.models.product import (
     StockProduct,
     StockProductPrice,
@@ -126,6 +135,18 @@ def product_type_orm_to_schema(product_type: ProductType) -> ProductTypeSchema:
     )
 
 
+def unit_of_measure_orm_to_schema(unit: UnitOfMeasure) -> UnitOfMeasureSchema:
+    return UnitOfMeasureSchema(
+        created=unit.created,
+        changed=unit.changed,
+        name=unit.name,
+        amount_of_base_uom=float(unit.amount_of_base_uom)
+        if unit.amount_of_base_uom is not None
+        else None,
+        base_uom=unit.base_uom.name if unit.base_uom else None,
+    )
+
+
 def barcode_orm_to_schema(barcode: Barcode | None = None) -> BarcodeSchema | None:
     if not barcode:
         return None
@@ -156,11 +177,42 @@ def printer_orm_to_schema(printer: Printer) -> PrinterSchema:
         description=printer.description,
         ip=printer.ip,
         port=printer.port,
+        label_template_code=(
+            printer.label_template.code if printer.label_template else None
+        ),
         created=printer.created,
         changed=printer.changed,
     )
 
 
+def label_template_orm_to_schema(
+    template: LabelTemplate, compiled: CompiledTemplate
+) -> LabelTemplateSchema:
+    return LabelTemplateSchema(
+        code=template.code,
+        description=template.description,
+        content=template.content,
+        version=template.version,
+        slots=sorted(compiled.slots),
+        created=template.created,
+        changed=template.changed,
+    )
+
+
+def print_job_orm_to_schema(job: PrintJob) -> PrintJobSchema:
+    return PrintJobSchema(
+        id=job.pk,
+        printer_code=job.printer.code,
+        state=job.state,
+        label_count=job.label_count,
+        attempts=job.attempts,
+        last_error=job.last_error,
+        printed_at=job.printed_at,
+        created=job.created,
+        changed=job.changed,
+    )
+
+
 def invoice_document_to_schema(invoice: Invoice) -> MediaFileSchema | None:
     if not invoice.document or not invoice.document.name:
         return None
@@ -190,7 +242,7 @@ def invoice_orm_to_schema(invoice: Invoice) -> InvoiceSchema:
 
 
 def invoice_outbound_order_item_orm_to_schema(
-    item: OutboundOrderItem,
+    item: OutboundOrderItem, position: int
 ) -> InvoiceOutboundOrderItemSchema:
     return InvoiceOutboundOrderItemSchema(
         product=InvoiceOrderProductSchema(
@@ -203,7 +255,7 @@ def invoice_outbound_order_item_orm_to_schema(
         amount=float(item.amount),
         unit_price=float(item.unit_price),
         total_price=float(item.total_price),
-        index=item.index,
+        index=position,
         changed=item.changed,
         created=item.created,
     )
@@ -218,8 +270,8 @@ def invoice_outbound_order_orm_to_schema(
         state=OutboundOrderState.get_label(order.state),
         currency=order.currency,
         items=[
-            invoice_outbound_order_item_orm_to_schema(item)
-            for item in order.items.order_by("index", "created").all()
+            invoice_outbound_order_item_orm_to_schema(item, position)
+            for position, item in enumerate(order.items.order_by("index", "created"))
         ],
         created=order.created,
         changed=order.changed,
@@ -227,7 +279,7 @@ def invoice_outbound_order_orm_to_schema(
 
 
 def invoice_inbound_order_item_orm_to_schema(
-    item: InboundOrderItem,
+    item: InboundOrderItem, position: int
 ) -> InvoiceInboundOrderItemSchema:
     return InvoiceInboundOrderItemSchema(
         product=InvoiceOrderProductSchema(
@@ -240,7 +292,7 @@ def invoice_inbound_order_item_orm_to_schema(
         amount=float(item.amount),
         unit_price=float(item.unit_price),
         total_price=float(item.total_price),
-        index=item.index,
+        index=position,
         changed=item.changed,
         created=item.created,
     )
@@ -255,8 +307,8 @@ def invoice_inbound_order_orm_to_schema(
         state=InboundOrderState.get_label(order.state),
         currency=order.currency,
         items=[
-            invoice_inbound_order_item_orm_to_schema(item)
-            for item in order.items.order_by("index", "created").all()
+            invoice_inbound_order_item_orm_to_schema(item, position)
+            for position, item in enumerate(order.items.order_by("index", "created"))
         ],
         created=order.created,
         changed=order.changed,
@@ -542,14 +594,14 @@ def warehouse_item_orm_to_schema(item: WarehouseItem) -> WarehouseItemSchema:
 
 
 def inbound_order_item_orm_to_schema(
-    item: InboundOrderItem,
+    item: InboundOrderItem, position: int
 ) -> InboundOrderItemSchema:
     return InboundOrderItemSchema(
         product=product_orm_to_schema(item.stock_product),
         amount=float(item.amount),
         unit_price=float(item.unit_price),
         total_price=float(item.total_price),
-        index=item.index,
+        index=position,
         changed=item.changed,
         created=item.created,
     )
@@ -557,6 +609,7 @@ def inbound_order_item_orm_to_schema(
 
 def outbound_order_item_orm_to_schema(
     item: OutboundOrderItem,
+    position: int,
     pricing_details: OutboundOrderItemPricingDetailsSchema | None = None,
 ) -> OutboundOrderItemSchema:
     desired_batch_barcode = None
@@ -570,7 +623,7 @@ def outbound_order_item_orm_to_schema(
         amount=float(item.amount),
         unit_price=float(item.unit_price),
         total_price=float(item.total_price),
-        index=item.index,
+        index=position,
         desired_package_type_name=item.desired_package_type.name
         if item.desired_package_type
         else None,
@@ -684,7 +737,10 @@ def inbound_order_orm_to_schema(order: InboundOrder) -> InboundOrderSchema:
         warehouse_order_codes=[wo.code for wo in order.warehouse_orders.all()],
         warehouse_orders=warehouse_orders,
         state=InboundOrderState.get_label(order.state),
-        items=[inbound_order_item_orm_to_schema(item) for item in order.items.all()],
+        items=[
+            inbound_order_item_orm_to_schema(item, position)
+            for position, item in enumerate(order.items.all())
+        ],
         credit_note=credit_note_supplier_orm_to_base_schema(order.credit_note)
         if getattr(order, "credit_note", None)
         else None,
@@ -746,7 +802,10 @@ def outbound_order_orm_to_schema(order: OutboundOrder) -> OutboundOrderSchema:
         warehouse_order_codes=[wo.code for wo in order.warehouse_orders.all()],
         warehouse_orders=warehouse_orders,
         state=OutboundOrderState.get_label(order.state),
-        items=[outbound_order_item_orm_to_schema(item) for item in order.items.all()],
+        items=[
+            outbound_order_item_orm_to_schema(item, position)
+            for position, item in enumerate(order.items.all())
+        ],
         credit_note=credit_note_supplier_orm_to_base_schema(order.credit_note)
         if getattr(order, "credit_note", None)
         else None,
@@ -766,8 +825,13 @@ def credit_note_supplier_orm_to_schema(
     )
 
 
+def _item_positions(indexes: Iterable[int]) -> dict[int, int]:
+    """Map stored item indexes to 0-based positions, equal indexes share one."""
+    return {index: position for position, index in enumerate(sorted(set(indexes)))}
+
+
 def inbound_warehouse_order_item_to_schema(
-    item: InboundWarehouseOrderItem,
+    item: InboundWarehouseOrderItem, position: int
 ) -> InboundWarehouseOrderItemSchema:
     linked_items = list(item.warehouse_items.all())
     outbound_assignment = next(
@@ -803,7 +867,7 @@ def inbound_warehouse_order_item_to_schema(
         tracking_level=item.tracking_level,  # type: ignore
         package=package_orm_to_schema(item.package_type),
         unit_price_at_receipt=item.unit_price_at_receipt,
-        index=item.index,
+        index=position,
         batch_barcode=item.batch_barcode,
         pending=is_pending,
         warehouse_item_id=linked_items[0].pk if linked_items else None,
@@ -859,8 +923,10 @@ def warehouse_inbound_order_orm_to_schema(
             "package_type",
         ).all()
     )
+    positions = _item_positions(item.index for item in order_items)
     order_item_schemas = [
-        inbound_warehouse_order_item_to_schema(item) for item in order_items
+        inbound_warehouse_order_item_to_schema(item, positions[item.index])
+        for item in order_items
     ]
 
     # total_amount / remaining_amount should reflect frozen warehouse-order lines,
@@ -1022,6 +1088,7 @@ def warehouse_outbound_order_orm_to_schema(
         ).all()
     )
 
+    positions = _item_positions(item.index for item in order_items)
     order_item_schemas = []
     assigned_items = []
     for item in order_items:
@@ -1051,7 +1118,7 @@ def warehouse_outbound_order_orm_to_schema(
                 else None,
                 warehouse_item=assigned_item_schema,
                 pending=item.warehouse_item is None,
-                index=item.index,
+                index=positions[item.index],
                 price_at_shipment=item.price_at_shipment,
                 created=item.created,
                 changed=item.changed,
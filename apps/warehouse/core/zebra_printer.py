@@ -4,7 +4,23 @@ Minimal Zebra barcode printer module.
 Generates ZPL commands and sends them to a Zebra printer via TCP.
 """
 
+import re
+import select
 import socket
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class Label:
+    """Barcode label, printed ``copies`` times."""
+
+    barcode: str
+    text: str = ""
+    copies: int = 1
+    # Values of further template slots, e.g. ``{{ location }}``.
+    fields: Mapping[str, str] = field(default_factory=dict)
 
 
 def print_barcode(
@@ -29,55 +45,134 @@ def print_barcode(
     Raises:
         ConnectionError: If unable to connect to printer
         TimeoutError: If connection times out
-        ValueError: If barcode is empty
+        ValueError: If barcode is empty or copies are less than 1
     """
-    if not barcode:
-        raise ValueError("Barcode cannot be empty")
-
     # Generate ZPL commands
-    zpl = _generate_zpl(barcode, text)
+    zpl = render_labels([Label(barcode, text, copies)])
 
     # Send to printer
-    _send_to_printer(zpl, ip, port, copies, timeout)
+    _send_to_printer(zpl, ip, port, timeout)
+
+
+# Layout of the labels of printers without a template of their own.
+DEFAULT_TEMPLATE = """\
+^XA
+^CI28
+^LL400^PW600
+^CF0,50
+^FO50,50^FD{{ text }}^FS
+^BY3,3,100
+^FO50,150^BC^FD{{ barcode }}^FS
+^XZ"""
+
+_SLOT = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class CompiledTemplate:
+    """
+    Label layout parsed into static ZPL and variable slots.
+
+    Templates are ZPL with ``{{ name }}`` slots, filled from the label barcode,
+    text and fields. Lines without slots are merged into static fragments: the
+    ``prefix`` before the first slot line and the ``suffix`` before ``^XZ``.
+    Every line with slots is kept as a format string and left out of the label
+    when all of its slots are empty. Rendering only formats the slot lines and
+    joins the fragments.
+    """
+
+    __slots__ = ("prefix", "lines", "suffix", "slots")
+
+    def __init__(self, content: str) -> None:
+        content = content.replace("\r\n", "\n").strip()
+        if not content.startswith("^XA") or not content.endswith("^XZ"):
+            raise ValueError("Label template must start with ^XA and end with ^XZ")
+
+        # (format string, slot names, static ZPL up to the next slot line)
+        lines: list[tuple[str, tuple[str, ...], str]] = []
+        prefix = ""
+        for line in content.removesuffix("^XZ").splitlines(keepends=True):
+            parts = _SLOT.split(line)
+            if len(parts) == 1:
+                if lines:
+                    line_format, slots, static = lines[-1]
+                    lines[-1] = (line_format, slots, static + line)
+                else:
+                    prefix += line
+                continue
+            static_parts = [
+                part.replace("{", "{{").replace("}", "}}") for part in parts[::2]
+            ]
+            line_format = static_parts[0] + "".join(
+                f"{{{index}}}{static}" for index, static in enumerate(static_parts[1:])
+            )
+            lines.append((line_format, tuple(parts[1::2]), ""))
+
+        self.prefix = prefix
+        self.suffix = ""
+        if lines:
+            # The static ZPL after the last slot line is the suffix.
+            line_format, slots, self.suffix = lines[-1]
+            lines[-1] = (line_format, slots, "")
+        self.lines = tuple(lines)
+        self.slots = frozenset(slot for _, slots, _ in lines for slot in slots)
+
+    def render(self, label: Label) -> str:
+        values = {"barcode": label.barcode, "text": label.text, **label.fields}
+        parts = [self.prefix]
+        for line_format, slots, static in self.lines:
+            slot_values = [values.get(slot, "") for slot in slots]
+            if any(slot_values):
+                parts.append(line_format.format(*slot_values))
+            parts.append(static)
+        parts.append(self.suffix)
+        if label.copies > 1:
+            parts.append(f"^PQ{label.copies}\n")  # Print quantity
+        parts.append("^XZ")
+        return "".join(parts)
+
+
+_DEFAULT = CompiledTemplate(DEFAULT_TEMPLATE)
+
+
+def render_labels(
+    labels: Iterable[Label], template: CompiledTemplate | None = None
+) -> str:
+    """
+    Generate one ZPL stream for all ``labels``.
+
+    Labels are rendered with ``template``, ``DEFAULT_TEMPLATE`` if not given.
+    Copies are printed by the printer (``^PQ``), every label is sent only once.
+
+    Raises:
+        ValueError: If a barcode is empty or copies are less than 1
+    """
+    template = template or _DEFAULT
+    documents = []
+    for label in labels:
+        if not label.barcode:
+            raise ValueError("Barcode cannot be empty")
+        if label.copies < 1:
+            raise ValueError("Copies must be at least 1")
+        documents.append(template.render(label))
+    return "\n".join(documents)
 
 
-def _generate_zpl(barcode: str, text: str = "") -> str:
+def _generate_zpl(barcode: str, text: str = "", copies: int = 1) -> str:
     """
     Generate ZPL (Zebra Programming Language) commands for a barcode label.
 
     Args:
         barcode: Barcode data
         text: Optional text label
+        copies: Number of copies to print
 
     Returns:
         ZPL command string
     """
-    zpl_commands = [
-        "^XA",  # Start label
-        "^CI28",  # UTF-8 character encoding
-        "^LL400^PW600",  # Label length 400, print width 600
-        "^CF0,50",  # Default font, height 50
-    ]
-
-    # Add text if provided
-    if text:
-        zpl_commands.append(f"^FO50,50^FD{text}^FS")
-
-    # Add barcode (Code-128)
-    # ^BY: bar width, ratio, height
-    # ^BC: Code-128 barcode
-    zpl_commands.extend(
-        [
-            "^BY3,3,100",
-            f"^FO50,150^BC^FD{barcode}^FS",
-            "^XZ",  # End label
-        ]
-    )
-
-    return "\n".join(zpl_commands)
+    return _DEFAULT.render(Label(barcode, text, copies))
 
 
-def _send_to_printer(zpl: str, ip: str, port: int, copies: int, timeout: int) -> None:
+def _send_to_printer(zpl: str, ip: str, port: int, timeout: int) -> None:
     """
     Send ZPL commands to printer via TCP socket.
 
@@ -85,7 +180,6 @@ def _send_to_printer(zpl: str, ip: str, port: int, copies: int, timeout: int) ->
         zpl: ZPL command string
         ip: Printer IP address
         port: Printer port
-        copies: Number of copies to print
         timeout: Socket timeout in seconds
 
     Raises:
@@ -100,9 +194,7 @@ def _send_to_printer(zpl: str, ip: str, port: int, copies: int, timeout: int) ->
         sock.connect((ip, port))
 
         # Send ZPL commands (UTF-8 encoded)
-        zpl_bytes = zpl.encode("utf-8")
-        for _ in range(copies):
-            sock.sendall(zpl_bytes)
+        sock.sendall(zpl.encode("utf-8"))
 
     except socket.timeout:
         raise TimeoutError(
@@ -115,6 +207,111 @@ def _send_to_printer(zpl: str, ip: str, port: int, copies: int, timeout: int) ->
             sock.close()
 
 
+class PrinterConnection:
+    """
+    Persistent TCP connection to one printer.
+
+    The socket is kept open between sends and re-established when the printer has
+    closed it. Failed connection attempts back off exponentially, from
+    ``backoff_base`` up to ``backoff_max`` seconds, sends in the meantime fail
+    right away instead of waiting for the socket timeout again.
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        port: int = 9100,
+        timeout: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ) -> None:
+        self.ip = ip
+        self.port = port
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failures = 0
+        self._retry_at = 0.0
+        self._sock: socket.socket | None = None
+
+    def retry_in(self) -> float:
+        """Seconds until the next connection attempt is allowed."""
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def _is_open(self) -> bool:
+        if self._sock is None:
+            return False
+        # Printers don't send anything unasked, a readable socket has been closed.
+        readable, _, _ = select.select([self._sock], [], [], 0)
+        if readable:
+            try:
+                if not self._sock.recv(1, socket.MSG_PEEK):
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _connect(self) -> socket.socket:
+        retry_in = self.retry_in()
+        if retry_in:
+            raise ConnectionError(
+                f"Printer at {self.ip}:{self.port} is unavailable, "
+                f"next attempt in {retry_in:.0f}s"
+            )
+        try:
+            sock = socket.create_connection((self.ip, self.port), self.timeout)
+        except socket.timeout:
+            self._failed()
+            raise TimeoutError(
+                f"Connection to printer at {self.ip}:{self.port} timed out "
+                f"after {self.timeout}s"
+            )
+        except OSError as e:
+            self._failed()
+            raise ConnectionError(
+                f"Failed to connect to printer at {self.ip}:{self.port}: {e}"
+            )
+        self.failures = 0
+        self._retry_at = 0.0
+        return sock
+
+    def _failed(self) -> None:
+        self.failures += 1
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (self.failures - 1))
+        self._retry_at = time.monotonic() + delay
+
+    def send(self, zpl: str) -> None:
+        """
+        Send ZPL commands, connecting first if needed.
+
+        Raises:
+            ConnectionError: If unable to connect to printer
+            TimeoutError: If connection times out
+        """
+        if not self._is_open():
+            self.close()
+            self._sock = self._connect()
+
+        try:
+            self._sock.sendall(zpl.encode("utf-8"))  # type: ignore[union-attr]
+        except socket.timeout:
+            self.close()
+            raise TimeoutError(
+                f"Sending to printer at {self.ip}:{self.port} timed out "
+                f"after {self.timeout}s"
+            )
+        except OSError as e:
+            self.close()
+            raise ConnectionError(
+                f"Failed to send to printer at {self.ip}:{self.port}: {e}"
+            )
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
 def main():
     """CLI interface for testing."""
     import argparse
@@ -142,7 +339,7 @@ def main():
 
     if args.dry_run:
         # Just print the ZPL for inspection
-        zpl = _generate_zpl(args.barcode, args.text)
+        zpl = render_labels([Label(args.barcode, args.text, args.copies)])
         print(zpl)
     else:
         try:
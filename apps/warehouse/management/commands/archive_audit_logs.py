@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.warehouse.core.services.audit_archive import audit_archive_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Move audit log entries older than the given number of months into "
+        "compressed JSON lines files in AUDIT_ARCHIVE_DIR."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=12,
+            help="Keep entries of this many past months plus the current one.",
+        )
+
+    def handle(self, *args, **options):
+        if options["months"] < 0:
+            raise CommandError("--months must not be negative")
+
+        archived = audit_archive_service.archive(options["months"])
+        if not archived:
+            self.stdout.write(self.style.WARNING("No audit log entries to archive."))
+            return
+
+        for month, count in archived.items():
+            self.stdout.write(f"{month}: {count} entries")
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {sum(archived.values())} audit log entries.")
+        )
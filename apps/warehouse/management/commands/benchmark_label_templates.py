@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.warehouse.core import zebra_printer
+from apps.warehouse.core.services.label_templates import label_templates_service
+
+
+class Command(BaseCommand):
+    help = "Measure how fast labels are rendered from a compiled label template"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--labels",
+            type=int,
+            default=10000,
+            help="Number of labels to render (default: 10000)",
+        )
+        parser.add_argument(
+            "--template",
+            help="Code of the label template (default: built-in layout)",
+        )
+
+    def _report(self, name: str, count: int, duration: float) -> None:
+        self.stdout.write(
+            f"{name}: {count} labels in {duration:.3f}s "
+            f"({count / duration:.0f} labels/s)"
+        )
+
+    def handle(self, *args, **options):
+        count = options["labels"]
+        if count < 1:
+            raise CommandError("--labels must be at least 1")
+
+        content = zebra_printer.DEFAULT_TEMPLATE
+        if options["template"]:
+            content = label_templates_service.get_template(options["template"]).content
+
+        labels = [
+            zebra_printer.Label(
+                f"WMS-{number:08d}",
+                f"Item {number}",
+                fields={"product_code": f"P-{number % 100}"},
+            )
+            for number in range(count)
+        ]
+
+        start = time.perf_counter()
+        template = zebra_printer.CompiledTemplate(content)
+        zebra_printer.render_labels(labels, template)
+        self._report("Compiled once", count, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for label in labels:
+            zebra_printer.render_labels(
+                [label], zebra_printer.CompiledTemplate(content)
+            )
+        self._report("Compiled per label", count, time.perf_counter() - start)
@@ -1,7 +1,10 @@
 from django.core.management.base import BaseCommand, CommandError
 
 from apps.warehouse.core.exceptions import WarehouseGenericError
-from apps.warehouse.core.services.inventory_snapshots import inventory_snapshot_service
+from apps.warehouse.core.services.inventory_snapshots import (
+    SNAPSHOT_CHUNK_SIZE,
+    inventory_snapshot_service,
+)
 from apps.warehouse.models.warehouse import InventorySnapshotTriggerSource
 
 
@@ -23,27 +26,48 @@ class Command(BaseCommand):
             action="store_true",
             help="Allow creating another scheduled snapshot in the same cadence bucket.",
         )
+        parser.add_argument(
+            "--delta",
+            action="store_true",
+            help="Only store lines changed since the latest full snapshot.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=SNAPSHOT_CHUNK_SIZE,
+            help="Number of warehouse items read and written per batch.",
+        )
 
     def handle(self, *args, **options):
         cadence = options["cadence"]
         bucket_key = options["bucket_key"]
         force = options["force"]
+        chunk_size = options["chunk_size"]
 
         if cadence is None and bucket_key is None:
             raise CommandError("Provide --cadence or --bucket-key.")
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be a positive number.")
+
+        def report_progress(written: int, total: int) -> None:
+            self.stdout.write(f"Written {written}/{total} lines.")
 
         try:
-            snapshot = inventory_snapshot_service.create_snapshot(
+            snapshot = inventory_snapshot_service.stream_snapshot(
                 trigger_source=InventorySnapshotTriggerSource.SCHEDULED,
                 cadence=cadence,
                 bucket_key=bucket_key,
                 force=force,
+                delta=options["delta"],
+                chunk_size=chunk_size,
+                on_progress=report_progress,
             )
         except WarehouseGenericError as exc:
             raise CommandError(str(exc)) from exc
 
+        kind = "delta" if snapshot.base_snapshot_id else "full"
         self.stdout.write(
             self.style.SUCCESS(
-                f"Created snapshot #{snapshot.id} with {snapshot.line_count} lines."
+                f"Created {kind} snapshot #{snapshot.id} with {snapshot.line_count} lines."
             )
         )
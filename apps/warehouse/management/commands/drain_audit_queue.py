@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.warehouse.core.services.audit_writer import audit_writer
+
+
+class Command(BaseCommand):
+    help = "Load audit log entries queued in AUDIT_QUEUE_DIR into the database."
+
+    def handle(self, *args, **options):
+        drained = audit_writer.drain_queue()
+        self.stdout.write(
+            self.style.SUCCESS(f"Loaded {drained} queued audit log entries.")
+        )
@@ -2,7 +2,7 @@
 
 from pathlib import Path
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from apps.warehouse.core.services.product_import import ProductCsvImportService
 
 
@@ -13,21 +13,45 @@ class Command(BaseCommand):
         parser.add_argument(
             "--file", type=str, help="Path to the CSV file", default="data/products.csv"
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes validating the rows (default: 1, inline)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only validate the rows and report the throughput",
+        )
 
     def handle(self, *args, **options):
         path = options["file"]
+        workers = options["workers"]
+        if workers < 1:
+            raise CommandError("--workers must be at least 1")
         self.stdout.write(f"Importing products from: '{path}'")
 
         if not Path(path).exists():
             self.stdout.write(self.style.ERROR(f"File not found: {path}"))
             return
 
-        service = ProductCsvImportService()
-        summary = service.import_from_path(path)
+        service = ProductCsvImportService(workers=workers)
+        summary = service.import_from_path(path, dry_run=options["dry_run"])
 
         for message in summary.errors:
             self.stdout.write(self.style.WARNING(message))
 
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Validation completed: {summary.validated_count} valid, "
+                    f"{summary.skipped_count} invalid in {summary.duration:.2f}s "
+                    f"({summary.rows_per_second:.0f} rows/s)"
+                )
+            )
+            return
+
         self.stdout.write(
             self.style.SUCCESS(
                 f"Import completed: {summary.created_count} created, "
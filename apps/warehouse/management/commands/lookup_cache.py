@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.warehouse.core.services.lookup_cache import lookup_cache_service
+
+
+class Command(BaseCommand):
+    help = "Show or reset the hit/miss counters of the shared lookup cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action",
+            choices=["stats", "reset"],
+            help="'stats' prints the counters per model, 'reset' sets them to zero.",
+        )
+
+    def handle(self, *args, **options):
+        if options["action"] == "reset":
+            lookup_cache_service.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Lookup cache counters reset."))
+            return
+
+        if not settings.LOOKUP_CACHE_STATS:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Counting is disabled, set LOOKUP_CACHE_STATS to enable it."
+                )
+            )
+        for label, counters in lookup_cache_service.stats().items():
+            total = counters["hits"] + counters["misses"]
+            ratio = counters["hits"] / total if total else 0
+            self.stdout.write(
+                f"{label}: {counters['hits']} hits, {counters['misses']} misses "
+                f"({ratio:.0%} hit rate)"
+            )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.warehouse.core.services.rollups import rollup_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the daily analytics rollups from the raw order and movement history."
+    )
+
+    def handle(self, *args, **options):
+        counts = rollup_service.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Rebuilt analytics rollups: "
+                + ", ".join(f"{count} {name} rows" for name, count in counts.items())
+                + "."
+            )
+        )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.warehouse.core.services.product_search import product_search_service
+
+
+class Command(BaseCommand):
+    help = "Backfill the full-text product search index from the stock products."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of products indexed per batch.",
+        )
+
+    def handle(self, *args, **options):
+        if not product_search_service.is_available():
+            self.stdout.write(
+                self.style.WARNING(
+                    "Full-text search index is not supported by this database."
+                )
+            )
+            return
+
+        count = product_search_service.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} products."))
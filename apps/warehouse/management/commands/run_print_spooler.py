@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.warehouse.core.services.print_spooler import print_spooler_service
+
+
+class Command(BaseCommand):
+    help = "Send queued print jobs to the printers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send the jobs that are due and exit",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds between checks for new jobs (default: 1)",
+        )
+
+    def handle(self, *args, **options):
+        if options["poll_interval"] <= 0:
+            raise CommandError("--poll-interval must be positive")
+
+        if options["once"]:
+            try:
+                processed = print_spooler_service.drain()
+            finally:
+                print_spooler_service.close()
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} print jobs"))
+            return
+
+        self.stdout.write("Print spooler started")
+        try:
+            print_spooler_service.run(poll_interval=options["poll_interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Print spooler stopped")
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.warehouse.core.services.stock_ledger import stock_ledger_service
+
+
+class Command(BaseCommand):
+    help = "Rebuild or verify the materialized per-product stock ledger."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action",
+            choices=["rebuild", "verify"],
+            help="'rebuild' recomputes every row, 'verify' reports drift against live totals.",
+        )
+
+    def handle(self, *args, **options):
+        if options["action"] == "rebuild":
+            count = stock_ledger_service.rebuild()
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt stock ledger for {count} products.")
+            )
+            return
+
+        problems = stock_ledger_service.verify()
+        for problem in problems:
+            self.stdout.write(self.style.WARNING(problem))
+        if problems:
+            raise CommandError(
+                f"Stock ledger drifted in {len(problems)} places, run 'stock_ledger rebuild'."
+            )
+        self.stdout.write(self.style.SUCCESS("Stock ledger is consistent."))
@@ -0,0 +1,121 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:33
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Sum
+
+# State values as of this migration (InboundOrderState / OutboundOrderState).
+INCOMING_INBOUND_ORDER_STATES = (1, 2, 3)
+BOOKED_OUTBOUND_ORDER_STATES = (2, 3, 4, 5)
+
+
+def _grouped_totals(queryset):
+    return {
+        row["stock_product_id"]: row["total"] or Decimal("0")
+        for row in queryset.order_by()
+        .values("stock_product_id")
+        .annotate(total=Sum("amount"))
+    }
+
+
+def backfill_stock_ledger(apps, schema_editor):
+    StockProduct = apps.get_model("warehouse", "StockProduct")
+    WarehouseItem = apps.get_model("warehouse", "WarehouseItem")
+    InboundOrderItem = apps.get_model("warehouse", "InboundOrderItem")
+    OutboundOrderItem = apps.get_model("warehouse", "OutboundOrderItem")
+    ProductStockLedger = apps.get_model("warehouse", "ProductStockLedger")
+
+    on_hand = _grouped_totals(
+        WarehouseItem.objects.filter(outbound_assignment__isnull=True)
+    )
+    booked = _grouped_totals(
+        OutboundOrderItem.objects.filter(order__state__in=BOOKED_OUTBOUND_ORDER_STATES)
+    )
+    incoming = _grouped_totals(
+        InboundOrderItem.objects.filter(order__state__in=INCOMING_INBOUND_ORDER_STATES)
+    )
+
+    rows = []
+    for product_id in StockProduct.objects.values_list("pk", flat=True):
+        on_hand_amount = on_hand.get(product_id, Decimal("0"))
+        booked_amount = booked.get(product_id, Decimal("0"))
+        rows.append(
+            ProductStockLedger(
+                stock_product_id=product_id,
+                on_hand_amount=on_hand_amount,
+                booked_amount=booked_amount,
+                incoming_amount=incoming.get(product_id, Decimal("0")),
+                available_amount=on_hand_amount - booked_amount,
+            )
+        )
+    ProductStockLedger.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "warehouse",
+            "0080_inboundorderitem_unique_inbound_order_item_order_index_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductStockLedger",
+            fields=[
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("changed", models.DateTimeField(auto_now=True)),
+                (
+                    "stock_product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stock_ledger",
+                        serialize=False,
+                        to="warehouse.stockproduct",
+                    ),
+                ),
+                (
+                    "on_hand_amount",
+                    models.DecimalField(
+                        decimal_places=4,
+                        default=Decimal("0"),
+                        help_text="Physical stock not yet picked for outbound (stock product UOM)",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "booked_amount",
+                    models.DecimalField(
+                        decimal_places=4,
+                        default=Decimal("0"),
+                        help_text="Amount booked by submitted, not yet shipped outbound orders",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "incoming_amount",
+                    models.DecimalField(
+                        decimal_places=4,
+                        default=Decimal("0"),
+                        help_text="Amount on inbound orders that have not been received yet",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "available_amount",
+                    models.DecimalField(
+                        decimal_places=4,
+                        default=Decimal("0"),
+                        help_text="On hand minus booked",
+                        max_digits=14,
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.RunPython(backfill_stock_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+import unicodedata
+
+from django.db import migrations
+
+SEARCH_TABLE = "warehouse_stockproduct_search"
+
+
+def _normalize(text):
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    StockProduct = apps.get_model("warehouse", "StockProduct")
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+        "USING fts5(code, name, attributes, tokenize='trigram')"
+    )
+
+    documents = []
+    for product in StockProduct.objects.only("code", "name", "attributes"):
+        attributes = " ".join(
+            f"{key} {value}"
+            for key, value in (product.attributes or {}).items()
+            if value is not None
+        )
+        documents.append(
+            (
+                product.pk,
+                _normalize(product.code),
+                _normalize(product.name),
+                _normalize(attributes),
+            )
+        )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, code, name, attributes) "
+            "VALUES (%s, %s, %s, %s)",
+            documents,
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("warehouse", "0081_product_stock_ledger"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
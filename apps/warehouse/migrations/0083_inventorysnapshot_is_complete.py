@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("warehouse", "0082_stockproduct_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="inventorysnapshot",
+            name="is_complete",
+            field=models.BooleanField(default=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("warehouse", "0083_inventorysnapshot_is_complete"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="inventorysnapshot",
+            name="base_snapshot",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Set on delta snapshots, which only store lines changed since the base",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="deltas",
+                to="warehouse.inventorysnapshot",
+            ),
+        ),
+        migrations.AddField(
+            model_name="inventorysnapshotline",
+            name="is_removal",
+            field=models.BooleanField(
+                default=False,
+                help_text="Delta snapshot marker of an item no longer in stock since the base",
+            ),
+        ),
+    ]
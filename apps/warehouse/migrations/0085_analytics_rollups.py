@@ -0,0 +1,242 @@
+# Generated by Django 6.0.5 on 2026-10-18 15:01
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+# Closed states per order model, as of this migration.
+CLOSED_ORDER_STATES = {
+    ("InboundOrder", "inbound_order"): (1, 5, 6),
+    ("OutboundOrder", "outbound_order"): (1, 6, 7, 11, 8, 9, 10),
+    ("InboundWarehouseOrder", "inbound_warehouse_order"): (1, 5, 6),
+    ("OutboundWarehouseOrder", "outbound_warehouse_order"): (4, 5),
+}
+VALUE_STATES = {
+    "InboundOrder": ("receipt", (5,)),
+    "OutboundOrder": ("shipment", (8, 9, 10, 6, 11)),
+}
+
+
+def _per_day(queryset, field):
+    return queryset.annotate(
+        day=TruncDate(field, tzinfo=timezone.get_current_timezone())
+    )
+
+
+def backfill_rollups(apps, schema_editor):
+    OrderDailyRollup = apps.get_model("warehouse", "OrderDailyRollup")
+    MovementDailyRollup = apps.get_model("warehouse", "MovementDailyRollup")
+    ValueDailyRollup = apps.get_model("warehouse", "ValueDailyRollup")
+    WarehouseMovement = apps.get_model("warehouse", "WarehouseMovement")
+
+    orders = {}
+    for (model_name, kind), closed_states in CLOSED_ORDER_STATES.items():
+        model = apps.get_model("warehouse", model_name)
+        for field, counter, queryset in (
+            ("created", "created_count", model.objects.all()),
+            ("changed", "entered_count", model.objects.filter(state__in=closed_states)),
+        ):
+            grouped = (
+                _per_day(queryset, field)
+                .values("day", "state")
+                .annotate(count=Count("id"))
+            )
+            for entry in grouped:
+                key = (entry["day"], kind, entry["state"])
+                row = orders.setdefault(
+                    key, OrderDailyRollup(day=key[0], kind=kind, state=key[2])
+                )
+                setattr(row, counter, getattr(row, counter) + entry["count"])
+    OrderDailyRollup.objects.bulk_create(orders.values(), batch_size=1000)
+
+    movements = {}
+    for location_field, quantity_field in (
+        ("location_to_id", "quantity_in"),
+        ("location_from_id", "quantity_out"),
+    ):
+        grouped = (
+            _per_day(
+                WarehouseMovement.objects.filter(
+                    **{f"{location_field}__isnull": False}
+                ),
+                "moved_at",
+            )
+            .values("day", "stock_product_id", location_field)
+            .annotate(quantity=Sum("amount"), count=Count("id"))
+        )
+        for entry in grouped:
+            key = (entry["day"], entry["stock_product_id"], entry[location_field])
+            row = movements.setdefault(
+                key,
+                MovementDailyRollup(
+                    day=key[0], stock_product_id=key[1], location_id=key[2]
+                ),
+            )
+            setattr(row, quantity_field, entry["quantity"])
+            row.movement_count += entry["count"]
+    MovementDailyRollup.objects.bulk_create(movements.values(), batch_size=1000)
+
+    values = []
+    for model_name, (kind, states) in VALUE_STATES.items():
+        model = apps.get_model("warehouse", model_name)
+        grouped = (
+            _per_day(model.objects.filter(state__in=states), "changed")
+            .values("day", "currency")
+            .annotate(count=Count("id", distinct=True), value=Sum("items__total_price"))
+        )
+        values.extend(
+            ValueDailyRollup(
+                day=entry["day"],
+                kind=kind,
+                currency=entry["currency"],
+                order_count=entry["count"],
+                total_value=entry["value"] or Decimal("0"),
+            )
+            for entry in grouped
+        )
+    ValueDailyRollup.objects.bulk_create(values, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("warehouse", "0084_inventory_snapshot_deltas"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("inbound_order", "Inbound order"),
+                            ("outbound_order", "Outbound order"),
+                            ("inbound_warehouse_order", "Inbound warehouse order"),
+                            ("outbound_warehouse_order", "Outbound warehouse order"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("state", models.PositiveIntegerField()),
+                ("created_count", models.IntegerField(default=0)),
+                ("entered_count", models.IntegerField(default=0)),
+                ("left_count", models.IntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["day", "kind", "state"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "kind", "state"),
+                        name="warehouse_orderdailyrollup_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ValueDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("receipt", "Receipt"), ("shipment", "Shipment")],
+                        max_length=16,
+                    ),
+                ),
+                ("currency", models.CharField(max_length=3)),
+                ("order_count", models.IntegerField(default=0)),
+                (
+                    "total_value",
+                    models.DecimalField(
+                        decimal_places=4, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["day", "kind", "currency"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "kind", "currency"),
+                        name="warehouse_valuedailyrollup_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="MovementDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "quantity_in",
+                    models.DecimalField(
+                        decimal_places=4, default=Decimal("0"), max_digits=16
+                    ),
+                ),
+                (
+                    "quantity_out",
+                    models.DecimalField(
+                        decimal_places=4, default=Decimal("0"), max_digits=16
+                    ),
+                ),
+                ("movement_count", models.IntegerField(default=0)),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="warehouse.warehouselocation",
+                    ),
+                ),
+                (
+                    "stock_product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="warehouse.stockproduct",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["day"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "stock_product", "location"),
+                        name="warehouse_movementdailyrollup_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
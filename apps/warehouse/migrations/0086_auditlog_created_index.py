@@ -0,0 +1,21 @@
+# Generated by Django 6.0.5 on 2026-10-18 15:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("warehouse", "0085_analytics_rollups"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(
+                fields=["created"], name="warehouse_a_created_f7efc4_idx"
+            ),
+        ),
+    ]
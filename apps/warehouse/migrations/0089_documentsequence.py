@@ -0,0 +1,40 @@
+# Generated by Django 6.0.5 on 2026-10-18 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("warehouse", "0088_labeltemplate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DocumentSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("changed", models.DateTimeField(auto_now=True)),
+                ("name", models.CharField(max_length=100)),
+                ("period", models.CharField(max_length=6)),
+                ("last_number", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "abstract": False,
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("name", "period"),
+                        name="warehouse_documentsequence_name_period_unique",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,105 @@
+from decimal import Decimal
+
+from django.db import models
+
+from .product import StockProduct
+from .warehouse import WarehouseLocation
+
+# Pseudo state of ``OrderDailyRollup`` rows recording deleted orders.
+DELETED_ORDER_STATE = 0
+
+
+class RollupOrderKind(models.TextChoices):
+    INBOUND_ORDER = "inbound_order", "Inbound order"
+    OUTBOUND_ORDER = "outbound_order", "Outbound order"
+    INBOUND_WAREHOUSE_ORDER = "inbound_warehouse_order", "Inbound warehouse order"
+    OUTBOUND_WAREHOUSE_ORDER = "outbound_warehouse_order", "Outbound warehouse order"
+
+
+class RollupValueKind(models.TextChoices):
+    RECEIPT = "receipt", "Receipt"
+    SHIPMENT = "shipment", "Shipment"
+
+
+class OrderDailyRollup(models.Model):
+    """
+    Order state transitions per local day, order kind and state.
+
+    Creating an order counts into ``created_count`` and ``entered_count`` of its
+    initial state, every later state change into ``left_count`` of the old state
+    and ``entered_count`` of the new one.
+    """
+
+    day = models.DateField()
+    kind = models.CharField(max_length=32, choices=RollupOrderKind.choices)
+    state = models.PositiveIntegerField()
+    created_count = models.IntegerField(default=0)
+    entered_count = models.IntegerField(default=0)
+    left_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["day", "kind", "state"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "kind", "state"],
+                name="warehouse_orderdailyrollup_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.kind} #{self.state}"
+
+
+class MovementDailyRollup(models.Model):
+    """Stock moved in and out of a location per local day and product."""
+
+    day = models.DateField()
+    stock_product = models.ForeignKey(
+        StockProduct, on_delete=models.CASCADE, related_name="+"
+    )
+    location = models.ForeignKey(
+        WarehouseLocation, on_delete=models.CASCADE, related_name="+"
+    )
+    quantity_in = models.DecimalField(
+        max_digits=16, decimal_places=4, default=Decimal("0")
+    )
+    quantity_out = models.DecimalField(
+        max_digits=16, decimal_places=4, default=Decimal("0")
+    )
+    movement_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "stock_product", "location"],
+                name="warehouse_movementdailyrollup_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.stock_product_id}@{self.location_id}"
+
+
+class ValueDailyRollup(models.Model):
+    """Received and shipped orders with their total value per local day and currency."""
+
+    day = models.DateField()
+    kind = models.CharField(max_length=16, choices=RollupValueKind.choices)
+    currency = models.CharField(max_length=3)
+    order_count = models.IntegerField(default=0)
+    total_value = models.DecimalField(
+        max_digits=18, decimal_places=4, default=Decimal("0")
+    )
+
+    class Meta:
+        ordering = ["day", "kind", "currency"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "kind", "currency"],
+                name="warehouse_valuedailyrollup_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.kind} {self.currency}"
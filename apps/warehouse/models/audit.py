@@ -87,13 +87,14 @@ class AuditLog(BaseModel):
         verbose_name_plural = "Audit Logs"
         indexes = [
             models.Index(fields=["content_type", "object_id"]),
+            models.Index(fields=["created"]),
         ]
 
     def __str__(self):
         return f"{self.action.capitalize()} on {self.object_repr} by {self.user or 'System'}"
 
 
-def create_audit_log(
+def build_audit_log(
     obj: models.Model,
     action: AuditAction | str,
     user: User | int | None = None,
@@ -101,17 +102,14 @@ def create_audit_log(
     reason: str | None = None,
     object_repr: str | None = None,
 ) -> AuditLog:
+    """Return an unsaved audit log entry, users passed by id are not fetched."""
     if getattr(obj, "pk", None) is None:
         raise ValueError("Cannot create audit log for an unsaved object")
 
     content_type = ContentType.objects.get_for_model(obj, for_concrete_model=False)
     normalized_action = action.value if isinstance(action, AuditAction) else action
 
-    if isinstance(user, int):
-        user = User.objects.get(pk=user)
-
-    return AuditLog.objects.create(  # type: ignore
-        user=user,
+    log = AuditLog(
         action=normalized_action,
         content_type=content_type,
         object_id=obj.pk,
@@ -119,6 +117,31 @@ def create_audit_log(
         changes=changes or {},
         reason=reason,
     )
+    if isinstance(user, int):
+        log.user_id = user
+    else:
+        log.user = user
+    return log
+
+
+def create_audit_log(
+    obj: models.Model,
+    action: AuditAction | str,
+    user: User | int | None = None,
+    changes: dict | None = None,
+    reason: str | None = None,
+    object_repr: str | None = None,
+) -> AuditLog:
+    log = build_audit_log(
+        obj,
+        action=action,
+        user=user,
+        changes=changes,
+        reason=reason,
+        object_repr=object_repr,
+    )
+    log.save()
+    return log
 
 
 class AuditMixin(models.Model):
@@ -2,16 +2,44 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from .base import BaseModel
 
 
+class LabelTemplate(BaseModel):
+    """ZPL label layout with ``{{ slot }}`` placeholders."""
+
+    code = models.CharField(max_length=100, unique=True)
+    description = models.TextField(null=True, blank=True)
+    content = models.TextField()
+    # Compiled templates are cached per version, every save increments it.
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    def save(self, *args, **kwargs) -> None:
+        if self.pk is not None:
+            self.version += 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return self.code
+
+
 class Printer(BaseModel):
     code = models.CharField(max_length=100, unique=True)
     description = models.TextField(null=True, blank=True)
     ip = models.CharField(max_length=255, null=True, blank=True)
     port = models.PositiveIntegerField(default=9100)
     dpi = models.PositiveIntegerField(null=True, blank=True)
+    label_template = models.ForeignKey(
+        LabelTemplate,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="printers",
+    )
 
     def __str__(self) -> str:
         return self.code
@@ -33,3 +61,41 @@ class UserAppSettings(BaseModel):
 
     def __str__(self) -> str:
         return f"{self.user} settings"
+
+
+class PrintJobState(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    PRINTING = "printing", "Printing"
+    PRINTED = "printed", "Printed"
+    FAILED = "failed", "Failed"
+
+
+class PrintJob(BaseModel):
+    """ZPL document queued for a printer, sent by the print spooler worker."""
+
+    printer = models.ForeignKey(
+        Printer, on_delete=models.CASCADE, related_name="print_jobs"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    payload = models.TextField()
+    label_count = models.PositiveIntegerField(default=1)
+    state = models.CharField(
+        max_length=16, choices=PrintJobState.choices, default=PrintJobState.QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True, blank=True)
+    printed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(BaseModel.Meta):
+        ordering = ["id"]
+        indexes = [models.Index(fields=["state", "next_attempt_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.printer} #{self.pk}"
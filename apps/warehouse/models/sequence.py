@@ -0,0 +1,22 @@
+from django.db import models
+
+from .base import BaseModel
+
+
+class DocumentSequence(BaseModel):
+    """Last number issued by a document sequence in one period (``YYYYMM``)."""
+
+    name = models.CharField(max_length=100)
+    period = models.CharField(max_length=6)
+    last_number = models.PositiveIntegerField(default=0)
+
+    class Meta(BaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name", "period"],
+                name="warehouse_documentsequence_name_period_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} {self.period}: {self.last_number}"
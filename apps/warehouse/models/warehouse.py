@@ -263,6 +263,49 @@ class WarehouseMovement(models.Model):
     worker = models.ForeignKey(User, null=True, on_delete=models.SET_NULL)
 
 
+class ProductStockLedger(BaseModel):
+    """
+    Materialized availability of a single stock product.
+
+    Maintained by the stock ledger service in the same transaction as the
+    writes it summarizes, so availability reads are a single row lookup.
+    """
+
+    stock_product = models.OneToOneField(
+        StockProduct,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="stock_ledger",
+    )
+    on_hand_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=4,
+        default=Decimal("0"),
+        help_text="Physical stock not yet picked for outbound (stock product UOM)",
+    )
+    booked_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=4,
+        default=Decimal("0"),
+        help_text="Amount booked by submitted, not yet shipped outbound orders",
+    )
+    incoming_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=4,
+        default=Decimal("0"),
+        help_text="Amount on inbound orders that have not been received yet",
+    )
+    available_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=4,
+        default=Decimal("0"),
+        help_text="On hand minus booked",
+    )
+
+    def __str__(self) -> str:
+        return f"Stock ledger - {self.stock_product_id}"
+
+
 ###################################################################################
 # ORDERS
 ###################################################################################
@@ -566,6 +609,16 @@ class InventorySnapshot(BaseModel):
     purchase_totals_by_currency = models.JSONField(default=dict, blank=True)
     receipt_totals_by_currency = models.JSONField(default=dict, blank=True)
     receipt_unpriced_line_count = models.PositiveIntegerField(default=0)
+    # False while the lines of a streamed snapshot are still being written.
+    is_complete = models.BooleanField(default=True)
+    base_snapshot = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="deltas",
+        help_text="Set on delta snapshots, which only store lines changed since the base",
+    )
 
     class Meta(BaseModel.Meta):
         ordering = ["-captured_at", "-created"]
@@ -653,6 +706,10 @@ class InventorySnapshotLine(BaseModel):
         null=True,
         blank=True,
     )
+    is_removal = models.BooleanField(
+        default=False,
+        help_text="Delta snapshot marker of an item no longer in stock since the base",
+    )
 
     class Meta(BaseModel.Meta):
         ordering = ["product_code", "location_code", "warehouse_item_id_at_snapshot"]
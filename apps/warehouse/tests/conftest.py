@@ -1,9 +1,14 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from ninja.testing.client import NinjaClientBase
 
+from apps.warehouse.core.auth import token_user_cache
 from apps.warehouse.core.schemas.context import RequestContext
+from apps.warehouse.core.services.barcode_resolution import barcode_resolution_cache
+from apps.warehouse.core.services.print_spooler import print_spooler_service
+from apps.warehouse.tests.fake_printer import FakePrinter
 from apps.warehouse.tests.factories.user import UserFactory
 
 
@@ -13,6 +18,39 @@ def use_utc_timezone(settings):
     settings.TIME_ZONE = "UTC"
 
 
+@pytest.fixture(autouse=True)
+def immediate_audit_writes(settings):
+    # Test transactions never commit, buffered audit entries would not be written.
+    settings.AUDIT_WRITE_MODE = "immediate"
+
+
+@pytest.fixture(autouse=True)
+def pdf_cache_dir(settings, tmp_path):
+    settings.PDF_CACHE_DIR = str(tmp_path / "pdf-cache")
+    # Tests pre-rendering PDFs enable the render pool explicitly.
+    settings.PDF_RENDER_WORKERS = 0
+    return tmp_path / "pdf-cache"
+
+
+@pytest.fixture
+def fake_printer():
+    printer = FakePrinter()
+    yield printer
+    print_spooler_service.close()
+    printer.stop()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    barcode_resolution_cache.clear()
+    token_user_cache.clear()
+    yield
+    cache.clear()
+    barcode_resolution_cache.clear()
+    token_user_cache.clear()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()  # type: ignore
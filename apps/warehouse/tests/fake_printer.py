@@ -0,0 +1,84 @@
+"""Local TCP stand-in for a Zebra printer."""
+
+from __future__ import annotations
+
+import socket
+import socketserver
+import threading
+import time
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: _Server
+
+    def handle(self) -> None:
+        self.server.register(self.request)
+        while chunk := self.request.recv(65536):
+            self.server.receive(chunk)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.data = bytearray()
+        self.clients: list[socket.socket] = []
+
+    def register(self, client: socket.socket) -> None:
+        with self.lock:
+            self.clients.append(client)
+
+    def receive(self, chunk: bytes) -> None:
+        with self.lock:
+            self.data.extend(chunk)
+
+
+class FakePrinter:
+    """Accepts connections like a printer on port 9100 and records what it gets."""
+
+    def __init__(self) -> None:
+        self._server = _Server()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def ip(self) -> str:
+        return str(self._server.server_address[0])
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._server.clients)
+
+    def received(self, expected: str = "", timeout: float = 2.0) -> str:
+        """Everything received so far, waits until it contains ``expected``."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._server.lock:
+                text = self._server.data.decode("utf-8")
+            if expected in text or time.monotonic() > deadline:
+                return text
+            time.sleep(0.01)
+
+    def drop_connections(self) -> None:
+        """Close all client connections, like a printer dropping idle ones."""
+        with self._server.lock:
+            for client in self._server.clients:
+                client.shutdown(socket.SHUT_RDWR)
+        time.sleep(0.05)
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
@@ -493,3 +493,16 @@ def test_get_warehouse_movements_api_combines_multiple_filters(db, client):
     payload = response.json()
     assert payload["count"] == 1
     assert payload["data"][0]["id"] == movement_match.pk
+
+
+def test_get_movement_trends_api_returns_daily_points(db, client):
+    location = WarehouseLocationFactory()
+    WarehouseMovementFactory(location_to=location, amount=Decimal("5"))
+
+    response = client.get(f"trends/movements?days=7&location_id={location.pk}")
+
+    assert response.status_code == 200
+    points = response.json()["data"]
+    assert len(points) == 7
+    assert Decimal(points[-1]["quantity_in"]) == Decimal("5")
+    assert points[-1]["movement_count"] == 1
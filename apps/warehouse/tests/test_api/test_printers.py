@@ -1,12 +1,11 @@
-from unittest.mock import patch
-
 import pytest
 from django.contrib.auth.models import User
 from ninja.testing import TestClient
 
 from apps.warehouse.api.routes.printers import routes
-from apps.warehouse.core.exceptions import ApiBaseException
-from apps.warehouse.models.printer import Printer, UserAppSettings
+from apps.warehouse.core.exceptions import ApiBaseException, NotFoundException
+from apps.warehouse.core.zebra_printer import Label, render_labels
+from apps.warehouse.models.printer import Printer, PrintJob, UserAppSettings
 
 
 @pytest.fixture
@@ -78,21 +77,17 @@ def test_print_barcode_with_explicit_printer_code(db, client) -> None:
         code="ZEBRA-PRT", description="Pack", ip="10.0.0.1", port=9100
     )
 
-    with patch(
-        "apps.warehouse.core.services.barcode_printer.zebra_printer.print_barcode"
-    ) as mock_print:
-        res = client.post(
-            "/print?printer_code=ZEBRA-PRT",
-            json={"barcode": "WMS-001", "text": "Hello", "copies": 2},
-        )
+    res = client.post(
+        "/print?printer_code=ZEBRA-PRT",
+        json={"barcode": "WMS-001", "text": "Hello", "copies": 2},
+    )
 
     assert res.status_code == 200, res.json()
     body = res.json()
     assert body["success"] is True
-    assert body["data"] == {"printer_code": "ZEBRA-PRT", "copies": 2}
-    mock_print.assert_called_once_with(
-        barcode="WMS-001", text="Hello", ip="10.0.0.1", port=9100, copies=2
-    )
+    job = PrintJob.objects.get()
+    assert body["data"] == {"printer_code": "ZEBRA-PRT", "copies": 2, "job_id": job.pk}
+    assert job.payload == render_labels([Label("WMS-001", "Hello", copies=2)])
 
 
 def test_print_barcode_falls_back_to_user_default_printer(db, client, user) -> None:
@@ -101,17 +96,88 @@ def test_print_barcode_falls_back_to_user_default_printer(db, client, user) -> N
     )
     UserAppSettings.objects.create(user=user, default_printer=printer)
 
-    with patch(
-        "apps.warehouse.core.services.barcode_printer.zebra_printer.print_barcode"
-    ) as mock_print:
-        res = client.post("/print", json={"barcode": "WMS-002"})
+    res = client.post("/print", json={"barcode": "WMS-002"})
 
     assert res.status_code == 200
     assert res.json()["data"]["printer_code"] == "ZEBRA-DEFAULT"
-    mock_print.assert_called_once()
-    assert mock_print.call_args.kwargs["ip"] == "10.0.0.2"
+    assert PrintJob.objects.get().printer == printer
 
 
 def test_print_barcode_no_printer_raises(db, client) -> None:
     with pytest.raises(ApiBaseException, match="No printer specified"):
         client.post("/print", json={"barcode": "WMS-003"})
+
+
+def test_print_labels(db, client) -> None:
+    Printer.objects.create(code="ZEBRA-BULK", ip="10.0.0.4", port=9100)
+
+    res = client.post(
+        "/print/labels?printer_code=ZEBRA-BULK",
+        json={
+            "labels": [
+                {"barcode": "WMS-001", "text": "Bolt"},
+                {"barcode": "WMS-002", "copies": 2},
+            ]
+        },
+    )
+
+    assert res.status_code == 200, res.json()
+    job = PrintJob.objects.get()
+    assert res.json()["data"] == {
+        "printer_code": "ZEBRA-BULK",
+        "label_count": 3,
+        "job_id": job.pk,
+    }
+    assert job.payload == render_labels(
+        [Label("WMS-001", "Bolt"), Label("WMS-002", copies=2)]
+    )
+
+
+def test_label_templates(db, client) -> None:
+    res = client.post(
+        "/templates",
+        json={"code": "BOX", "content": "^XA\n^FD{{ barcode }}^FS\n^XZ"},
+    )
+    assert res.status_code == 200, res.json()
+    assert res.json()["data"]["slots"] == ["barcode"]
+
+    res = client.put(
+        "/templates/BOX",
+        json={"code": "BOX", "content": "^XA\n^FD{{ text }}^FS\n^XZ"},
+    )
+    assert res.json()["data"]["version"] == 2
+
+    res = client.post(
+        "/", json={"code": "ZEBRA-BOX", "ip": "10.0.0.5", "label_template_code": "BOX"}
+    )
+    assert res.json()["data"]["label_template_code"] == "BOX"
+
+    client.post("/print?printer_code=ZEBRA-BOX", json={"barcode": "B", "text": "Box"})
+    assert PrintJob.objects.get().payload == "^XA\n^FDBox^FS\n^XZ"
+
+    res = client.get("/templates")
+    assert [template["code"] for template in res.json()["data"]] == ["BOX"]
+
+
+def test_create_invalid_label_template_raises(db, client) -> None:
+    with pytest.raises(ApiBaseException, match="must start with"):
+        client.post("/templates", json={"code": "BAD", "content": "^FD{{ barcode }}"})
+
+
+def test_get_print_job(db, client, user) -> None:
+    printer = Printer.objects.create(code="ZEBRA-JOB", ip="10.0.0.3")
+    job = PrintJob.objects.create(printer=printer, payload="^XA^XZ", label_count=3)
+
+    res = client.get(f"/jobs/{job.pk}")
+
+    assert res.status_code == 200, res.json()
+    data = res.json()["data"]
+    assert data["id"] == job.pk
+    assert data["printer_code"] == "ZEBRA-JOB"
+    assert data["state"] == "queued"
+    assert (data["label_count"], data["attempts"]) == (3, 0)
+
+
+def test_get_unknown_print_job_raises(db, client) -> None:
+    with pytest.raises(NotFoundException):
+        client.get("/jobs/999")
@@ -7,6 +7,7 @@ from ninja.testing import TestClient
 
 from apps.warehouse.api.routes.product import routes
 from apps.warehouse.core.audit_messages import AuditMessages
+from apps.warehouse.core.exceptions import InvalidCursorError
 from apps.warehouse.core.schemas.product import ProductSchema, GetProductsResponse
 from apps.warehouse.core.services.audit import audit_service
 from apps.warehouse.models.audit import AuditAction, AuditLog
@@ -125,6 +126,46 @@ def test_get_all_pagination(db, client):
     assert response.previous == 1
 
 
+def test_get_all_cursor_pagination(db, client):
+    item_count = 25
+    StockProductFactory.create_batch(item_count)
+    codes = list(StockProduct.objects.order_by("code").values_list("code", flat=True))
+
+    response = GetProductsResponse(**client.get("/?page_size=10&cursor=").data)
+    assert [item.code for item in response.data] == codes[:10]
+    assert response.count is None
+    assert response.previous is None
+    assert isinstance(response.next, str)
+
+    response = GetProductsResponse(
+        **client.get(f"/?page_size=10&cursor={response.next}").data
+    )
+    assert [item.code for item in response.data] == codes[10:20]
+
+    last = GetProductsResponse(
+        **client.get(f"/?page_size=10&cursor={response.next}&with_count=true").data
+    )
+    assert [item.code for item in last.data] == codes[20:]
+    assert last.count == item_count
+    assert last.next is None
+
+    response = GetProductsResponse(
+        **client.get(f"/?page_size=10&cursor={last.previous}").data
+    )
+    assert [item.code for item in response.data] == codes[10:20]
+
+    response = GetProductsResponse(
+        **client.get(f"/?page_size=10&cursor={response.previous}").data
+    )
+    assert [item.code for item in response.data] == codes[:10]
+    assert response.previous is None
+
+
+def test_get_all_cursor_pagination_rejects_malformed_cursor(db, client):
+    with pytest.raises(InvalidCursorError):
+        client.get("/?cursor=not-a-cursor")
+
+
 @pytest.mark.parametrize("attr", ["code", "name"])
 def test_get_all_search(db, client, attr):
     item_count = 200
@@ -293,6 +334,23 @@ def test_get_product_warehouse_availability_includes_pending_inbound_putaway_sto
     assert response.json()["data"]["available_amount"] == "12"
 
 
+def test_get_products_warehouse_availability(db, client):
+    first = cast(StockProduct, StockProductFactory())
+    second = cast(StockProduct, StockProductFactory())
+    WarehouseItemFactory(stock_product=first, amount=5)
+
+    response = client.post(
+        "/warehouse-availability",
+        json={"product_codes": [first.code, second.code, "UNKNOWN"]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert set(data) == {first.code, second.code}
+    assert data[first.code]["total_amount"] == "5"
+    assert data[second.code]["available_amount"] == "0"
+
+
 def test_add_product_barcode_switches_primary(db, client):
     product = cast(StockProduct, StockProductFactory())
     product.attach_barcode(code="1111111111111", is_primary=True)
@@ -337,6 +395,29 @@ def test_get_product_audits(db, client) -> None:
     assert data[1]["action"] == AuditAction.CREATE
 
 
+def test_get_product_audits_is_paginated(db, client) -> None:
+    product = cast(StockProduct, StockProductFactory())
+    now = timezone.now()
+    for minutes in range(3):
+        log = audit_service.add_entry(product, action=AuditAction.UPDATE)
+        AuditLog.objects.filter(pk=log.pk).update(  # type: ignore
+            created=now - timedelta(minutes=minutes)
+        )
+
+    first = client.get(f"/{product.code}/audits", query_params={"page_size": 2}).json()
+    second = client.get(
+        f"/{product.code}/audits",
+        query_params={"page_size": 2, "cursor": first["next"]},
+    ).json()
+
+    assert len(first["data"]) == 2
+    assert len(second["data"]) == 1
+    assert second["next"] is None
+    assert {entry["id"] for entry in first["data"] + second["data"]} == set(
+        AuditLog.objects.for_object(product).values_list("pk", flat=True)  # type: ignore
+    )
+
+
 def test_get_product_returns_dynamic_prices(db, client):
     product = cast(StockProduct, StockProductFactory())
     customer_for_override = CustomerFactory()
@@ -15,6 +15,7 @@ from apps.warehouse.core.audit_messages import AuditMessages
 from apps.warehouse.core.services.audit import audit_service
 from apps.warehouse.core.services.warehouse import warehouse_service
 from apps.warehouse.models.audit import AuditAction, AuditLog
+from apps.warehouse.models.barcode import attach_barcode
 from apps.warehouse.models.product import StockProduct
 from apps.warehouse.models.warehouse import (
     InboundWarehouseOrderState,
@@ -613,3 +614,22 @@ def test_transition_inbound_order_from_pending_is_disallowed(db, client):
             f"orders-incoming/{warehouse_order.code}/transition",
             json={},
         )
+
+
+def test_barcode_lookup_batch_keeps_input_order(db, client):
+    product = cast(StockProduct, StockProductFactory())
+    product.attach_barcode("8590000000010")
+    location = WarehouseLocationFactory()
+    attach_barcode(location, "LOC-BATCH-SCAN")
+    WarehouseItemFactory(stock_product=product, location=location)
+
+    response = client.post(
+        "barcode-lookup/batch",
+        json={"barcodes": ["LOC-BATCH-SCAN", "missing", "8590000000010"]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [entry["entity_type"] for entry in data] == ["location", None, "product"]
+    assert [entry["found"] for entry in data] == [True, False, True]
+    assert data[2]["product"]["code"] == product.code
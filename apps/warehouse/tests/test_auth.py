@@ -1,6 +1,16 @@
+import jwt
 import pytest
 from django.contrib.auth.models import User
 
+from apps.warehouse.core.auth import (
+    JWT_ALGORITHM,
+    JWT_SECRET,
+    TokenAuth,
+    generate_access_token,
+    generate_refresh_token,
+)
+from apps.warehouse.core.schemas.context import RequestContext
+
 
 @pytest.fixture
 def user():
@@ -11,3 +21,53 @@ def user():
 @pytest.mark.django_db
 def test_hello(user):
     assert user.username == "john"
+
+
+@pytest.mark.django_db
+def test_token_auth_caches_user_per_token(user, django_assert_num_queries):
+    token = generate_access_token(user)
+    auth = TokenAuth()
+
+    with django_assert_num_queries(1):
+        assert auth.authenticate(None, token) == user
+    with django_assert_num_queries(0):
+        cached = auth.authenticate(None, token)
+    assert cached == user
+    assert cached is not auth.authenticate(None, token)
+
+
+@pytest.mark.django_db
+def test_token_auth_drops_changed_users(user, django_assert_num_queries):
+    token = generate_access_token(user)
+    auth = TokenAuth()
+    auth.authenticate(None, token)
+
+    user.first_name = "Johnny"
+    user.save()
+    with django_assert_num_queries(1):
+        assert auth.authenticate(None, token).first_name == "Johnny"
+
+    user.is_active = False
+    user.save()
+    assert auth.authenticate(None, token) is None
+
+
+@pytest.mark.django_db
+def test_token_auth_rejects_refresh_and_forged_tokens(user):
+    forged = jwt.encode(
+        {"user_id": user.pk, "token_type": "access"}, "other-secret", JWT_ALGORITHM
+    )
+    assert jwt.decode(generate_refresh_token(user), JWT_SECRET, [JWT_ALGORITHM])
+
+    assert TokenAuth().authenticate(None, generate_refresh_token(user)) is None
+    assert TokenAuth().authenticate(None, forged) is None
+
+
+@pytest.mark.django_db
+def test_request_context_resolves_user_once(user, django_assert_num_queries):
+    context = RequestContext(user_id=user.pk, username=user.username)
+
+    with django_assert_num_queries(1):
+        assert context.user == user
+        assert context.user == user
+    assert RequestContext().user is None
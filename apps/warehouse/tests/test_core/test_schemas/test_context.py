@@ -10,3 +10,13 @@ def test_from_django_request_accepts_typed_user_values() -> None:
 
     assert context.user_id == 7
     assert context.username == "john"
+
+
+def test_from_django_request_reuses_authenticated_user(
+    user, django_assert_num_queries
+) -> None:
+    req = SimpleNamespace(user=user)
+
+    with django_assert_num_queries(0):
+        context = RequestContext.from_django_request(req)  # type: ignore
+        assert context.user is user
@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.warehouse.core.services.analytics import analytics_service
+from apps.warehouse.core.services.rollups import rollup_service
+from apps.warehouse.models.orders import InboundOrder, InboundOrderState
+from apps.warehouse.tests.factories.order import InboundOrderFactory
+
+
+def _order(state: int, created_days_ago: int, changed_days_ago: int) -> None:
+    now = timezone.now()
+    order = InboundOrderFactory.it(state=state)
+    InboundOrder.objects.filter(pk=order.pk).update(
+        created=now - timedelta(days=created_days_ago),
+        changed=now - timedelta(days=changed_days_ago),
+    )
+
+
+def test_active_orders_series(db):
+    _order(InboundOrderState.SUBMITTED, created_days_ago=10, changed_days_ago=10)
+    _order(InboundOrderState.RECEIVING, created_days_ago=3, changed_days_ago=1)
+    _order(InboundOrderState.COMPLETED, created_days_ago=8, changed_days_ago=2)
+    _order(InboundOrderState.CANCELLED, created_days_ago=9, changed_days_ago=7)
+    _order(InboundOrderState.COMPLETED, created_days_ago=1, changed_days_ago=1)
+    rollup_service.rebuild()
+
+    series = analytics_service.get_active_orders(days=6).inbound
+
+    # Days ago: 5, 4, 3, 2, 1, 0
+    assert [point.value for point in series] == [2, 2, 3, 2, 2, 2]
+
+
+def test_active_orders_take_constant_number_of_queries(db, django_assert_num_queries):
+    _order(InboundOrderState.SUBMITTED, created_days_ago=40, changed_days_ago=20)
+
+    rollup_service.rebuild()
+
+    with django_assert_num_queries(2):
+        analytics_service.get_active_orders(days=7)
+    with django_assert_num_queries(2):
+        result = analytics_service.get_active_warehouse_orders(days=90)
+    assert len(result.inbound) == 90
@@ -1,12 +1,19 @@
 from datetime import timedelta
 
+from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 import pytest
 
 from apps.warehouse.core.audit_messages import AuditMessages
+from apps.warehouse.core.exceptions import InvalidCursorError
+from apps.warehouse.core.services.audit_writer import (
+    AUDIT_WRITE_BUFFERED,
+    AUDIT_WRITE_IMMEDIATE,
+)
 from apps.warehouse.core.services.audit import (
     audit_log_to_timeline_entry,
     audit_service,
+    choice_label_registry,
 )
 from apps.warehouse.models.audit import AuditAction, AuditLog, create_audit_log
 from apps.warehouse.models.orders import (
@@ -33,6 +40,22 @@ from apps.warehouse.tests.factories.warehouse import (
 )
 
 
+@pytest.fixture(
+    autouse=True,
+    params=[
+        AUDIT_WRITE_IMMEDIATE,
+        # Buffered entries are written on commit, so these tests have to commit.
+        pytest.param(
+            AUDIT_WRITE_BUFFERED,
+            marks=pytest.mark.django_db(transaction=True, serialized_rollback=True),
+        ),
+    ],
+)
+def audit_write_mode(request, settings, immediate_audit_writes):
+    settings.AUDIT_WRITE_MODE = request.param
+    return request.param
+
+
 def test_create_audit_log_helper_and_queryset(db):
     item = WarehouseItemFactory()
     user = UserFactory()
@@ -96,6 +119,81 @@ def test_timeline_includes_related_movements_and_is_ordered(db):
     assert timeline[1].action == AuditAction.CREATE
 
 
+def _timeline_fixture(entries: int):
+    """An item with alternating audit logs and movements, one minute apart."""
+    location = WarehouseLocationFactory.it()
+    item = WarehouseItemFactory.it(location=location)
+    AuditLog.objects.all().delete()
+    destination = WarehouseLocationFactory.it(warehouse=location.warehouse)
+    start = timezone.now() - timedelta(hours=1)
+    expected = []
+    for index in range(entries):
+        # Every third entry shares the timestamp of its predecessor.
+        happened_at = start + timedelta(minutes=index - index // 3)
+        if index % 2:
+            movement = WarehouseMovement.objects.create(
+                location_from=item.location,
+                location_to=destination,
+                stock_product=item.stock_product,
+                amount=1,
+                item=item,
+            )
+            WarehouseMovement.objects.filter(pk=movement.pk).update(
+                moved_at=happened_at
+            )
+            expected.append(("movement", movement.pk, happened_at))
+        else:
+            log = audit_service.add_entry(item, action=AuditAction.UPDATE)
+            AuditLog.objects.filter(pk=log.pk).update(created=happened_at)
+            expected.append(("audit", log.pk, happened_at))
+    expected.sort(key=lambda entry: (entry[2], entry[0], entry[1]), reverse=True)
+    return item, start, expected
+
+
+def test_timeline_pages_through_merged_sources(db, django_assert_max_num_queries):
+    item, _, expected = _timeline_fixture(10)
+
+    seen = []
+    cursor = None
+    while True:
+        with django_assert_max_num_queries(3):
+            page = audit_service.get_timeline_page(item, cursor=cursor, page_size=3)
+        seen.extend(
+            (entry.source, entry.id, entry.happened_at) for entry in page.entries
+        )
+        cursor = page.next
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert [
+        (entry.source, entry.id)
+        for entry in audit_service.get_timeline_for_object(item)
+    ] == [(source, entry_id) for source, entry_id, _ in expected]
+
+
+def test_timeline_filters_by_time_range(db):
+    item, start, expected = _timeline_fixture(6)
+    from_date = start + timedelta(minutes=1)
+    to_date = start + timedelta(minutes=2)
+
+    page = audit_service.get_timeline_page(item, from_date=from_date, to_date=to_date)
+
+    assert [(entry.source, entry.id) for entry in page.entries] == [
+        (source, entry_id)
+        for source, entry_id, happened_at in expected
+        if from_date <= happened_at <= to_date
+    ]
+    assert page.next is None
+
+
+def test_timeline_rejects_malformed_cursor(db):
+    with pytest.raises(InvalidCursorError):
+        audit_service.get_timeline_page(
+            WarehouseItemFactory.it(), cursor="not-a-cursor"
+        )
+
+
 @pytest.mark.parametrize(
     (
         "factory",
@@ -173,3 +271,39 @@ def test_timeline_formats_choice_labels_for_state_transitions(
         new_state=expected_new,
     )
     assert entry.changes["state"] == {"old": expected_old, "new": expected_new}
+
+
+def test_recent_activity_formats_labels_in_a_single_query(
+    db, django_assert_num_queries
+):
+    orders = [
+        InboundOrderFactory.it(state=InboundOrderState.DRAFT),
+        OutboundOrderFactory.it(state=OutboundOrderState.DRAFT),
+    ]
+    AuditLog.objects.all().delete()
+    for order in orders:
+        for _ in range(3):
+            create_audit_log(
+                obj=order,
+                action=AuditAction.TRANSITION,
+                changes={"state": {"old": 1, "new": 2}},
+                reason="'1' -> '2'",
+            )
+
+    with django_assert_num_queries(1):
+        entries = audit_service.get_recent_activity(limit=6)
+
+    assert (
+        sorted(entry.message for entry in entries)
+        == ["'Calculation' -> 'Submitted'"] * 3 + ["'Draft' -> 'Submitted'"] * 3
+    )
+
+
+def test_choice_label_registry_covers_audited_models():
+    labels = choice_label_registry.for_content_type(
+        ContentType(app_label="warehouse", model="inboundorder")
+    )
+
+    assert labels["state"][InboundOrderState.RECEIVING] == "Receiving"
+    assert labels["state"][str(InboundOrderState.RECEIVING)] == "Receiving"
+    assert "code" not in labels
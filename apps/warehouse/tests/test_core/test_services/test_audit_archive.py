@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+import pytest
+
+from apps.warehouse.core.services.audit import audit_service
+from apps.warehouse.core.services.audit_archive import (
+    _month_start,
+    audit_archive_service,
+)
+from apps.warehouse.models.audit import AuditAction, AuditLog, create_audit_log
+from apps.warehouse.models.orders import InboundOrderState
+from apps.warehouse.tests.factories.order import InboundOrderFactory
+from apps.warehouse.tests.factories.user import UserFactory
+
+
+@pytest.fixture
+def archive_dir(settings, tmp_path):
+    settings.AUDIT_ARCHIVE_DIR = str(tmp_path)
+    return tmp_path
+
+
+def _log_at(obj, created: datetime, **kwargs) -> AuditLog:
+    log = create_audit_log(obj=obj, action=AuditAction.UPDATE, **kwargs)
+    AuditLog.objects.filter(pk=log.pk).update(created=created)
+    return log
+
+
+def test_archive_moves_old_months_to_files(db, archive_dir):
+    now = timezone.now()
+    order = InboundOrderFactory.it()
+    AuditLog.objects.all().delete()
+    # The last hour of the fourth and the first hours of the third month back.
+    oldest = _log_at(order, _month_start(now, 3) - timedelta(hours=1))
+    older = _log_at(order, _month_start(now, 3) + timedelta(hours=8))
+    kept = _log_at(order, _month_start(now, 2) + timedelta(days=14))
+
+    call_command("archive_audit_logs", months=2)
+
+    assert list(AuditLog.objects.values_list("pk", flat=True)) == [kept.pk]
+    assert sorted(
+        path.name[: len("audit-YYYY-MM")] for path in archive_dir.iterdir()
+    ) == [f"audit-{_month_start(now, months).strftime('%Y-%m')}" for months in (4, 3)]
+    assert sorted(record["id"] for record in audit_archive_service.iter_records()) == [
+        oldest.pk,
+        older.pk,
+    ]
+
+    # Nothing left to archive, a repeated run is a no-op.
+    assert audit_archive_service.archive(2) == {}
+
+
+def test_archived_entries_are_searchable(db, archive_dir):
+    start = _month_start(timezone.now(), 3)
+    user = UserFactory()
+    order, other = InboundOrderFactory.it(), InboundOrderFactory.it()
+    AuditLog.objects.all().delete()
+    older = _log_at(
+        order,
+        start + timedelta(days=4),
+        user=user,
+        changes={
+            "state": {
+                "old": InboundOrderState.DRAFT,
+                "new": InboundOrderState.SUBMITTED,
+            }
+        },
+    )
+    newer = _log_at(order, _month_start(start, -1) + timedelta(days=4))
+    _log_at(other, _month_start(start, -1) + timedelta(days=5))
+    audit_archive_service.archive(1)
+    assert not AuditLog.objects.exists()
+
+    entries = audit_service.search_archive(order)
+
+    assert [entry.id for entry in entries] == [newer.pk, older.pk]
+    assert entries[1].actor_user == user.username
+    assert entries[1].changes["state"] == {"old": "Draft", "new": "Submitted"}
+
+    from_second_month = audit_service.search_archive(
+        order, from_date=_month_start(start, -1)
+    )
+    assert [entry.id for entry in from_second_month] == [newer.pk]
+    assert len(audit_service.search_archive(to_date=timezone.now())) == 3
+    assert audit_service.search_archive(order, from_date=timezone.now()) == []
@@ -0,0 +1,126 @@
+import json
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+import pytest
+
+from apps.warehouse.core.services.audit import audit_service
+from apps.warehouse.core.services.audit_writer import audit_writer
+from apps.warehouse.models.audit import AuditAction, AuditLog
+from apps.warehouse.models.warehouse import WarehouseItem
+from apps.warehouse.tests.factories.warehouse import WarehouseItemFactory
+
+
+@pytest.fixture
+def buffered(settings):
+    settings.AUDIT_WRITE_MODE = "buffered"
+
+
+@pytest.fixture
+def queued(settings, tmp_path):
+    settings.AUDIT_WRITE_MODE = "queue"
+    settings.AUDIT_QUEUE_DIR = str(tmp_path)
+    return tmp_path
+
+
+def test_buffered_entries_are_inserted_at_once_on_commit(
+    db,
+    buffered,
+    user,
+    django_capture_on_commit_callbacks,
+    django_assert_num_queries,
+):
+    items = WarehouseItemFactory.create_batch(3)
+    AuditLog.objects.all().delete()
+    ContentType.objects.get_for_model(WarehouseItem)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        with django_assert_num_queries(0):
+            for item in items:
+                audit_service.add_entry(item, AuditAction.UPDATE, user=user.pk)
+        assert not AuditLog.objects.exists()
+
+    assert len(callbacks) == 1
+    with django_assert_num_queries(1):
+        callbacks[0]()
+
+    logs = AuditLog.objects.order_by("object_id")
+    assert [log.object_id for log in logs] == sorted(item.pk for item in items)
+    assert {log.user_id for log in logs} == {user.pk}
+
+
+def test_buffered_entries_of_rolled_back_savepoint_are_dropped(
+    db, buffered, django_capture_on_commit_callbacks
+):
+    kept, dropped = WarehouseItemFactory.create_batch(2)
+    AuditLog.objects.all().delete()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        audit_service.add_entry(kept, AuditAction.UPDATE)
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                audit_service.add_entry(dropped, AuditAction.UPDATE)
+                raise RuntimeError
+        audit_service.add_entry(kept, AuditAction.TRANSITION)
+
+    assert sorted(AuditLog.objects.values_list("object_id", "action")) == [
+        (kept.pk, AuditAction.TRANSITION),
+        (kept.pk, AuditAction.UPDATE),
+    ]
+
+
+def test_queued_entries_are_loaded_by_drain(
+    db, queued, user, monkeypatch, django_capture_on_commit_callbacks
+):
+    item = WarehouseItemFactory()
+    AuditLog.objects.all().delete()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        audit_service.add_entry(
+            item,
+            AuditAction.UPDATE,
+            user=user.pk,
+            changes={"amount": {"old": "1", "new": "2"}},
+            reason="Correction",
+        )
+    added_at = timezone.now()
+    assert not AuditLog.objects.exists()
+    assert len(list(queued.iterdir())) == 1
+
+    later = added_at + timedelta(hours=1)
+    monkeypatch.setattr(timezone, "now", lambda: later)
+    call_command("drain_audit_queue")
+
+    log = AuditLog.objects.get()
+    assert log.content_object == item
+    assert log.user == user
+    assert log.changes == {"amount": {"old": "1", "new": "2"}}
+    assert log.reason == "Correction"
+    assert log.created <= added_at
+    assert list(queued.iterdir()) == []
+    assert audit_writer.drain_queue() == 0
+
+
+def test_drain_keeps_entries_with_malformed_timestamps_queued(db, queued):
+    item = WarehouseItemFactory()
+    AuditLog.objects.all().delete()
+    line = {
+        "user_id": None,
+        "action": AuditAction.UPDATE,
+        "content_type_id": ContentType.objects.get_for_model(item).pk,
+        "object_id": item.pk,
+        "object_repr": str(item),
+        "changes": {},
+        "reason": None,
+        "created": "yesterday",
+    }
+    (queued / "1.jsonl").write_text(json.dumps(line) + "\n")
+
+    with pytest.raises(ValueError):
+        audit_writer.drain_queue()
+
+    assert not AuditLog.objects.exists()
+    assert len(list(queued.iterdir())) == 1
@@ -0,0 +1,154 @@
+from apps.warehouse.core.services.barcode_resolution import (
+    BarcodeResolutionCache,
+    barcode_resolution_cache,
+)
+from apps.warehouse.core.services.warehouse import warehouse_service
+from apps.warehouse.models.barcode import Barcode, attach_barcode
+from apps.warehouse.models.product import StockProduct
+from apps.warehouse.tests.factories.order import (
+    OutboundOrderFactory,
+    OutboundOrderItemFactory,
+)
+from apps.warehouse.tests.factories.packaging import BatchFactory
+from apps.warehouse.tests.factories.product import StockProductFactory
+from apps.warehouse.tests.factories.warehouse import (
+    OutboundWarehouseOrderItemFactory,
+    WarehouseItemFactory,
+    WarehouseLocationFactory,
+)
+
+
+def test_lookup_unknown_barcode(db):
+    result = warehouse_service.barcode_lookup("does-not-exist")
+    assert result.found is False
+    assert result.entity_type is None
+
+
+def test_lookup_product_with_matching_items(db):
+    product = StockProductFactory.it()
+    product.attach_barcode("8590000000001")
+    WarehouseItemFactory.create_batch(2, stock_product=product)
+    WarehouseItemFactory()
+
+    result = warehouse_service.barcode_lookup("8590000000001")
+
+    assert result.found is True
+    assert result.entity_type == "product"
+    assert result.product.code == product.code
+    assert len(result.matching_items) == 2
+
+
+def test_lookup_location_filters_by_product(db):
+    location = WarehouseLocationFactory.it()
+    attach_barcode(location, "LOC-SCAN")
+    item = WarehouseItemFactory(location=location)
+    WarehouseItemFactory(location=location)
+
+    result = warehouse_service.barcode_lookup(
+        "LOC-SCAN", product_code=item.stock_product.code
+    )
+
+    assert result.entity_type == "location"
+    assert result.location.code == location.code
+    assert [match.id for match in result.matching_items] == [item.pk]
+
+
+def test_lookup_batch(db):
+    batch = BatchFactory()
+    attach_barcode(batch, "BATCH-SCAN")
+    WarehouseItemFactory(batch=batch)
+
+    result = warehouse_service.barcode_lookup("BATCH-SCAN")
+
+    assert result.entity_type == "batch"
+    assert result.batch.id == batch.pk
+    assert len(result.matching_items) == 1
+
+
+def test_lookup_assigned_warehouse_item_is_not_found(db):
+    item = WarehouseItemFactory()
+    item.attach_barcode("ITEM-SCAN")
+    assert warehouse_service.barcode_lookup("ITEM-SCAN").entity_type == "warehouse_item"
+
+    OutboundWarehouseOrderItemFactory(
+        source_order_item=OutboundOrderItemFactory(
+            order=OutboundOrderFactory(), stock_product=item.stock_product
+        ),
+        warehouse_item=item,
+    )
+    assert warehouse_service.barcode_lookup("ITEM-SCAN").found is False
+
+
+def test_warm_scan_takes_at_most_two_queries(db, django_assert_max_num_queries):
+    product = StockProductFactory.it()
+    product.attach_barcode("8590000000002")
+    WarehouseItemFactory.create_batch(3, stock_product=product)
+    assert barcode_resolution_cache.resolve("8590000000002") == (
+        StockProduct,
+        product.pk,
+    )
+
+    with django_assert_max_num_queries(2):
+        model_class, object_id = barcode_resolution_cache.resolve("8590000000002")
+        entities = warehouse_service._fetch_scanned_entities(model_class, [object_id])
+        assert len(entities[object_id].scan_items) == 3
+
+
+def test_barcode_changes_invalidate_cache(db):
+    first = StockProductFactory.it()
+    second = StockProductFactory.it()
+    barcode = first.attach_barcode("8590000000003")
+    assert warehouse_service.barcode_lookup("8590000000003").product.code == first.code
+
+    barcode.delete()
+    assert warehouse_service.barcode_lookup("8590000000003").found is False
+
+    second.attach_barcode("8590000000003")
+    assert warehouse_service.barcode_lookup("8590000000003").product.code == second.code
+
+    Barcode.objects.get(code="8590000000003").delete()
+    third = StockProductFactory.it()
+    renamed = third.attach_barcode("8590000000004")
+    renamed.code = "8590000000003"
+    renamed.save()
+    assert warehouse_service.barcode_lookup("8590000000003").product.code == third.code
+
+
+def test_cache_evicts_least_recently_used(db):
+    cache = BarcodeResolutionCache(max_size=2)
+    products = StockProductFactory.create_batch(3)
+    for index, product in enumerate(products):
+        product.attach_barcode(f"LRU-{index}")
+
+    cache.resolve("LRU-0")
+    cache.resolve("LRU-1")
+    cache.resolve("LRU-0")
+    cache.resolve("LRU-2")
+
+    assert list(cache._entries) == ["LRU-0", "LRU-2"]
+
+
+def test_batch_lookup_fetches_once_per_entity_type(db, django_assert_num_queries):
+    products = StockProductFactory.create_batch(3)
+    for index, product in enumerate(products):
+        product.attach_barcode(f"BULK-P{index}")
+        WarehouseItemFactory(stock_product=product)
+    locations = WarehouseLocationFactory.create_batch(2)
+    for index, location in enumerate(locations):
+        attach_barcode(location, f"BULK-L{index}")
+    codes = ["BULK-L1", "BULK-P2", "unknown", "BULK-P0", "BULK-L0", "BULK-P1"]
+
+    # One barcode query, then entity + items prefetch for each of the two types
+    with django_assert_num_queries(5):
+        resolved = barcode_resolution_cache.resolve_many(codes)
+        for model_class in {model for model, _ in resolved.values()}:
+            warehouse_service._fetch_scanned_entities(
+                model_class,
+                [pk for model, pk in resolved.values() if model is model_class],
+            )
+
+    results = warehouse_service.barcode_lookup_many(codes)
+    assert [result.found for result in results] == [True, True, False, True, True, True]
+    assert results[0].location.code == locations[1].code
+    assert results[1].product.code == products[2].code
+    assert results[3].product.code == products[0].code
@@ -0,0 +1,73 @@
+from django.core.cache import cache
+
+from apps.warehouse.core.services.count_cache import _VERSION_KEY, count_cache_service
+from apps.warehouse.models.product import StockProduct
+from apps.warehouse.models.sequence import DocumentSequence
+from apps.warehouse.tests.factories.product import StockProductFactory
+
+
+def test_count_is_served_from_cache(db, django_assert_num_queries):
+    StockProductFactory.create_batch(3)
+
+    with django_assert_num_queries(1):
+        assert count_cache_service.count(StockProduct.objects.all()) == 3
+    with django_assert_num_queries(0):
+        assert count_cache_service.count(StockProduct.objects.order_by("-code")) == 3
+
+
+def test_count_is_keyed_by_filters(db):
+    first, *_ = StockProductFactory.create_batch(3)
+
+    assert count_cache_service.count(StockProduct.objects.all()) == 3
+    assert count_cache_service.count(StockProduct.objects.filter(code=first.code)) == 1
+
+
+def test_write_invalidates_count(db):
+    product = StockProductFactory()
+    assert count_cache_service.count(StockProduct.objects.all()) == 1
+
+    StockProductFactory()
+    assert count_cache_service.count(StockProduct.objects.all()) == 2
+
+    product.delete()
+    assert count_cache_service.count(StockProduct.objects.all()) == 1
+
+
+def test_write_to_joined_table_invalidates_count(db):
+    product = StockProductFactory()
+    queryset = StockProduct.objects.filter(group__name=product.group.name)
+    assert count_cache_service.count(queryset) == 1
+
+    product.group.name = "renamed"
+    product.group.save()
+    assert count_cache_service.count(queryset) == 0
+
+
+def test_evicted_version_does_not_revive_older_counts(db):
+    StockProductFactory()
+    cache.clear()
+    assert count_cache_service.count(StockProduct.objects.all()) == 1
+
+    StockProductFactory()
+    cache.delete(_VERSION_KEY.format(table=StockProduct._meta.db_table))
+    assert count_cache_service.count(StockProduct.objects.all()) == 2
+
+
+def test_writes_to_other_models_leave_the_cache_alone(db, monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(count_cache_service, "invalidate", invalidated.append)
+
+    DocumentSequence.objects.create(name="test", period="202610")
+    assert invalidated == []
+
+    StockProductFactory()
+    assert StockProduct in invalidated
+
+
+def test_counts_reading_other_tables_are_not_cached(db, django_assert_num_queries):
+    StockProductFactory()
+    queryset = StockProduct.objects.filter(dynamic_prices__isnull=True)
+
+    for _ in range(2):
+        with django_assert_num_queries(1):
+            assert count_cache_service.count(queryset) == 1
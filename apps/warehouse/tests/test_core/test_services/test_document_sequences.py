@@ -0,0 +1,70 @@
+import pytest
+from django.db import transaction
+from django.utils import timezone
+
+from apps.warehouse.core.services.document_sequences import (
+    document_sequences_service,
+    last_code_seed,
+)
+from apps.warehouse.core.services.manufacturing import manufacturing_orders_service
+from apps.warehouse.core.services.orders import inbound_orders_service
+from apps.warehouse.core.services.outbound_orders import outbound_orders_service
+from apps.warehouse.models.manufacturing import ManufacturingOrder
+from apps.warehouse.models.sequence import DocumentSequence
+from apps.warehouse.tests.factories.manufacturing import ManufacturingOrderFactory
+
+
+@pytest.fixture
+def period() -> str:
+    now = timezone.now()
+    return f"{now.year}{now.month:02d}"
+
+
+def test_next_code_continues_after_existing_documents(
+    db, period, django_assert_max_num_queries
+):
+    ManufacturingOrderFactory(code=f"PV{period}0007")
+    ManufacturingOrderFactory(code=f"PV{period}0003")
+
+    assert manufacturing_orders_service.generate_next_code() == f"PV{period}0008"
+    # Once the period has a counter row, the orders are no longer scanned.
+    with django_assert_max_num_queries(4) as queries:
+        code = manufacturing_orders_service.generate_next_code()
+
+    assert code == f"PV{period}0009"
+    assert not any("manufacturingorder" in query["sql"] for query in queries)
+    assert DocumentSequence.objects.get(name="manufacturing_order").last_number == 9
+
+
+def test_allocate_reserves_consecutive_block(db, period):
+    seed = last_code_seed(ManufacturingOrder.objects.all())
+
+    codes = document_sequences_service.allocate("bulk", "B", count=3, seed=seed)
+    following = document_sequences_service.next_code("bulk", "B", seed=seed)
+
+    assert codes == [f"B{period}0001", f"B{period}0002", f"B{period}0003"]
+    assert following == f"B{period}0004"
+
+
+def test_allocate_invalid_count_raises(db):
+    with pytest.raises(ValueError, match="at least 1"):
+        document_sequences_service.allocate("bulk", "B", count=0)
+
+
+def test_rolled_back_number_is_issued_again(db, period):
+    document_sequences_service.next_code("rollback", "R")
+
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            document_sequences_service.next_code("rollback", "R")
+            raise RuntimeError("create failed")
+
+    assert document_sequences_service.next_code("rollback", "R") == f"R{period}0002"
+
+
+def test_documents_sharing_prefix_have_own_sequences(db, period):
+    inbound = inbound_orders_service.generate_next_incoming_order_code()
+    outbound = outbound_orders_service.generate_next_outgoing_order_code()
+
+    assert inbound == outbound == f"OV{period}0001"
+    assert DocumentSequence.objects.count() == 2
@@ -142,11 +142,13 @@ def test_incoming_order_add_item_assigns_next_index(db):
 
 def test_incoming_order_update_item_can_change_index(db):
     order = InboundOrderFactory.it()
-    item = InboundOrderItemFactory.it(order=order, index=5)
+    item = InboundOrderItemFactory.it(order=order)
+    InboundOrderItemFactory.it(order=order)
+    InboundOrderItemFactory.it(order=order)
 
     result = inbound_orders_service.update_item(
         order.code,
-        item.index,
+        0,
         InboundOrderItemCreateSchema(
             product_code=item.stock_product.code,
             product_name=item.stock_product.name,
@@ -156,9 +158,8 @@ def test_incoming_order_update_item_can_change_index(db):
         ),
     )
 
-    item.refresh_from_db()
-    assert item.index == 2
     assert result.index == 2
+    assert list(order.items.values_list("pk", flat=True))[2] == item.pk
 
 
 def test_incoming_order_remove_item(db):
@@ -166,9 +167,11 @@ def test_incoming_order_remove_item(db):
     item = InboundOrderItemFactory.it(order=order, index=99)
     InboundOrderItemFactory.create_batch(9, order=order)
 
-    assert inbound_orders_service.remove_item(order.code, item.index)
+    # The item with the highest index is the last of the ten.
+    assert inbound_orders_service.remove_item(order.code, 9)
 
     assert order.items.count() == 9
+    assert not order.items.filter(pk=item.pk).exists()
 
 
 def test_incoming_order_duplicate_product_remove_each_by_index(db):
@@ -177,12 +180,13 @@ def test_incoming_order_duplicate_product_remove_each_by_index(db):
     item_a = InboundOrderItemFactory.it(order=order, stock_product=product, index=0)
     item_b = InboundOrderItemFactory.it(order=order, stock_product=product, index=1)
 
-    assert order.items.count() == 2
+    assert list(order.items.order_by("index")) == [item_a, item_b]
 
-    assert inbound_orders_service.remove_item(order.code, item_a.index)
-    assert order.items.count() == 1
+    assert inbound_orders_service.remove_item(order.code, 0)
+    assert list(order.items.all()) == [item_b]
 
-    assert inbound_orders_service.remove_item(order.code, item_b.index)
+    # item_b has moved up to the first position
+    assert inbound_orders_service.remove_item(order.code, 0)
     assert order.items.count() == 0
 
 
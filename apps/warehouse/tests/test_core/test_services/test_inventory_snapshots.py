@@ -7,9 +7,14 @@ from apps.warehouse.core.exceptions import WarehouseGenericError
 from apps.warehouse.core.services.inventory_snapshots import inventory_snapshot_service
 from apps.warehouse.models.orders import InboundOrder
 from apps.warehouse.models.warehouse import (
+    InboundWarehouseOrder,
     InboundWarehouseOrderState,
+    InventorySnapshot,
+    InventorySnapshotLine,
     InventorySnapshotTriggerSource,
+    WarehouseItem,
 )
+from apps.warehouse.tests.factories.manufacturing import ManufacturingOrderFactory
 from apps.warehouse.tests.factories.warehouse import (
     InboundWarehouseOrderFactory,
     InboundWarehouseOrderItemFactory,
@@ -121,6 +126,35 @@ def test_create_snapshot_groups_purchase_and_receipt_totals_by_currency(db):
     }
 
 
+def test_create_snapshot_handles_items_without_order_or_location(db):
+    manufactured = create_snapshot_item(
+        product_code="SNAP-MFG",
+        location_code="C-01",
+        quantity="2",
+        purchase_price="5.00",
+        receipt_price="4.00",
+    )
+    unplaced = create_snapshot_item(
+        product_code="SNAP-NOLOC",
+        location_code="C-02",
+        quantity="1",
+        purchase_price="5.00",
+    )
+    InboundWarehouseOrder.objects.filter(pk=manufactured.order_in.pk).update(
+        order=None, manufacturing_order=ManufacturingOrderFactory()
+    )
+    WarehouseItem.objects.filter(pk=unplaced.pk).update(location=None)
+
+    snapshot = inventory_snapshot_service.create_snapshot()
+
+    line = InventorySnapshotLine.objects.get(snapshot_id=snapshot.id)
+    assert line.warehouse_item_id_at_snapshot == manufactured.pk
+    assert line.receipt_price_available is False
+    assert line.receipt_price_fallback_reason == "missing_source_order"
+    assert snapshot.receipt_unpriced_line_count == 1
+    assert snapshot.receipt_totals == []
+
+
 def test_create_scheduled_snapshot_rejects_duplicate_bucket(db):
     create_snapshot_item(
         product_code="SNAP-DUP",
@@ -142,3 +176,148 @@ def test_create_scheduled_snapshot_rejects_duplicate_bucket(db):
             cadence="daily",
             bucket_key="2026-04-28",
         )
+
+
+def test_stream_snapshot_writes_lines_in_batches(db):
+    for index in range(5):
+        create_snapshot_item(
+            product_code=f"SNAP-STREAM-{index}",
+            location_code=f"D-0{index}",
+            quantity="2",
+            purchase_price="1.50",
+            receipt_price="1.00" if index % 2 else None,
+        )
+    progress: list[tuple[int, int]] = []
+
+    summary = inventory_snapshot_service.stream_snapshot(
+        chunk_size=2,
+        on_progress=lambda written, total: progress.append((written, total)),
+    )
+
+    assert progress == [(2, 5), (4, 5), (5, 5)]
+    assert summary.line_count == 5
+    assert summary.receipt_unpriced_line_count == 3
+    assert {row.currency: row.value for row in summary.purchase_totals} == {
+        "CZK": Decimal("15.0000")
+    }
+    assert {row.currency: row.value for row in summary.receipt_totals} == {
+        "CZK": Decimal("4.0000")
+    }
+    detail = inventory_snapshot_service.get_snapshot(summary.id)
+    assert [line.product_code for line in detail.lines] == [
+        f"SNAP-STREAM-{index}" for index in range(5)
+    ]
+
+
+def test_failed_stream_snapshot_is_discarded(db):
+    create_snapshot_item(
+        product_code="SNAP-FAIL",
+        location_code="E-01",
+        quantity="1",
+        purchase_price="1.00",
+    )
+
+    def fail(written: int, total: int) -> None:
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        inventory_snapshot_service.stream_snapshot(on_progress=fail)
+
+    assert not InventorySnapshot.objects.exists()
+    assert not InventorySnapshotLine.objects.exists()
+
+
+def test_incomplete_snapshot_is_not_listed(db):
+    InventorySnapshot.objects.create(is_complete=False)
+
+    assert not inventory_snapshot_service.list_snapshots_queryset().exists()
+    assert inventory_snapshot_service.get_latest_snapshot_value().snapshot is None
+
+
+def _line_values(snapshot_id: int) -> list[tuple[str, Decimal]]:
+    detail = inventory_snapshot_service.get_snapshot(snapshot_id)
+    return [(line.product_code, line.quantity) for line in detail.lines]
+
+
+def test_delta_snapshot_stores_only_changes(db):
+    kept, moved, sold, *_ = (
+        create_snapshot_item(
+            product_code=f"SNAP-DELTA-{index}",
+            location_code=f"F-0{index}",
+            quantity="4",
+            purchase_price="2.00",
+        )
+        for index in range(6)
+    )
+    base = inventory_snapshot_service.create_snapshot()
+
+    moved.amount = Decimal("3")
+    moved.save()
+    sold.delete()
+    create_snapshot_item(
+        product_code="SNAP-DELTA-6",
+        location_code="F-06",
+        quantity="1",
+        purchase_price="2.00",
+    )
+    delta = inventory_snapshot_service.create_snapshot(delta=True)
+
+    assert delta.base_snapshot_id == base.id
+    assert InventorySnapshotLine.objects.filter(snapshot_id=delta.id).count() == 3
+    assert _line_values(delta.id) == [
+        ("SNAP-DELTA-0", Decimal("4.0000")),
+        ("SNAP-DELTA-1", Decimal("3.0000")),
+        ("SNAP-DELTA-3", Decimal("4.0000")),
+        ("SNAP-DELTA-4", Decimal("4.0000")),
+        ("SNAP-DELTA-5", Decimal("4.0000")),
+        ("SNAP-DELTA-6", Decimal("1.0000")),
+    ]
+    assert delta.line_count == 6
+    assert delta.receipt_unpriced_line_count == 6
+    assert [(row.currency, row.value) for row in delta.purchase_totals] == [
+        ("CZK", Decimal("40.0000"))
+    ]
+    assert kept.pk in {line.warehouse_item_id for line in delta.lines}
+
+
+def test_delta_falls_back_to_full_snapshot_when_most_stock_changed(db):
+    item = create_snapshot_item(
+        product_code="SNAP-MOSTLY",
+        location_code="G-01",
+        quantity="1",
+        purchase_price="1.00",
+    )
+    first = inventory_snapshot_service.create_snapshot(delta=True)
+    assert first.base_snapshot_id is None
+
+    item.amount = Decimal("2")
+    item.save()
+    second = inventory_snapshot_service.create_snapshot(delta=True)
+
+    assert second.base_snapshot_id is None
+    assert second.line_count == 1
+
+
+def test_compact_snapshot_keeps_the_reconstructed_view(db):
+    items = [
+        create_snapshot_item(
+            product_code=f"SNAP-COMPACT-{index}",
+            location_code=f"H-0{index}",
+            quantity="2",
+            purchase_price="1.00",
+        )
+        for index in range(3)
+    ]
+    base = inventory_snapshot_service.create_snapshot()
+    items[0].amount = Decimal("5")
+    items[0].save()
+    delta = inventory_snapshot_service.create_snapshot(delta=True)
+    expected = _line_values(delta.id)
+
+    compacted = inventory_snapshot_service.compact_snapshot(delta.id)
+
+    assert compacted.base_snapshot_id is None
+    assert compacted.line_count == delta.line_count
+    assert _line_values(delta.id) == expected
+    InventorySnapshot.objects.filter(pk=base.id).delete()
+    assert _line_values(delta.id) == expected
@@ -1,7 +1,16 @@
+from concurrent.futures import Future
+
 import pytest
 from django.core.exceptions import ObjectDoesNotExist
 
-from apps.warehouse.core.services.item_reorder import reorder_order_items
+from apps.warehouse.core.services import item_reorder
+from apps.warehouse.core.services.item_reorder import (
+    INDEX_GAP,
+    get_item_at,
+    next_item_index,
+    renormalize_order_items,
+    reorder_order_items,
+)
 from apps.warehouse.models.orders import InboundOrderItem
 from apps.warehouse.tests.factories.order import (
     InboundOrderFactory,
@@ -10,48 +19,69 @@ from apps.warehouse.tests.factories.order import (
 from apps.warehouse.tests.factories.product import StockProductFactory
 
 
-def _make_items(order, count: int) -> list[InboundOrderItem]:
-    """Create `count` items with sequential indices 0..count-1."""
+class _InlineExecutor:
+    def submit(self, fn, *args) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def _make_items(order, indices: list[int]) -> list[InboundOrderItem]:
     return [
         InboundOrderItemFactory.it(
-            order=order, index=i, stock_product=StockProductFactory.it()
+            order=order, index=index, stock_product=StockProductFactory.it()
         )
-        for i in range(count)
+        for index in indices
     ]
 
 
+def _sparse_items(order, count: int) -> list[InboundOrderItem]:
+    """Create `count` items spread ``INDEX_GAP`` apart."""
+    return _make_items(order, [(i + 1) * INDEX_GAP for i in range(count)])
+
+
+def _order_of(order) -> list[int]:
+    return list(order.items.order_by("index").values_list("pk", flat=True))
+
+
 def _indices(order) -> list[int]:
     return list(order.items.order_by("index").values_list("index", flat=True))
 
 
 def test_reorder_moves_item_forward(db):
     order = InboundOrderFactory.it()
-    _make_items(order, 5)  # indices 0,1,2,3,4
+    a, b, c, d, e = _sparse_items(order, 5)
 
     reorder_order_items(order.items, item_index=1, new_index=3)
 
-    # item that was at 1 is now at 3; others shift left
-    assert _indices(order) == [0, 1, 2, 3, 4]
-    items = list(order.items.order_by("index"))
-    # original positions: A=0,B=1,C=2,D=3,E=4  ->  A=0,C=1,D=2,B=3,E=4
-    assert items[3].index == 3
+    assert _order_of(order) == [a.pk, c.pk, d.pk, b.pk, e.pk]
 
 
 def test_reorder_moves_item_backward(db):
     order = InboundOrderFactory.it()
-    _make_items(order, 4)  # indices 0,1,2,3
+    a, b, c, d = _sparse_items(order, 4)
 
-    item_at_3 = order.items.get(index=3)
     reorder_order_items(order.items, item_index=3, new_index=1)
 
-    item_at_3.refresh_from_db()
-    assert item_at_3.index == 1
-    assert _indices(order) == [0, 1, 2, 3]
+    assert _order_of(order) == [a.pk, d.pk, b.pk, c.pk]
+
+
+def test_reorder_writes_only_the_moved_item(db, django_assert_num_queries):
+    order = InboundOrderFactory.it()
+    items = _sparse_items(order, 5)
+    before = _indices(order)
+
+    with django_assert_num_queries(2):
+        reorder_order_items(order.items, item_index=4, new_index=0)
+
+    moved = order.items.get(pk=items[4].pk)
+    assert moved.index < before[0]
+    assert _indices(order)[1:] == before[:4]
 
 
 def test_reorder_to_same_position_is_noop(db):
     order = InboundOrderFactory.it()
-    _make_items(order, 3)
+    _sparse_items(order, 3)
 
     before = _indices(order)
     reorder_order_items(order.items, item_index=1, new_index=1)
@@ -60,44 +90,64 @@ def test_reorder_to_same_position_is_noop(db):
 
 def test_reorder_clamps_new_index_above_last(db):
     order = InboundOrderFactory.it()
-    _make_items(order, 3)  # indices 0,1,2
+    first, *_ = _sparse_items(order, 3)
 
-    item_at_0 = order.items.get(index=0)
     reorder_order_items(order.items, item_index=0, new_index=999)
 
-    item_at_0.refresh_from_db()
-    assert item_at_0.index == 2  # clamped to last position
-    assert _indices(order) == [0, 1, 2]
+    assert _order_of(order)[-1] == first.pk
 
 
 def test_reorder_clamps_new_index_below_zero(db):
     order = InboundOrderFactory.it()
-    _make_items(order, 3)
+    *_, last = _sparse_items(order, 3)
 
-    item_at_2 = order.items.get(index=2)
     reorder_order_items(order.items, item_index=2, new_index=-5)
 
-    item_at_2.refresh_from_db()
-    assert item_at_2.index == 0
-    assert _indices(order) == [0, 1, 2]
+    assert _order_of(order)[0] == last.pk
 
 
-def test_reorder_indices_always_sequential(db):
+def test_reorder_renormalizes_when_gap_is_exhausted(db):
     order = InboundOrderFactory.it()
-    # Create items with non-sequential indices (simulating legacy data)
-    for i, sparse_index in enumerate([0, 5, 10, 15]):
-        InboundOrderItemFactory.it(
-            order=order, index=sparse_index, stock_product=StockProductFactory.it()
-        )
+    # Legacy rows with sequential indices leave no room between them.
+    a, b, c, d = _make_items(order, [0, 1, 2, 3])
+
+    reorder_order_items(order.items, item_index=3, new_index=1)
+
+    assert _order_of(order) == [a.pk, d.pk, b.pk, c.pk]
+    assert len(set(_indices(order))) == 4
+    assert order.items.get(pk=a.pk).index == INDEX_GAP
+
+
+def test_reorder_renormalizes_narrow_gaps_after_commit(
+    db, monkeypatch, django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(item_reorder, "_get_executor", _InlineExecutor)
+    order = InboundOrderFactory.it()
+    a, b, c = _make_items(order, [INDEX_GAP, INDEX_GAP + 2, INDEX_GAP + 4])
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        reorder_order_items(order.items, item_index=2, new_index=1)
+
+    assert len(callbacks) == 1
+    assert _order_of(order) == [a.pk, c.pk, b.pk]
+    assert _indices(order) == [INDEX_GAP, 2 * INDEX_GAP, 3 * INDEX_GAP]
+
+
+def test_reorder_with_wide_gaps_schedules_nothing(
+    db, django_capture_on_commit_callbacks
+):
+    order = InboundOrderFactory.it()
+    _sparse_items(order, 3)
 
-    reorder_order_items(order.items, item_index=5, new_index=2)
+    with django_capture_on_commit_callbacks() as callbacks:
+        reorder_order_items(order.items, item_index=0, new_index=2)
 
-    assert _indices(order) == [0, 1, 2, 3]
+    assert callbacks == []
 
 
 def test_reorder_raises_for_missing_item_index(db):
     order = InboundOrderFactory.it()
-    _make_items(order, 3)
+    _sparse_items(order, 3)
 
     with pytest.raises(ObjectDoesNotExist):
         reorder_order_items(order.items, item_index=99, new_index=0)
@@ -105,20 +155,47 @@ def test_reorder_raises_for_missing_item_index(db):
 
 def test_reorder_single_item_is_noop(db):
     order = InboundOrderFactory.it()
-    InboundOrderItemFactory.it(
-        order=order, index=0, stock_product=StockProductFactory.it()
-    )
+    _make_items(order, [0])
 
     reorder_order_items(order.items, item_index=0, new_index=0)
     assert _indices(order) == [0]
 
 
+def test_renormalize_spreads_indices_and_keeps_order(db):
+    order = InboundOrderFactory.it()
+    a, b, c = _make_items(order, [7, 8, 5000])
+
+    assert renormalize_order_items(order.items) == 3
+    assert _order_of(order) == [a.pk, b.pk, c.pk]
+    assert _indices(order) == [INDEX_GAP, 2 * INDEX_GAP, 3 * INDEX_GAP]
+    assert renormalize_order_items(order.items) == 0
+
+
+def test_next_item_index_appends_after_last(db):
+    order = InboundOrderFactory.it()
+    assert next_item_index(order.items) == INDEX_GAP
+
+    _make_items(order, [3, 10])
+    assert next_item_index(order.items) == 10 + INDEX_GAP
+
+
+def test_get_item_at_resolves_positions(db):
+    order = InboundOrderFactory.it()
+    a, b = _sparse_items(order, 2)
+
+    assert get_item_at(order.items, 1) == b
+    with pytest.raises(InboundOrderItem.DoesNotExist):
+        get_item_at(order.items, 2)
+    with pytest.raises(InboundOrderItem.DoesNotExist):
+        get_item_at(order.items, -1)
+
+
 def test_reorder_api_endpoint_inbound(db):
     from ninja.testing import TestClient
     from apps.warehouse.api.routes.inbound_orders import routes
 
     order = InboundOrderFactory.it()
-    _make_items(order, 4)
+    a, b, c, d = _sparse_items(order, 4)
 
     client = TestClient(routes)
     res = client.put(
@@ -130,10 +207,7 @@ def test_reorder_api_endpoint_inbound(db):
     assert body["success"] is True
     assert body["data"]["code"] == order.code
     assert [item["index"] for item in body["data"]["items"]] == [0, 1, 2, 3]
-    assert _indices(order) == [0, 1, 2, 3]
-
-    item_moved = order.items.order_by("index").last()
-    assert item_moved is not None
+    assert _order_of(order) == [b.pk, c.pk, d.pk, a.pk]
 
 
 def test_reorder_api_endpoint_outbound(db):
@@ -145,10 +219,12 @@ def test_reorder_api_endpoint_outbound(db):
     )
 
     order = OutboundOrderFactory.it()
-    for i in range(4):
+    items = [
         OutboundOrderItemFactory.it(
             order=order, index=i, stock_product=StockProductFactory.it()
         )
+        for i in range(4)
+    ]
 
     client = TestClient(routes)
     res = client.put(
@@ -160,3 +236,9 @@ def test_reorder_api_endpoint_outbound(db):
     assert body["success"] is True
     assert body["data"]["code"] == order.code
     assert [item["index"] for item in body["data"]["items"]] == [0, 1, 2, 3]
+    assert [item["product"]["code"] for item in body["data"]["items"]] == [
+        items[3].stock_product.code,
+        items[0].stock_product.code,
+        items[1].stock_product.code,
+        items[2].stock_product.code,
+    ]
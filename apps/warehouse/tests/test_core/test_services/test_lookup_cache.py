@@ -0,0 +1,76 @@
+import pytest
+
+from apps.warehouse.core.services.lookup_cache import lookup_cache_service
+from apps.warehouse.models.product import StockProduct
+from apps.warehouse.models.warehouse import WarehouseLocation
+from apps.warehouse.tests.factories.packaging import PackageTypeFactory
+from apps.warehouse.tests.factories.product import StockProductFactory
+from apps.warehouse.tests.factories.warehouse import WarehouseLocationFactory
+
+
+def test_lookup_is_served_from_cache(db, django_assert_num_queries):
+    product = StockProductFactory(code="P 001")
+
+    with django_assert_num_queries(1):
+        assert lookup_cache_service.get(StockProduct, "P 001").pk == product.pk
+    with django_assert_num_queries(0):
+        cached = lookup_cache_service.get(StockProduct, "P 001")
+    assert cached.pk == product.pk
+    assert cached is not lookup_cache_service.get(StockProduct, "P 001")
+
+
+def test_unknown_key_raises_and_is_not_cached(db):
+    with pytest.raises(WarehouseLocation.DoesNotExist):
+        lookup_cache_service.get(WarehouseLocation, "NOPE")
+
+    location = WarehouseLocationFactory(code="NOPE")
+    assert lookup_cache_service.get(WarehouseLocation, "NOPE").pk == location.pk
+
+
+def test_write_invalidates_only_its_model(db, django_assert_num_queries):
+    product = StockProductFactory(name="Bolt")
+    package_type = PackageTypeFactory()
+    lookup_cache_service.get(StockProduct, product.code)
+    lookup_cache_service.get(type(package_type), package_type.name)
+
+    product.name = "Nut"
+    product.save()
+
+    with django_assert_num_queries(1):
+        assert lookup_cache_service.get(StockProduct, product.code).name == "Nut"
+    with django_assert_num_queries(0):
+        lookup_cache_service.get(type(package_type), package_type.name)
+
+    product.delete()
+    with pytest.raises(StockProduct.DoesNotExist):
+        lookup_cache_service.get(StockProduct, product.code)
+
+
+def test_stats_count_hits_and_misses(db, settings):
+    settings.LOOKUP_CACHE_STATS = True
+    product = StockProductFactory()
+    lookup_cache_service.reset_stats()
+
+    for _ in range(3):
+        lookup_cache_service.get(StockProduct, product.code)
+
+    stats = lookup_cache_service.stats()
+    assert stats["warehouse.stockproduct"] == {"hits": 2, "misses": 1}
+    assert stats["warehouse.warehouselocation"] == {"hits": 0, "misses": 0}
+
+    lookup_cache_service.reset_stats()
+    assert lookup_cache_service.stats()["warehouse.stockproduct"]["hits"] == 0
+
+
+def test_stats_are_not_counted_unless_enabled(db, settings):
+    settings.LOOKUP_CACHE_STATS = False
+    product = StockProductFactory.it()
+    lookup_cache_service.reset_stats()
+
+    lookup_cache_service.get(StockProduct, product.code)
+    lookup_cache_service.get(StockProduct, product.code)
+
+    assert lookup_cache_service.stats()["warehouse.stockproduct"] == {
+        "hits": 0,
+        "misses": 0,
+    }
@@ -0,0 +1,148 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import pytest
+
+from apps.warehouse.core.services import pdf
+from apps.warehouse.core.services.orders import inbound_orders_service
+from apps.warehouse.core.services.pdf import (
+    PDF_KIND_INVOICE,
+    PdfCacheService,
+    pdf_cache_service,
+)
+from apps.warehouse.models.orders import InboundOrderState
+from apps.warehouse.tests.factories.order import InboundOrderFactory, InvoiceFactory
+
+
+class _InlineExecutor:
+    def submit(self, fn, *args) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+# Renderers for the process pool, which needs them importable by name.
+def _render_in_worker(content_html: str) -> bytes:
+    return f"%PDF {content_html} from {os.getpid()}".encode()
+
+
+def _crash_worker(content_html: str) -> bytes:
+    os._exit(1)
+
+
+@pytest.fixture
+def pool_service(settings, pdf_cache_dir):
+    settings.PDF_RENDER_WORKERS = 1
+    service = PdfCacheService()
+    yield service
+    if service._executor is not None:
+        service._executor.shutdown()
+
+
+def _prerender(service: PdfCacheService, code: str, capture) -> None:
+    with capture(execute=True):
+        service.prerender(PDF_KIND_INVOICE, code, lambda code: f"<p>{code}</p>")
+    with service._lock:
+        pending = list(service._pending.values())
+    wait(pending)
+
+
+@pytest.fixture
+def renders(monkeypatch) -> list[str]:
+    rendered: list[str] = []
+
+    def fake_print(content_html: str) -> bytes:
+        rendered.append(content_html)
+        return f"%PDF {content_html}".encode()
+
+    monkeypatch.setattr(pdf, "print_html_to_pdf", fake_print)
+    return rendered
+
+
+def test_pdf_is_rendered_once_per_html(renders, pdf_cache_dir):
+    first = pdf_cache_service.get_pdf(PDF_KIND_INVOICE, "FV-1", "<p>1</p>")
+    again = pdf_cache_service.get_pdf(PDF_KIND_INVOICE, "FV-1", "<p>1</p>")
+    changed = pdf_cache_service.get_pdf(PDF_KIND_INVOICE, "FV-1", "<p>2</p>")
+
+    assert first == again == b"%PDF <p>1</p>"
+    assert changed == b"%PDF <p>2</p>"
+    assert renders == ["<p>1</p>", "<p>2</p>"]
+    assert len(list(pdf_cache_dir.rglob("*.pdf"))) == 2
+
+
+def test_saving_invoice_removes_its_pdfs(
+    db, renders, pdf_cache_dir, django_capture_on_commit_callbacks
+):
+    invoice = InvoiceFactory.it()
+    other = InvoiceFactory.it()
+    pdf_cache_service.get_pdf(PDF_KIND_INVOICE, invoice.code, "<p>invoice</p>")
+    pdf_cache_service.get_pdf(PDF_KIND_INVOICE, other.code, "<p>other</p>")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invoice.note = "Changed"
+        invoice.save()
+
+    assert [path.read_bytes() for path in pdf_cache_dir.rglob("*.pdf")] == [
+        b"%PDF <p>other</p>"
+    ]
+
+
+def test_transition_prerenders_inbound_order_pdf(
+    db, context, settings, monkeypatch, renders, django_capture_on_commit_callbacks
+):
+    settings.PDF_RENDER_WORKERS = 1
+    monkeypatch.setattr(pdf_cache_service, "_get_executor", _InlineExecutor)
+    order = InboundOrderFactory(state=InboundOrderState.DRAFT)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        inbound_orders_service.transition_order(
+            code=order.code,
+            context=context,
+            target_state=InboundOrderState.COMPLETED,
+        )
+    assert len(renders) == 1
+
+    content = inbound_orders_service.get_pdf(order.code)
+
+    assert content == f"%PDF {renders[0]}".encode()
+    assert len(renders) == 1
+
+
+def test_prerender_renders_in_worker_process(
+    db, pool_service, monkeypatch, django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(pdf, "print_html_to_pdf", _render_in_worker)
+
+    _prerender(pool_service, "FV-1", django_capture_on_commit_callbacks)
+    content = pool_service.get_pdf(PDF_KIND_INVOICE, "FV-1", "<p>FV-1</p>")
+
+    assert content.startswith(b"%PDF <p>FV-1</p> from ")
+    assert content != _render_in_worker("<p>FV-1</p>")
+
+
+def test_broken_render_pool_is_replaced(
+    db, pool_service, monkeypatch, django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(pdf, "print_html_to_pdf", _crash_worker)
+    _prerender(pool_service, "FV-1", django_capture_on_commit_callbacks)
+    broken = pool_service._executor
+    assert broken is not None and broken._broken
+
+    monkeypatch.setattr(pdf, "print_html_to_pdf", _render_in_worker)
+    _prerender(pool_service, "FV-2", django_capture_on_commit_callbacks)
+
+    assert pool_service._executor is not broken
+    content = pool_service.get_pdf(PDF_KIND_INVOICE, "FV-2", "<p>FV-2</p>")
+    assert content.startswith(b"%PDF <p>FV-2</p> from ")
+
+
+def test_concurrent_writes_of_one_document_do_not_collide(tmp_path):
+    path = tmp_path / "doc.pdf"
+    content = b"%PDF" * 100_000
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # Raises if one thread's file was moved away by another.
+        list(executor.map(lambda _: pdf._write_atomic(path, content), range(64)))
+
+    assert path.read_bytes() == content
+    assert [entry.name for entry in tmp_path.iterdir()] == ["doc.pdf"]
@@ -0,0 +1,182 @@
+from io import StringIO
+
+import pytest
+from django.db import DatabaseError
+
+from apps.warehouse.core.services.lookup_cache import lookup_cache_service
+from apps.warehouse.core.services.product_import import ProductCsvImportService
+from apps.warehouse.core.services.product_search import product_search_service
+from apps.warehouse.models.packaging import UnitOfMeasure
+from apps.warehouse.models.product import ProductGroup, ProductType, StockProduct
+
+HEADER = (
+    "Kód&Jméno&locProductTypeCode&locProductGroupCode&locUnitTypeCode"
+    "&locBasePrice&Nákupní cena"
+)
+
+
+def _csv(*rows: str) -> StringIO:
+    return StringIO("\n".join([HEADER, *rows]) + "\n")
+
+
+def _row(code: str, name: str, base_price: str = "10", group: str = "Screws") -> str:
+    return f"{code}&{name}&GOODS&{group}&ks&{base_price}&5"
+
+
+@pytest.fixture
+def catalogue(db):
+    ProductType.objects.create(name="Zboží")
+    ProductGroup.objects.create(name="Screws")
+    UnitOfMeasure.objects.create(name="KS")
+
+
+def test_import_creates_and_updates_products(db):
+    StockProduct.objects.create(
+        code="P-1",
+        name="Old name",
+        type=ProductType.objects.create(name="Zboží"),
+        unit_of_measure=UnitOfMeasure.objects.create(name="KS"),
+    )
+
+    summary = ProductCsvImportService().import_from_file_obj(
+        _csv(_row("P-1", "Bolt"), _row("P-2", "Nut", group="Nuts"))
+    )
+
+    assert (summary.created_count, summary.updated_count) == (1, 1)
+    assert summary.skipped_count == 0
+    bolt, nut = StockProduct.objects.order_by("code")
+    assert bolt.name == "Bolt"
+    assert bolt.group.name == "Screws"
+    assert nut.group.name == "Nuts"
+    assert nut.unit_of_measure.name == "KS"
+    assert ProductType.objects.count() == UnitOfMeasure.objects.count() == 1
+
+
+def test_import_queries_per_chunk_do_not_grow_with_rows(
+    catalogue, django_assert_max_num_queries
+):
+    StockProduct.objects.bulk_create(
+        StockProduct(
+            code=f"P-{number}",
+            name="Old",
+            type=ProductType.objects.get(),
+            unit_of_measure=UnitOfMeasure.objects.get(),
+        )
+        for number in range(0, 100, 2)
+    )
+    rows = [_row(f"P-{number}", f"Product {number}") for number in range(100)]
+
+    with django_assert_max_num_queries(10):
+        summary = ProductCsvImportService().import_from_file_obj(_csv(*rows))
+
+    assert (summary.created_count, summary.updated_count) == (50, 50)
+    assert set(StockProduct.objects.values_list("name", flat=True)) == {
+        f"Product {number}" for number in range(100)
+    }
+
+
+def test_import_reports_invalid_rows_and_keeps_the_rest(catalogue):
+    service = ProductCsvImportService(chunk_size=2)
+
+    summary = service.import_from_file_obj(
+        _csv(
+            _row("P-1", "Bolt"),
+            _row("P-2", "Nut", base_price="cheap"),
+            "P-3",
+            _row("P-4", "Washer"),
+        )
+    )
+
+    assert (summary.created_count, summary.updated_count) == (2, 0)
+    assert summary.skipped_count == 2
+    assert [error.split(":")[0] for error in summary.errors] == ["Row 3", "Row 4"]
+    assert list(StockProduct.objects.values_list("code", flat=True)) == ["P-1", "P-4"]
+
+
+def test_import_repeated_code_keeps_last_row(catalogue):
+    summary = ProductCsvImportService().import_from_file_obj(
+        _csv(_row("P-1", "Bolt"), _row("P-1", "Bolt M8"))
+    )
+
+    assert (summary.created_count, summary.updated_count) == (1, 1)
+    assert StockProduct.objects.get().name == "Bolt M8"
+
+
+def test_import_updates_search_index_and_lookup_cache(
+    catalogue, django_capture_on_commit_callbacks
+):
+    product = StockProduct.objects.create(
+        code="P-1",
+        name="Old",
+        type=ProductType.objects.get(),
+        unit_of_measure=UnitOfMeasure.objects.get(),
+    )
+    assert lookup_cache_service.get(StockProduct, "P-1").name == "Old"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ProductCsvImportService().import_from_file_obj(
+            _csv(_row("P-1", "Hex bolt"), _row("P-2", "Wing nut"))
+        )
+
+    assert lookup_cache_service.get(StockProduct, "P-1").name == "Hex bolt"
+    found = product_search_service.search(StockProduct.objects.all(), "wing")
+    assert [hit.code for hit in found] == ["P-2"]
+    assert StockProduct.objects.get(pk=product.pk).name == "Hex bolt"
+
+
+def test_failed_chunk_falls_back_to_rows_and_forgets_its_catalogue(db, monkeypatch):
+    index = product_search_service.index
+    calls = []
+
+    def fail_first_chunk(products):
+        calls.append(products)
+        if len(calls) == 1:
+            raise DatabaseError("bulk write failed")
+        index(products)
+
+    monkeypatch.setattr(product_search_service, "index", fail_first_chunk)
+    service = ProductCsvImportService(chunk_size=2)
+
+    # The first chunk creates both groups, then rolls back. Its rows are imported
+    # one by one, which creates the groups again in the opposite order.
+    summary = service.import_from_file_obj(
+        _csv(
+            _row("P-1", "Nut", group="Nuts"),
+            _row("P-2", "Bolt", group="Bolts"),
+            _row("P-3", "Bolt M8", group="Bolts"),
+            _row("P-4", "Nut M8", group="Nuts"),
+        )
+    )
+
+    assert (summary.created_count, summary.skipped_count) == (4, 0)
+    assert dict(StockProduct.objects.values_list("code", "group__name")) == {
+        "P-1": "Nuts",
+        "P-2": "Bolts",
+        "P-3": "Bolts",
+        "P-4": "Nuts",
+    }
+    assert ProductGroup.objects.count() == 2
+
+
+def test_parallel_import_matches_inline_import(catalogue):
+    rows = [_row(f"P-{number}", f"Product {number}") for number in range(40)]
+    rows[7] = _row("P-7", "Product 7", base_price="cheap")
+
+    summary = ProductCsvImportService(chunk_size=5, workers=2).import_from_file_obj(
+        _csv(*rows)
+    )
+
+    assert (summary.created_count, summary.skipped_count) == (39, 1)
+    assert summary.errors[0].startswith("Row 9:")
+    assert StockProduct.objects.count() == 39
+
+
+def test_dry_run_only_validates(catalogue):
+    summary = ProductCsvImportService().import_from_file_obj(
+        _csv(_row("P-1", "Bolt"), "P-2"), dry_run=True
+    )
+
+    assert (summary.validated_count, summary.skipped_count) == (1, 1)
+    assert summary.created_count == 0
+    assert summary.duration > 0
+    assert not StockProduct.objects.exists()
@@ -0,0 +1,75 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from apps.warehouse.core.services.product_search import (
+    SEARCH_TABLE,
+    normalize,
+    product_search_service,
+)
+from apps.warehouse.models.product import StockProduct
+from apps.warehouse.tests.factories.product import StockProductFactory
+
+
+def _search(term: str) -> list[str]:
+    return list(
+        product_search_service.search(StockProduct.objects.all(), term).values_list(
+            "code", flat=True
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("Šroub", "sroub"), ("MATICE ČSN", "matice csn"), ("plain", "plain")],
+)
+def test_normalize(text, expected):
+    assert normalize(text) == expected
+
+
+@pytest.mark.parametrize("term", ["šroub", "SROUB", "rou", "sroub m8"])
+def test_search_by_name_ignores_case_and_diacritics(db, term):
+    StockProductFactory(code="P-001", name="Šroub M8")
+    StockProductFactory(code="P-002", name="Matice M8")
+
+    assert _search(term) == ["P-001"]
+
+
+def test_search_by_code_substring_and_attributes(db):
+    StockProductFactory(code="ABC-12345", name="Bolt", attributes={"DIN": "931"})
+    StockProductFactory(code="XYZ-999", name="Nut", attributes={"ISO": "4032"})
+
+    assert _search("2345") == ["ABC-12345"]
+    assert _search("din 931") == ["ABC-12345"]
+    assert _search("4032") == ["XYZ-999"]
+    assert _search("z-9") == ["XYZ-999"]
+
+
+def test_search_ranks_exact_code_first(db):
+    StockProductFactory(code="BOLT-10", name="Bolt")
+    StockProductFactory(code="BOLT", name="Bolt")
+
+    assert _search("bolt") == ["BOLT", "BOLT-10"]
+
+
+def test_index_follows_saves_and_deletes(db):
+    product = StockProductFactory(code="OLD-CODE", name="Washer")
+    assert _search("washer") == ["OLD-CODE"]
+
+    product.name = "Spring"
+    product.save()
+    assert _search("washer") == []
+    assert _search("spring") == ["OLD-CODE"]
+
+    product.delete()
+    assert _search("spring") == []
+
+
+def test_rebuild_command_backfills_index(db):
+    StockProductFactory(code="P-001", name="Šroub M8")
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+    assert _search("sroub") == []
+
+    call_command("rebuild_product_search_index")
+    assert _search("sroub") == ["P-001"]
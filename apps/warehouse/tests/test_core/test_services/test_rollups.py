@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+from django.core.management import call_command
+
+from apps.warehouse.core.services.analytics import analytics_service
+from apps.warehouse.core.services.rollups import rollup_service
+from apps.warehouse.models.orders import InboundOrderState
+from apps.warehouse.tests.factories.order import (
+    InboundOrderFactory,
+    InboundOrderItemFactory,
+)
+from apps.warehouse.tests.factories.warehouse import (
+    WarehouseLocationFactory,
+    WarehouseMovementFactory,
+)
+
+
+def _active_inbound_today() -> int:
+    return analytics_service.get_active_orders(days=1).inbound[-1].value
+
+
+def _value_trends() -> list[tuple[str, str, int, Decimal]]:
+    return [
+        (point.kind, point.currency, point.order_count, point.total_value)
+        for point in analytics_service.get_value_trends(days=1)
+    ]
+
+
+def test_order_transitions_update_rollups(db):
+    order = InboundOrderFactory(currency="EUR")
+    InboundOrderItemFactory(order=order, amount=2, unit_price=5, total_price=10)
+    InboundOrderItemFactory(order=order, amount=1, unit_price=3, total_price=3)
+    assert _active_inbound_today() == 0
+
+    order.state = InboundOrderState.SUBMITTED
+    order.save()
+    assert _active_inbound_today() == 1
+
+    order.state = InboundOrderState.COMPLETED
+    order.save()
+    assert _active_inbound_today() == 0
+    assert _value_trends() == [("receipt", "EUR", 1, Decimal("13"))]
+    trend = analytics_service.get_order_trends(days=1).inbound_orders[-1]
+    assert (trend.created, trend.closed) == (1, 1)
+
+    order.state = InboundOrderState.RECEIVING
+    order.save()
+    assert _active_inbound_today() == 1
+    assert _value_trends() == [("receipt", "EUR", 0, Decimal("0"))]
+
+
+def test_deleted_order_is_no_longer_active(db):
+    order = InboundOrderFactory(state=InboundOrderState.SUBMITTED)
+    assert _active_inbound_today() == 1
+
+    order.delete()
+    assert _active_inbound_today() == 0
+
+
+def test_movements_update_rollups(db):
+    shelf, dock = WarehouseLocationFactory.create_batch(2)
+    movement = WarehouseMovementFactory(location_from=dock, location_to=shelf, amount=4)
+    WarehouseMovementFactory(
+        location_from=None,
+        location_to=shelf,
+        stock_product=movement.stock_product,
+        amount=6,
+    )
+
+    [into_shelf] = analytics_service.get_movement_trends(days=1, location_id=shelf.pk)
+    assert (into_shelf.quantity_in, into_shelf.quantity_out) == (10, 0)
+    assert into_shelf.movement_count == 2
+    [out_of_dock] = analytics_service.get_movement_trends(days=1, location_id=dock.pk)
+    assert (out_of_dock.quantity_in, out_of_dock.quantity_out) == (0, 4)
+
+    movement.delete()
+    [into_shelf] = analytics_service.get_movement_trends(days=1, location_id=shelf.pk)
+    assert into_shelf.quantity_in == 6
+
+
+def test_rebuild_matches_incremental_rollups(db):
+    submitted = InboundOrderFactory()
+    submitted.state = InboundOrderState.SUBMITTED
+    submitted.save()
+    completed = InboundOrderFactory(currency="CZK")
+    InboundOrderItemFactory(order=completed, amount=1, unit_price=7, total_price=7)
+    completed.state = InboundOrderState.COMPLETED
+    completed.save()
+    WarehouseMovementFactory(amount=3)
+
+    incremental = (
+        _active_inbound_today(),
+        _value_trends(),
+        analytics_service.get_movement_trends(days=1),
+    )
+    call_command("rebuild_analytics_rollups")
+
+    assert (
+        _active_inbound_today(),
+        _value_trends(),
+        analytics_service.get_movement_trends(days=1),
+    ) == incremental
+    assert rollup_service.rebuild()["values"] == 1
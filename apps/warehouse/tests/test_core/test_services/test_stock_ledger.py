@@ -0,0 +1,144 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from apps.warehouse.core.services.stock_ledger import stock_ledger_service
+from apps.warehouse.core.services.warehouse import warehouse_service
+from apps.warehouse.models.orders import InboundOrderState, OutboundOrderState
+from apps.warehouse.models.warehouse import ProductStockLedger
+from apps.warehouse.tests.factories.order import (
+    InboundOrderFactory,
+    InboundOrderItemFactory,
+    OutboundOrderFactory,
+    OutboundOrderItemFactory,
+)
+from apps.warehouse.tests.factories.product import StockProductFactory
+from apps.warehouse.tests.factories.warehouse import (
+    OutboundWarehouseOrderItemFactory,
+    WarehouseItemFactory,
+    WarehouseLocationFactory,
+)
+
+
+def _ledger(product) -> ProductStockLedger:
+    return ProductStockLedger.objects.get(stock_product=product)
+
+
+def test_ledger_follows_warehouse_items(db):
+    product = StockProductFactory.it()
+    item = WarehouseItemFactory(stock_product=product, amount=10)
+    WarehouseItemFactory(stock_product=product, amount=5)
+    assert _ledger(product).on_hand_amount == Decimal(15)
+
+    item.amount = 4
+    item.save()
+    assert _ledger(product).on_hand_amount == Decimal(9)
+
+    item.delete()
+    assert _ledger(product).on_hand_amount == Decimal(5)
+    assert _ledger(product).available_amount == Decimal(5)
+
+
+def test_ledger_ignores_location_only_moves(db, django_assert_num_queries):
+    item = WarehouseItemFactory(amount=10)
+    item.location = WarehouseLocationFactory.it()
+    with django_assert_num_queries(1):
+        item.save()
+    assert _ledger(item.stock_product).on_hand_amount == Decimal(10)
+
+
+def test_ledger_follows_order_states(db):
+    product = StockProductFactory.it()
+    WarehouseItemFactory(stock_product=product, amount=20)
+
+    outbound = OutboundOrderFactory(state=OutboundOrderState.DRAFT)
+    OutboundOrderItemFactory(order=outbound, stock_product=product, amount=8)
+    assert _ledger(product).booked_amount == Decimal(0)
+
+    outbound.state = OutboundOrderState.SUBMITTED
+    outbound.save()
+    assert _ledger(product).booked_amount == Decimal(8)
+    assert _ledger(product).available_amount == Decimal(12)
+
+    outbound.state = OutboundOrderState.COMPLETED
+    outbound.save()
+    assert _ledger(product).booked_amount == Decimal(0)
+
+    inbound = InboundOrderFactory(state=InboundOrderState.DRAFT)
+    InboundOrderItemFactory(order=inbound, stock_product=product, amount=3)
+    assert _ledger(product).incoming_amount == Decimal(3)
+
+    inbound.state = InboundOrderState.PUTAWAY
+    inbound.save()
+    assert _ledger(product).incoming_amount == Decimal(0)
+
+
+def test_ledger_excludes_assigned_outbound_items(db):
+    product = StockProductFactory.it()
+    item = WarehouseItemFactory(stock_product=product, amount=6)
+    WarehouseItemFactory(stock_product=product, amount=4)
+
+    order_item = OutboundOrderItemFactory(
+        order=OutboundOrderFactory(state=OutboundOrderState.DRAFT),
+        stock_product=product,
+        amount=6,
+    )
+    assignment = OutboundWarehouseOrderItemFactory(source_order_item=order_item)
+    assert _ledger(product).on_hand_amount == Decimal(10)
+
+    assignment.warehouse_item = item
+    assignment.save()
+    assert _ledger(product).on_hand_amount == Decimal(4)
+
+    assignment.delete()
+    assert _ledger(product).on_hand_amount == Decimal(10)
+
+
+def test_get_total_availability_is_a_single_lookup(db, django_assert_num_queries):
+    product = StockProductFactory.it()
+    WarehouseItemFactory(stock_product=product, amount=12)
+    InboundOrderItemFactory(
+        order=InboundOrderFactory(state=InboundOrderState.SUBMITTED),
+        stock_product=product,
+        amount=2,
+    )
+
+    with django_assert_num_queries(1):
+        result = warehouse_service.get_total_availability(product.code)
+    assert result.total_amount == Decimal(12)
+    assert result.available_amount == Decimal(12)
+    assert result.incoming_amount == Decimal(2)
+
+
+@pytest.mark.parametrize("products_count", [1, 25])
+def test_get_bulk_availability_query_count(
+    db, django_assert_num_queries, products_count
+):
+    products = StockProductFactory.create_batch(products_count)
+    for product in products:
+        WarehouseItemFactory(stock_product=product, amount=3)
+
+    with django_assert_num_queries(1):
+        result = warehouse_service.get_bulk_availability([p.code for p in products])
+    assert len(result) == products_count
+    assert all(item.total_amount == Decimal(3) for item in result.values())
+
+
+def test_verify_and_rebuild(db):
+    product = StockProductFactory.it()
+    WarehouseItemFactory(stock_product=product, amount=7)
+    assert stock_ledger_service.verify() == []
+
+    ProductStockLedger.objects.filter(stock_product=product).update(
+        on_hand_amount=Decimal(1), available_amount=Decimal(1)
+    )
+    problems = stock_ledger_service.verify()
+    assert len(problems) == 2
+    assert problems[0].startswith(product.code)
+    with pytest.raises(CommandError):
+        call_command("stock_ledger", "verify")
+
+    call_command("stock_ledger", "rebuild")
+    assert stock_ledger_service.verify() == []
+    assert _ledger(product).on_hand_amount == Decimal(7)
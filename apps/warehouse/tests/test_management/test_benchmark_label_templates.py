@@ -0,0 +1,19 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from apps.warehouse.models.printer import LabelTemplate
+
+
+def test_benchmark_label_templates_reports_render_rates(db):
+    LabelTemplate.objects.create(
+        code="BENCH",
+        content="^XA\n^FD{{ product_code }}^FS\n^BC^FD{{ barcode }}^FS\n^XZ",
+    )
+    out = StringIO()
+
+    call_command("benchmark_label_templates", labels=200, template="BENCH", stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("Compiled once: 200 labels in ")
+    assert lines[1].startswith("Compiled per label: 200 labels in ")
@@ -1,6 +1,11 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
 import pytest
 
 from apps.warehouse.core.services.product_import import ProductRow
+from apps.warehouse.models.product import StockProduct
 
 
 @pytest.mark.parametrize(
@@ -30,3 +35,23 @@ from apps.warehouse.core.services.product_import import ProductRow
 )
 def test_validate_attributes(str_in, expected):
     assert ProductRow.parse_attrs(str_in) == expected
+
+
+def test_import_products_csv_dry_run(db, tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text(
+        "Kód&Jméno&locProductTypeCode&locProductGroupCode&locUnitTypeCode\n"
+        "P-1&Bolt&GOODS&Screws&ks\n",
+        encoding="utf-8",
+    )
+    out = StringIO()
+
+    call_command("import_products_csv", file=str(path), dry_run=True, stdout=out)
+
+    assert "Validation completed: 1 valid, 0 invalid" in out.getvalue()
+    assert not StockProduct.objects.exists()
+
+
+def test_import_products_csv_rejects_invalid_workers(db):
+    with pytest.raises(CommandError):
+        call_command("import_products_csv", workers=0)
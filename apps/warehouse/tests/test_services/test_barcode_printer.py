@@ -1,10 +1,27 @@
 from unittest.mock import patch
 
 import pytest
+from django.contrib.contenttypes.models import ContentType
 
+from apps.warehouse.core import zebra_printer
 from apps.warehouse.core.exceptions import ApiBaseException, NotFoundException
+from apps.warehouse.core.schemas.printer import LabelSchema
 from apps.warehouse.core.services.barcode_printer import barcode_printer_service
-from apps.warehouse.models.printer import Printer, UserAppSettings
+from apps.warehouse.core.services.label_templates import label_templates_service
+from apps.warehouse.core.services.print_spooler import print_spooler_service
+from apps.warehouse.models.barcode import Barcode, BarcodeType
+from apps.warehouse.models.printer import (
+    LabelTemplate,
+    Printer,
+    PrintJob,
+    PrintJobState,
+    UserAppSettings,
+)
+from apps.warehouse.models.warehouse import TrackingLevel, WarehouseItem
+from apps.warehouse.tests.factories.warehouse import (
+    InboundWarehouseOrderFactory,
+    WarehouseItemFactory,
+)
 
 
 @pytest.fixture
@@ -18,9 +35,7 @@ def printer(db) -> Printer:
 
 
 def test_print_barcode_with_explicit_printer(db, user, printer):
-    with patch(
-        "apps.warehouse.core.services.barcode_printer.zebra_printer.print_barcode"
-    ) as mock_print:
+    with patch("socket.create_connection") as create_connection:
         result = barcode_printer_service.print_barcode(
             user=user,
             barcode="WMS-001",
@@ -29,12 +44,14 @@ def test_print_barcode_with_explicit_printer(db, user, printer):
             copies=2,
         )
 
-    mock_print.assert_called_once_with(
-        barcode="WMS-001",
-        text="Hello",
-        ip="10.20.30.40",
-        port=9100,
-        copies=2,
+    create_connection.assert_not_called()
+    job = PrintJob.objects.get(pk=result.job_id)
+    assert job.printer == printer
+    assert job.user == user
+    assert job.state == PrintJobState.QUEUED
+    assert job.label_count == 2
+    assert job.payload == zebra_printer.render_labels(
+        [zebra_printer.Label("WMS-001", "Hello", copies=2)]
     )
     assert result.printer_code == "ZEBRA-PRINT-01"
     assert result.copies == 2
@@ -43,13 +60,9 @@ def test_print_barcode_with_explicit_printer(db, user, printer):
 def test_print_barcode_uses_user_default_when_no_printer_code(db, user, printer):
     UserAppSettings.objects.create(user=user, default_printer=printer)
 
-    with patch(
-        "apps.warehouse.core.services.barcode_printer.zebra_printer.print_barcode"
-    ) as mock_print:
-        result = barcode_printer_service.print_barcode(user=user, barcode="WMS-001")
+    result = barcode_printer_service.print_barcode(user=user, barcode="WMS-001")
 
-    mock_print.assert_called_once()
-    assert mock_print.call_args.kwargs["ip"] == "10.20.30.40"
+    assert PrintJob.objects.get(pk=result.job_id).printer == printer
     assert result.printer_code == printer.code
 
 
@@ -80,25 +93,122 @@ def test_print_barcode_invalid_copies_raises(db, user, printer):
         )
 
 
-def test_print_barcode_connection_error_becomes_502(db, user, printer):
-    with patch(
-        "apps.warehouse.core.services.barcode_printer.zebra_printer.print_barcode",
-        side_effect=ConnectionError("boom"),
-    ):
-        with pytest.raises(ApiBaseException) as excinfo:
-            barcode_printer_service.print_barcode(
-                user=user, barcode="WMS-001", printer_code=printer.code
-            )
-    assert excinfo.value.http_status == 502
-
-
 def test_print_barcode_empty_barcode_propagates_as_400(db, user, printer):
-    with patch(
-        "apps.warehouse.core.services.barcode_printer.zebra_printer.print_barcode",
-        side_effect=ValueError("Barcode cannot be empty"),
-    ):
-        with pytest.raises(ApiBaseException) as excinfo:
-            barcode_printer_service.print_barcode(
-                user=user, barcode="", printer_code=printer.code
-            )
+    with pytest.raises(ApiBaseException) as excinfo:
+        barcode_printer_service.print_barcode(
+            user=user, barcode="", printer_code=printer.code
+        )
     assert excinfo.value.http_status == 400
+    assert not PrintJob.objects.exists()
+
+
+def test_print_labels_sends_one_stream_per_batch(db, user, fake_printer):
+    printer = Printer.objects.create(
+        code="ZEBRA-BATCH", ip=fake_printer.ip, port=fake_printer.port
+    )
+    labels = [
+        LabelSchema(barcode=f"WMS-{number:03d}", text=f"Item {number}")
+        for number in range(50)
+    ]
+    labels.append(LabelSchema(barcode="WMS-PALLET", copies=3))
+
+    result = barcode_printer_service.print_labels(user, labels, printer.code)
+    print_spooler_service.drain()
+
+    job = PrintJob.objects.get()
+    assert (result.job_id, result.label_count) == (job.pk, 53)
+    assert job.state == PrintJobState.PRINTED
+    received = fake_printer.received("WMS-PALLET")
+    assert received.count("^XA") == 51
+    assert "^FDWMS-PALLET^FS\n^PQ3\n^XZ" in received
+    assert fake_printer.connection_count == 1
+
+
+def test_print_labels_empty_batch_raises(db, user, printer):
+    with pytest.raises(ApiBaseException, match="No labels"):
+        barcode_printer_service.print_labels(user, [], printer.code)
+
+
+def test_print_warehouse_order_labels_prints_serialized_items(db, user, printer):
+    order = InboundWarehouseOrderFactory.it()
+    items = [
+        WarehouseItemFactory.it(
+            order_in=order, tracking_level=TrackingLevel.SERIALIZED_PACKAGE
+        )
+        for _ in range(2)
+    ]
+    WarehouseItemFactory.it(order_in=order, tracking_level=TrackingLevel.FUNGIBLE)
+    content_type = ContentType.objects.get_for_model(WarehouseItem)
+    for item in items:
+        Barcode.objects.create(
+            code=f"SN-{item.pk}",
+            barcode_type=BarcodeType.SERIAL,
+            content_type=content_type,
+            object_id=item.pk,
+            is_primary=True,
+        )
+
+    result = barcode_printer_service.print_warehouse_order_labels(
+        user, order.code, printer.code, copies=2
+    )
+
+    assert result.label_count == 4
+    assert PrintJob.objects.get().payload == zebra_printer.render_labels(
+        [
+            zebra_printer.Label(f"SN-{item.pk}", item.stock_product.name, copies=2)
+            for item in items
+        ]
+    )
+
+
+def test_print_warehouse_order_labels_unknown_order_raises(db, user, printer):
+    with pytest.raises(NotFoundException):
+        barcode_printer_service.print_warehouse_order_labels(
+            user, "DOES-NOT-EXIST", printer.code
+        )
+
+
+def test_print_barcode_uses_printer_template(db, user, printer):
+    printer.label_template = LabelTemplate.objects.create(
+        code="SMALL", content="^XA\n^FO10,10^BC^FD{{ barcode }}^FS\n^XZ"
+    )
+    printer.save()
+
+    result = barcode_printer_service.print_barcode(
+        user=user, barcode="WMS-001", printer_code=printer.code, copies=2
+    )
+
+    payload = PrintJob.objects.get(pk=result.job_id).payload
+    assert payload == "^XA\n^FO10,10^BC^FDWMS-001^FS\n^PQ2\n^XZ"
+
+
+def test_print_barcode_with_template_code_overrides_printer_template(db, user, printer):
+    LabelTemplate.objects.create(code="TEXT", content="^XA^FD{{ text }}^FS^XZ")
+
+    result = barcode_printer_service.print_barcode(
+        user=user,
+        barcode="WMS-001",
+        text="Bolt",
+        printer_code=printer.code,
+        template_code="TEXT",
+    )
+
+    assert PrintJob.objects.get(pk=result.job_id).payload == "^XA^FDBolt^FS^XZ"
+
+
+def test_compiled_template_is_cached_per_version(db):
+    template = LabelTemplate.objects.create(
+        code="CACHED", content="^XA^FD{{ barcode }}^FS^XZ"
+    )
+    compiled = label_templates_service.get_compiled(template)
+
+    assert (
+        label_templates_service.get_compiled(LabelTemplate.objects.get(pk=template.pk))
+        is compiled
+    )
+
+    template.content = "^XA^FD{{ text }}^FS^XZ"
+    template.save()
+
+    assert template.version == 2
+    assert label_templates_service.get_compiled(template).slots == {"text"}
@@ -0,0 +1,108 @@
+from collections.abc import Iterator
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+import pytest
+
+from apps.warehouse.core.services.print_spooler import print_spooler_service
+from apps.warehouse.models.printer import Printer, PrintJob, PrintJobState
+from apps.warehouse.tests.fake_printer import unused_port
+
+
+@pytest.fixture
+def printer(db, fake_printer) -> Printer:
+    return Printer.objects.create(
+        code="ZEBRA-SPOOL", ip=fake_printer.ip, port=fake_printer.port
+    )
+
+
+@pytest.fixture
+def offline_printer(db) -> Iterator[Printer]:
+    yield Printer.objects.create(code="ZEBRA-OFF", ip="127.0.0.1", port=unused_port())
+    print_spooler_service.close()
+
+
+def test_drain_sends_jobs_over_one_connection(printer, fake_printer):
+    first = print_spooler_service.enqueue(printer, "^XA^FDone^FS^XZ")
+    second = print_spooler_service.enqueue(printer, "^XA^FDtwo^FS^XZ", label_count=2)
+
+    assert print_spooler_service.drain() == 2
+
+    assert fake_printer.received("two") == "^XA^FDone^FS^XZ^XA^FDtwo^FS^XZ"
+    assert fake_printer.connection_count == 1
+    for job in (first, second):
+        job.refresh_from_db()
+        assert job.state == PrintJobState.PRINTED
+        assert job.attempts == 1
+        assert job.printed_at is not None
+
+
+def test_failed_job_is_retried_later(offline_printer):
+    job = print_spooler_service.enqueue(offline_printer, "^XA^XZ")
+
+    assert print_spooler_service.drain() == 1
+
+    job.refresh_from_db()
+    assert job.state == PrintJobState.QUEUED
+    assert job.attempts == 1
+    assert "Failed to connect" in job.last_error
+    assert job.next_attempt_at > timezone.now()
+    assert print_spooler_service.drain() == 0
+
+
+def test_jobs_of_backing_off_printer_are_postponed_without_attempt(offline_printer):
+    failing = print_spooler_service.enqueue(offline_printer, "^XA^XZ")
+    postponed = print_spooler_service.enqueue(offline_printer, "^XA^XZ")
+
+    print_spooler_service.drain()
+
+    failing.refresh_from_db()
+    postponed.refresh_from_db()
+    assert failing.attempts == 1
+    assert postponed.state == PrintJobState.QUEUED
+    assert postponed.attempts == 0
+    assert postponed.next_attempt_at > timezone.now()
+
+
+def test_job_fails_after_max_attempts(settings, offline_printer):
+    settings.PRINT_JOB_MAX_ATTEMPTS = 1
+    job = print_spooler_service.enqueue(offline_printer, "^XA^XZ")
+
+    print_spooler_service.drain()
+
+    job.refresh_from_db()
+    assert job.state == PrintJobState.FAILED
+    assert job.attempts == 1
+
+
+def test_job_for_printer_without_ip_fails_right_away(db):
+    printer = Printer.objects.create(code="NO-IP", ip=None)
+    job = print_spooler_service.enqueue(printer, "^XA^XZ")
+
+    print_spooler_service.drain()
+
+    job.refresh_from_db()
+    assert job.state == PrintJobState.FAILED
+    assert "no IP address" in job.last_error
+
+
+def test_recover_requeues_interrupted_jobs(printer):
+    job = PrintJob.objects.create(
+        printer=printer, payload="^XA^XZ", state=PrintJobState.PRINTING
+    )
+
+    assert print_spooler_service.recover() == 1
+
+    job.refresh_from_db()
+    assert job.state == PrintJobState.QUEUED
+
+
+def test_run_print_spooler_once(printer, fake_printer):
+    print_spooler_service.enqueue(printer, "^XA^FDcommand^FS^XZ")
+    out = StringIO()
+
+    call_command("run_print_spooler", once=True, stdout=out)
+
+    assert "Processed 1 print jobs" in out.getvalue()
+    assert fake_printer.received("command") == "^XA^FDcommand^FS^XZ"
@@ -4,6 +4,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from apps.warehouse.core import zebra_printer
+from apps.warehouse.tests.fake_printer import unused_port
 
 
 EXAMPLE_LABEL = Path(__file__).parent / "example_label.zpl"
@@ -29,7 +30,7 @@ def test_print_barcode_empty_raises():
         zebra_printer.print_barcode("")
 
 
-def test_print_barcode_sends_zpl_per_copy():
+def test_print_barcode_sends_copies_as_print_quantity():
     fake_sock = MagicMock()
     with patch("socket.socket", return_value=fake_sock):
         zebra_printer.print_barcode(
@@ -37,5 +38,100 @@ def test_print_barcode_sends_zpl_per_copy():
         )
 
     fake_sock.connect.assert_called_once_with(("10.0.0.1", 9100))
-    assert fake_sock.sendall.call_count == 3
+    fake_sock.sendall.assert_called_once()
+    zpl = fake_sock.sendall.call_args.args[0].decode()
+    assert zpl.count("^XA") == 1
+    assert zpl.endswith("^PQ3\n^XZ")
     fake_sock.close.assert_called_once()
+
+
+def test_render_labels_concatenates_labels():
+    zpl = zebra_printer.render_labels(
+        [
+            zebra_printer.Label("ABC-1", "First"),
+            zebra_printer.Label("ABC-2", copies=4),
+        ]
+    )
+
+    first, second = zpl.split("^XZ\n")
+    assert first == zebra_printer._generate_zpl("ABC-1", "First").removesuffix("^XZ")
+    assert "^FDABC-2^FS\n^PQ4\n^XZ" in second
+    assert zpl.count("^XA") == 2
+
+
+def test_render_labels_empty_raises():
+    with pytest.raises(ValueError, match="cannot be empty"):
+        zebra_printer.render_labels([zebra_printer.Label("")])
+
+
+def test_render_labels_invalid_copies_raises():
+    with pytest.raises(ValueError, match="at least 1"):
+        zebra_printer.render_labels([zebra_printer.Label("ABC-1", copies=0)])
+
+
+def test_printer_connection_is_reused(fake_printer):
+    connection = zebra_printer.PrinterConnection(fake_printer.ip, fake_printer.port)
+
+    connection.send("^XA^FDone^FS^XZ")
+    connection.send("^XA^FDtwo^FS^XZ")
+
+    assert fake_printer.received("two") == "^XA^FDone^FS^XZ^XA^FDtwo^FS^XZ"
+    assert fake_printer.connection_count == 1
+    connection.close()
+
+
+def test_printer_connection_reconnects_after_printer_closed_it(fake_printer):
+    connection = zebra_printer.PrinterConnection(fake_printer.ip, fake_printer.port)
+    connection.send("^XA^FDone^FS^XZ")
+    fake_printer.received("one")
+
+    fake_printer.drop_connections()
+    connection.send("^XA^FDtwo^FS^XZ")
+
+    assert fake_printer.received("two").endswith("^XA^FDtwo^FS^XZ")
+    assert fake_printer.connection_count == 2
+    connection.close()
+
+
+def test_printer_connection_backs_off_after_failed_connect():
+    connection = zebra_printer.PrinterConnection(
+        "127.0.0.1", unused_port(), backoff_base=30
+    )
+
+    with pytest.raises(ConnectionError, match="Failed to connect"):
+        connection.send("^XA^XZ")
+    with patch("socket.create_connection") as create_connection:
+        with pytest.raises(ConnectionError, match="unavailable"):
+            connection.send("^XA^XZ")
+
+    create_connection.assert_not_called()
+    assert 0 < connection.retry_in() <= 30
+
+
+def test_compiled_template_splits_static_zpl_and_slots():
+    template = zebra_printer.CompiledTemplate(
+        "^XA\n^CF0,30\n^FO10,10^FD{{ text }} ({{ product_code }})^FS\n^PW400\n^XZ"
+    )
+
+    assert template.prefix == "^XA\n^CF0,30\n"
+    assert template.suffix == "^PW400\n"
+    assert template.slots == {"text", "product_code"}
+    zpl = template.render(
+        zebra_printer.Label("B-1", "Bolt", copies=2, fields={"product_code": "P-1"})
+    )
+    assert zpl == "^XA\n^CF0,30\n^FO10,10^FDBolt (P-1)^FS\n^PW400\n^PQ2\n^XZ"
+
+
+def test_compiled_template_skips_lines_with_empty_slots():
+    template = zebra_printer.CompiledTemplate(
+        "^XA^FX{literal}\n^FO10,10^FD{{ location }}^FS\n^FO10,90^BC^FD{{barcode}}^FS\n^XZ"
+    )
+
+    zpl = template.render(zebra_printer.Label("B-1"))
+
+    assert zpl == "^XA^FX{literal}\n^FO10,90^BC^FDB-1^FS\n^XZ"
+
+
+def test_compiled_template_requires_label_format():
+    with pytest.raises(ValueError, match="must start with"):
+        zebra_printer.CompiledTemplate("^FD{{ barcode }}^FS")
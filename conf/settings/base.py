@@ -166,6 +166,86 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# 'file' and 'db' are shared by all worker processes of a single node ('db' needs
+# 'manage.py createcachetable'), 'redis' is meant for deployments with more nodes.
+# 'locmem' is private to each process.
+
+
+def cache_settings(backend: str) -> dict:
+    location = config("CACHE_LOCATION", default="")
+    backends = {
+        "locmem": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "file": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": location or str(BASE_DIR / ".cache"),
+        },
+        "db": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": location or "warehouse_cache",
+        },
+        "redis": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": location or "redis://127.0.0.1:6379/0",
+        },
+    }
+    if backend not in backends:
+        raise ValueError(
+            f"Unknown CACHE_BACKEND '{backend}', expected one of {', '.join(backends)}"
+        )
+    return {"default": {**backends[backend], "KEY_PREFIX": "datakura"}}
+
+
+CACHES = cache_settings(config("CACHE_BACKEND", default="file"))
+# Count hits and misses of the catalogue lookup cache for 'manage.py lookup_cache'.
+# Counting writes to the cache on every lookup, so it is off by default.
+LOOKUP_CACHE_STATS = config("LOOKUP_CACHE_STATS", default=False, cast=bool)
+
+
+# Audit log writes
+#
+# 'immediate' inserts every audit entry right away, 'buffered' inserts the entries
+# of a transaction at once after it commits. 'queue' appends them to files in
+# AUDIT_QUEUE_DIR instead, 'manage.py drain_audit_queue' loads them into the database.
+
+AUDIT_WRITE_MODE = config("AUDIT_WRITE_MODE", default="buffered")
+if AUDIT_WRITE_MODE not in ("immediate", "buffered", "queue"):
+    raise ValueError(
+        f"Unknown AUDIT_WRITE_MODE '{AUDIT_WRITE_MODE}', "
+        "expected one of immediate, buffered, queue"
+    )
+AUDIT_QUEUE_DIR = config("AUDIT_QUEUE_DIR", default="") or str(
+    BASE_DIR / ".audit-queue"
+)
+# Audit log entries moved out of the database by 'manage.py archive_audit_logs'.
+AUDIT_ARCHIVE_DIR = config("AUDIT_ARCHIVE_DIR", default="") or str(
+    BASE_DIR / "audit-archive"
+)
+
+
+# Rendered PDF documents
+#
+# Invoice and order PDFs are kept in PDF_CACHE_DIR, keyed by their HTML. Creating an
+# invoice or transitioning an order pre-renders its PDF in a pool of
+# PDF_RENDER_WORKERS processes, 0 renders only on download.
+
+PDF_CACHE_DIR = config("PDF_CACHE_DIR", default="") or str(BASE_DIR / "pdf-cache")
+PDF_RENDER_WORKERS = config("PDF_RENDER_WORKERS", default=2, cast=int)
+
+
+# Print spooler
+#
+# Labels are queued as print jobs, 'manage.py run_print_spooler' sends them. A job
+# is given up after PRINT_JOB_MAX_ATTEMPTS failed attempts.
+
+PRINT_JOB_MAX_ATTEMPTS = config("PRINT_JOB_MAX_ATTEMPTS", default=5, cast=int)
+PRINTER_TIMEOUT = config("PRINTER_TIMEOUT", default=5, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -6,6 +6,9 @@ DEBUG = True
 INSTALLED_APPS.extend([])  # noqa: F405
 
 
+# Every runserver / test process gets its own cache unless configured otherwise.
+CACHES = cache_settings(config("CACHE_BACKEND", default="locmem"))  # noqa: F405
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]